@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints.argument_map import router as argument_map_router
+from app.api.v1.endpoints.search import router as search_router
+from app.api.v1.endpoints.moralbert import router as moralbert_router
 
 # Central router for version 1 of the API
 router_v1 = APIRouter()
@@ -9,4 +11,18 @@ router_v1.include_router(
     argument_map_router,
     prefix="/argument_map",
     tags=["argument_map"]
-)
\ No newline at end of file
+)
+
+# Full-text search across argument maps
+router_v1.include_router(
+    search_router,
+    prefix="/search",
+    tags=["search"]
+)
+
+# Bulk imports of MoralBERT scores
+router_v1.include_router(
+    moralbert_router,
+    prefix="/moralbert",
+    tags=["moralbert"]
+)
@@ -1,41 +1,114 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database.db import get_db_session
+import time
+import uuid
+from dataclasses import asdict
+from typing import Awaitable, Callable
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.database.db import get_async_db_session, get_async_session_factory, async_session_scope
+from app.services.argument_map_pipeline_service import (
+    get_argument_map_pipeline_service,
+    ArgumentMapPipelineService,
+    XMLDocumentValidationError
+)
 from app.services.llm_service import get_llm_service, LLMService
-from app.services.xml_validation_service import get_xml_validation_service, XMLValidationService
-from app.services.xml_parsing_service import get_xml_parsing_service, XMLParsingService
-from app.schemas.argument_map import TextInputModel, ArgumentMapResponseModel, XMLInputModel
-from app.repositories.argument_map_repository import ArgumentMapRepository
+from app.services.xml_executor_service import get_xml_executor_service, XMLExecutorService
+from app.services.xml_stream_service import ArgumentMapStreamParser
+from app.services.transform_job_service import get_transform_job_worker, TransformJobWorker
+from app.services.argument_strength_service import get_argument_strength_service, ArgumentStrengthService, MapStrengths
+from app.services.version_store_service import get_version_store
+from app.services.similarity_service import get_statement_similarity_index
+from app.services.response_cache_service import get_response_cache, ResponseCache, make_etag, etag_matches
+from app.core.metrics import CACHE_REQUESTS
+from app.core.logging import RateLimitedLogger
+from app.schemas.argument_map import (
+    TextInputModel,
+    ResponseMode,
+    ArgumentMapCountsModel,
+    ArgumentMapResponseModel,
+    XMLInputModel,
+    BatchTextInputModel,
+    BatchItemResultModel,
+    BatchArgumentMapResponseModel,
+    TransformJobResponseModel,
+    StatementModel,
+    RelationshipModel,
+    EvidenceModel,
+    ArgumentMapDetailModel,
+    StatementSubtreeModel,
+    ArgumentMapSummaryModel,
+    ArgumentMapListModel,
+    StatementStrengthModel,
+    ArgumentStrengthModel,
+    ArgumentMapChangesModel,
+    ArgumentMapUpdateResponseModel,
+    ArgumentMapVersionModel,
+    ArgumentMapVersionListModel,
+    ArgumentMapVersionSourceModel,
+    CrossReferenceCandidateModel,
+    CrossReferenceCandidateListModel
+)
+from app.repositories.argument_map_repository import AsyncArgumentMapRepository, StaleMapVersionError, encode_cursor, decode_cursor
+from app.repositories.transform_job_repository import AsyncTransformJobRepository, TERMINAL_JOB_STATUSES
+from app.database.models import TransformJob, Statement, StatementRelationship
 # from app.core.auth import get_current_user
 
 router = APIRouter()
 
-def get_argument_map_repository(db: Session = Depends(get_db_session)):
-    return ArgumentMapRepository(db)
+# Les échecs de validation peuvent être fréquents (XML généré invalide) : journalisation limitée
+validation_failure_logger = RateLimitedLogger(logging.getLogger(__name__))
+
+def get_argument_map_repository(db: AsyncSession = Depends(get_async_db_session)):
+    return AsyncArgumentMapRepository(
+        db,
+        bulk_insert=settings.DB_BULK_INSERT,
+        version_store=get_version_store(),
+        similarity_index=get_statement_similarity_index()
+    )
 
-@router.post("/transform_text_to_xml/", response_model=ArgumentMapResponseModel)
+RESPONSE_MODE_DESCRIPTION = ("Contenu renvoyé avec les identifiants : 'full' (XML complet, par défaut), "
+                             "'summary' (décompte des statements, relations et preuves) ou 'parsed' (données structurées).")
+
+def _response_content(response_mode: str, xml_content: str, parsed_data: dict) -> dict:
+    """Fields of the creation response for the requested mode (only these fields are serialized)."""
+    if response_mode == "summary":
+        return {"summary": ArgumentMapCountsModel(
+            statements=len(parsed_data.get("statements", [])),
+            relationships=len(parsed_data.get("relationships", [])),
+            evidence=len(parsed_data.get("evidence", []))
+        )}
+    if response_mode == "parsed":
+        return {"parsed_data": {key: value for key, value in parsed_data.items() if key != "source_xml"}}
+    return {"xml_content": xml_content}
+
+@router.post("/transform_text_to_xml/", response_model=ArgumentMapResponseModel, response_model_exclude_unset=True)
 async def transform_text(
     text_input: TextInputModel,
+    response_mode: ResponseMode = Query("full", description=RESPONSE_MODE_DESCRIPTION),
     # current_user: User = Depends(get_current_user), 
     llm_service: LLMService = Depends(get_llm_service),
-    xml_validation_service: XMLValidationService = Depends(get_xml_validation_service),
-    xml_parsing_service: XMLParsingService = Depends(get_xml_parsing_service),
-    repository: ArgumentMapRepository = Depends(get_argument_map_repository)
+    xml_executor_service: XMLExecutorService = Depends(get_xml_executor_service),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
 ):
     try:
         # Génération du XML
         xml_output = await llm_service.generate_xml(text_input.text)
         
-        # Validation
-        is_valid, errors = xml_validation_service.validate_xml(xml_output)
-        if not is_valid:
-            logging.error(f"XML validation errors: {errors}")
+        # Validation et parsing sur un seul arbre XML
+        result = await xml_executor_service.process(xml_output)
+        if not result.is_valid:
+            validation_failure_logger.error("xml_validation_errors", "XML validation errors (%d), first: %s", len(result.errors), result.errors[0])
             raise HTTPException(status_code=400, detail="Invalid XML structure")
         
-        # Parsing
-        parsed_data = xml_parsing_service.parse_xml(xml_output)
+        parsed_data = result.parsed_data
         parsed_data["source_xml"] = xml_output
+        # XML valide : réutilisable pour le même texte
+        llm_service.cache_xml(text_input.text, xml_output)
         
         # Extraction des IDs
         # organization_id = current_user.organization_id
@@ -45,42 +118,195 @@ async def transform_text(
         
         
         # Stockage
-        created_map_object = repository.create_argument_map(
+        created_map_object = await repository.create_argument_map(
             parsed_data=parsed_data,
             organization_id=organization_id,
             creator_id=creator_id
         )
         
-        return ArgumentMapResponseModel(id=str(created_map_object.id),uuid=str(created_map_object.uuid), xml_content=xml_output)
+        return ArgumentMapResponseModel(
+            id=str(created_map_object.id),
+            uuid=str(created_map_object.uuid),
+            **_response_content(response_mode, xml_output, parsed_data)
+        )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
     
 
 
+def _ndjson_line(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+@router.post(
+    "/transform_text_to_xml/stream/",
+    summary="Transformer un texte en carte argumentative (streaming)",
+    description="Renvoie un flux NDJSON : un événement par statement ou relation dès sa fermeture dans la sortie du LLM, "
+                "puis un événement final 'complete' (ou 'error') après validation et enregistrement."
+)
+async def transform_text_stream(
+    text_input: TextInputModel,
+    llm_service: LLMService = Depends(get_llm_service),
+    pipeline: ArgumentMapPipelineService = Depends(get_argument_map_pipeline_service)
+):
+    async def event_stream():
+        parser = ArgumentMapStreamParser()
+        try:
+            # Événements incrémentaux pendant la génération
+            async for chunk in llm_service.astream_xml(text_input.text):
+                for event in parser.feed(chunk):
+                    yield _ndjson_line(event)
+
+            # Validation, parsing et stockage du document complet
+            # (la session de la requête est déjà fermée pendant le streaming)
+            xml_output = parser.document or ""
+            result = await pipeline.store_xml(xml_output)
+            llm_service.cache_xml(text_input.text, xml_output)
+
+            yield _ndjson_line({"event": "complete", "id": result.id, "uuid": result.uuid, "xml_content": result.xml_content})
+        except XMLDocumentValidationError as e:
+            validation_failure_logger.error("xml_validation_errors", "XML validation errors (%d), first: %s", len(e.errors), e.errors[0])
+            yield _ndjson_line({"event": "error", "status_code": 400, "detail": "Invalid XML structure", "errors": e.errors})
+        except Exception as e:
+            logging.error(f"Unexpected error: {str(e)}")
+            yield _ndjson_line({"event": "error", "status_code": 500, "detail": "Internal server error"})
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@router.post(
+    "/transform_text_to_xml/batch/",
+    response_model=BatchArgumentMapResponseModel,
+    summary="Transformer plusieurs textes en cartes argumentatives",
+    description="Génère, valide et enregistre chaque texte indépendamment, avec au plus "
+                "LLM_BATCH_CONCURRENCY appels LLM simultanés. Renvoie un résultat ou une erreur par texte."
+)
+async def transform_text_batch(
+    batch_input: BatchTextInputModel,
+    response_mode: ResponseMode = Query("full", description=RESPONSE_MODE_DESCRIPTION),
+    pipeline: ArgumentMapPipelineService = Depends(get_argument_map_pipeline_service)
+):
+    semaphore = asyncio.Semaphore(settings.LLM_BATCH_CONCURRENCY)
+
+    async def transform_item(index: int, text: str) -> BatchItemResultModel:
+        async with semaphore:
+            try:
+                result = await pipeline.transform_text(text)
+                return BatchItemResultModel(
+                    index=index, status="succeeded", id=result.id, uuid=result.uuid,
+                    **_response_content(response_mode, result.xml_content, result.parsed_data)
+                )
+            except XMLDocumentValidationError as e:
+                validation_failure_logger.error("xml_validation_errors", "XML validation errors (batch item %d, %d errors), first: %s", index, len(e.errors), e.errors[0])
+                return BatchItemResultModel(index=index, status="failed", status_code=400, error="Invalid XML structure", errors=e.errors)
+            except Exception as e:
+                logging.error(f"Unexpected error (batch item {index}): {str(e)}")
+                return BatchItemResultModel(index=index, status="failed", status_code=500, error="Internal server error")
+
+    results = await asyncio.gather(*(transform_item(index, text) for index, text in enumerate(batch_input.texts)))
+    succeeded = sum(1 for result in results if result.status == "succeeded")
+    return BatchArgumentMapResponseModel(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+def _job_response(request: Request, job: TransformJob, argument_map_uuid: uuid.UUID | None = None) -> TransformJobResponseModel:
+    return TransformJobResponseModel(
+        job_id=str(job.uuid),
+        status=job.status,
+        status_url=str(request.url_for("get_transform_job", job_id=str(job.uuid))),
+        attempts=job.attempts or 0,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        id=str(job.argument_map_id) if job.argument_map_id is not None else None,
+        uuid=str(argument_map_uuid) if argument_map_uuid is not None else None,
+        status_code=job.error_status_code if job.status == "failed" else None,
+        error=job.error_message if job.status == "failed" else None,
+        errors=job.error_details if job.status == "failed" else None
+    )
+
+@router.post(
+    "/transform_text_to_xml/jobs/",
+    response_model=TransformJobResponseModel,
+    status_code=202,
+    summary="Transformer un texte en carte argumentative (tâche asynchrone)",
+    description="Enregistre la demande et répond immédiatement (202) avec l'identifiant de la tâche. "
+                "La génération, la validation et l'enregistrement sont effectués par le pool de workers ; "
+                "l'état de la tâche est consultable à l'URL de suivi."
+)
+async def create_transform_job(
+    text_input: TextInputModel,
+    request: Request,
+    response: Response,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory),
+    worker: TransformJobWorker = Depends(get_transform_job_worker)
+):
+    try:
+        # La tâche est validée (commit) avant d'être signalée aux workers
+        async with async_session_scope(session_factory) as db:
+            job = await AsyncTransformJobRepository(db).create_job(text_input.text)
+        worker.notify()
+
+        job_response = _job_response(request, job)
+        response.headers["Location"] = job_response.status_url
+        return job_response
+
+    except Exception as e:
+        logging.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get(
+    "/transform_text_to_xml/jobs/{job_id}",
+    response_model=TransformJobResponseModel,
+    name="get_transform_job",
+    summary="Consulter l'état d'une tâche de transformation",
+    description="Renvoie l'état de la tâche et, une fois réussie, l'identifiant de la carte créée. "
+                "Avec `wait`, la requête attend jusqu'à `wait` secondes que la tâche se termine (long-polling)."
+)
+async def get_transform_job(
+    job_id: uuid.UUID,
+    request: Request,
+    wait: float = Query(0, ge=0, le=settings.JOB_LONG_POLL_MAX_SECONDS, description="Durée maximale d'attente de la fin de la tâche, en secondes."),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory)
+):
+    deadline = time.monotonic() + wait
+    while True:
+        # Nouvelle session à chaque lecture pour voir les mises à jour des workers
+        async with async_session_scope(session_factory) as db:
+            found = await AsyncTransformJobRepository(db).get_job(job_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Tâche introuvable")
+
+        job, argument_map_uuid = found
+        remaining = deadline - time.monotonic()
+        if job.status in TERMINAL_JOB_STATUSES or remaining <= 0:
+            return _job_response(request, job, argument_map_uuid)
+        await asyncio.sleep(min(settings.JOB_POLL_INTERVAL_SECONDS, remaining))
+
 @router.post(
     "/import_xml/",
     response_model=ArgumentMapResponseModel,
+    response_model_exclude_unset=True,
     summary="Importer une carte argumentative à partir de XML",
     description="Cet endpoint permet d'importer une carte argumentative en fournissant un contenu XML valide."
 )
 async def import_xml(
     xml_input: XMLInputModel,
-    xml_validation_service: XMLValidationService = Depends(get_xml_validation_service),
-    xml_parsing_service: XMLParsingService = Depends(get_xml_parsing_service),
-    repository: ArgumentMapRepository = Depends(get_argument_map_repository)
+    response_mode: ResponseMode = Query("full", description=RESPONSE_MODE_DESCRIPTION),
+    xml_executor_service: XMLExecutorService = Depends(get_xml_executor_service),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
 ):
     try:
-        # Valider le XML
-        is_valid, errors = xml_validation_service.validate_xml(xml_input.xml_content)
-        if not is_valid:
-            error_detail = "XML invalide : " + "; ".join(errors)
-            logging.warning(f"Import XML échoué - Validation : {error_detail} - Contenu XML reçu : {xml_input.xml_content[:500]}")
+        # Valider le XML et le parser en données structurées (un seul parsing)
+        result = await xml_executor_service.process(xml_input.xml_content)
+        if not result.is_valid:
+            error_detail = "XML invalide : " + "; ".join(result.errors)
+            validation_failure_logger.warning(
+                "import_xml_invalid", "Import XML échoué - Validation : %d erreurs (%d caractères reçus), première : %s",
+                len(result.errors), len(xml_input.xml_content), result.errors[0]
+            )
             raise HTTPException(status_code=400, detail=error_detail)
 
-        # Parser le XML en données structurées
-        parsed_data = xml_parsing_service.parse_xml(xml_input.xml_content)
+        parsed_data = result.parsed_data
         parsed_data["source_xml"] = xml_input.xml_content
 
         # Définir les IDs (à remplacer par la logique d'authentification)
@@ -89,7 +315,7 @@ async def import_xml(
         creator_id = None
 
         # Sauvegarder dans la base de données
-        created_map_object = repository.create_argument_map(
+        created_map_object = await repository.create_argument_map(
             parsed_data=parsed_data,
             organization_id=organization_id,
             creator_id=creator_id
@@ -99,9 +325,375 @@ async def import_xml(
         return ArgumentMapResponseModel(
             id=str(created_map_object.id),
             uuid=str(created_map_object.uuid),
-            xml_content=xml_input.xml_content
+            **_response_content(response_mode, xml_input.xml_content, parsed_data)
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Erreur inattendue : {str(e)}")
-        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+
+@router.get(
+    "/",
+    response_model=ArgumentMapListModel,
+    summary="Lister les cartes argumentatives",
+    description="Renvoie les cartes de la plus récente à la plus ancienne, par pages. Passer `next_cursor` "
+                "dans `cursor` pour obtenir la page suivante ; le coût d'une page ne dépend pas de sa position."
+)
+async def list_argument_maps(
+    organization_id: int | None = Query(None, description="Filtrer par organisation."),
+    creator_id: int | None = Query(None, description="Filtrer par créateur."),
+    is_published: bool | None = Query(None, description="Filtrer par statut de publication."),
+    limit: int = Query(20, ge=1, le=100, description="Nombre de cartes par page."),
+    cursor: str | None = Query(None, description="Curseur renvoyé par la page précédente."),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
+):
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+
+    rows = await repository.list_argument_maps(
+        limit=limit,
+        cursor=position,
+        organization_id=organization_id,
+        creator_id=creator_id,
+        is_published=is_published
+    )
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return ArgumentMapListModel(
+        items=[
+            ArgumentMapSummaryModel(
+                id=str(row.id),
+                uuid=str(row.uuid),
+                organization_id=row.organization_id,
+                creator_id=row.creator_id,
+                title=row.title,
+                description=row.description,
+                version=row.version,
+                is_published=row.is_published,
+                created_at=row.created_at,
+                updated_at=row.updated_at
+            )
+            for row in page
+        ],
+        next_cursor=next_cursor
+    )
+
+def _statement_model(statement: Statement) -> StatementModel:
+    return StatementModel(
+        id=statement.id,
+        external_id=statement.external_id,
+        statement_text=statement.statement_text,
+        statement_type=statement.statement_type,
+        path=statement.path.path if statement.path is not None else None,
+        depth=statement.depth
+    )
+
+def _relationship_models(relationships: list[StatementRelationship], statements: list[Statement]) -> list[RelationshipModel]:
+    external_ids = {statement.id: statement.external_id for statement in statements}
+    return [
+        RelationshipModel(
+            id=rel.id,
+            from_statement_id=rel.from_statement_id,
+            to_statement_id=rel.to_statement_id,
+            from_external_id=external_ids.get(rel.from_statement_id),
+            to_external_id=external_ids.get(rel.to_statement_id),
+            relationship_type=rel.relationship_type,
+            convergence_group_id=str(rel.convergence_group_id) if rel.convergence_group_id else None,
+            strength=rel.strength
+        )
+        for rel in relationships
+    ]
+
+async def _cached_map_response(
+    map_uuid: uuid.UUID,
+    variant: str,
+    request: Request,
+    response_cache: ResponseCache | None,
+    current_version: Callable[[], Awaitable[int | None]],
+    load: Callable[[], Awaitable[tuple[int, BaseModel]]]
+) -> Response:
+    """
+    Serve a map representation through the response cache. The current version of the map
+    comes from the cache's shared pointer, or from `current_version` (a cheap database read);
+    If-None-Match is then answered (304) and cached bodies are returned without loading the
+    map. Otherwise `load` reads the map and the serialized body is cached for its version.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if response_cache is not None:
+        version = response_cache.get_version(map_uuid)
+        if version is None:
+            version = await current_version()
+        if version is not None:
+            etag = make_etag(map_uuid, version)
+            if etag_matches(if_none_match, etag):
+                CACHE_REQUESTS.labels("response", "not_modified").inc()
+                return Response(status_code=304, headers={"ETag": etag})
+            body = response_cache.get(map_uuid, version, variant)
+            if body is not None:
+                CACHE_REQUESTS.labels("response", "hit").inc()
+                return _map_json_response(body, etag)
+        CACHE_REQUESTS.labels("response", "miss").inc()
+
+    version, model = await load()
+    etag = make_etag(map_uuid, version)
+    body = model.model_dump_json().encode("utf-8")
+    if response_cache is not None:
+        response_cache.set_version(map_uuid, version)
+        response_cache.set(map_uuid, version, variant, body)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return _map_json_response(body, etag)
+
+def _map_json_response(body: bytes, etag: str) -> Response:
+    # no-cache: clients may store the response but must revalidate it with If-None-Match
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+@router.get(
+    "/{map_uuid}",
+    response_model=ArgumentMapDetailModel,
+    summary="Lire une carte argumentative",
+    description="Renvoie la carte avec ses statements, relations et preuves (chargés en un nombre constant de requêtes)."
+)
+async def get_argument_map(
+    map_uuid: uuid.UUID,
+    request: Request,
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository),
+    response_cache: ResponseCache | None = Depends(get_response_cache)
+):
+    async def load() -> tuple[int, ArgumentMapDetailModel]:
+        argument_map = await repository.get_argument_map_with_children(map_uuid)
+        if argument_map is None:
+            raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+
+        statements = sorted(argument_map.statements, key=lambda statement: statement.id)
+        relationships = sorted(argument_map.statement_relationships, key=lambda rel: rel.id)
+        evidence = sorted(argument_map.evidences, key=lambda ev: ev.id)
+        return argument_map.version, ArgumentMapDetailModel(
+            id=str(argument_map.id),
+            uuid=str(argument_map.uuid),
+            title=argument_map.title,
+            description=argument_map.description,
+            version=argument_map.version,
+            is_published=argument_map.is_published,
+            created_at=argument_map.created_at,
+            statements=[_statement_model(statement) for statement in statements],
+            relationships=_relationship_models(relationships, statements),
+            evidence=[
+                EvidenceModel(
+                    id=ev.id,
+                    external_id=ev.external_id,
+                    title=ev.title,
+                    source_type=ev.source_type,
+                    source_name=ev.source_name,
+                    url=ev.url,
+                    description=ev.description,
+                    credibility_rating=ev.credibility_rating
+                )
+                for ev in evidence
+            ]
+        )
+
+    return await _cached_map_response(map_uuid, "full", request, response_cache, lambda: repository.get_argument_map_version(map_uuid), load)
+
+@router.put(
+    "/{map_uuid}",
+    response_model=ArgumentMapUpdateResponseModel,
+    summary="Mettre à jour une carte argumentative à partir de XML",
+    description="Compare le nouveau XML à la carte enregistrée (par `external_id`) et n'écrit que les statements, "
+                "relations et preuves ajoutés, modifiés ou supprimés. La version de la carte est incrémentée et "
+                "historisée. Avec l'en-tête If-Match (ETag d'une lecture), la mise à jour est refusée (412) si la "
+                "carte a changé entre-temps."
+)
+async def update_argument_map(
+    map_uuid: uuid.UUID,
+    xml_input: XMLInputModel,
+    response: Response,
+    if_match: str | None = Header(None),
+    xml_executor_service: XMLExecutorService = Depends(get_xml_executor_service),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository),
+    response_cache: ResponseCache | None = Depends(get_response_cache)
+):
+    result = await xml_executor_service.process(xml_input.xml_content)
+    if not result.is_valid:
+        validation_failure_logger.warning(
+            "update_xml_invalid", "Mise à jour XML échouée - Validation : %d erreurs, première : %s", len(result.errors), result.errors[0]
+        )
+        raise HTTPException(status_code=400, detail="XML invalide : " + "; ".join(result.errors))
+
+    version = await repository.get_argument_map_version(map_uuid)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+    if if_match is not None and not etag_matches(if_match, make_etag(map_uuid, version)):
+        raise HTTPException(status_code=412, detail="La carte a été modifiée depuis sa lecture")
+
+    parsed_data = result.parsed_data
+    parsed_data["source_xml"] = xml_input.xml_content
+    try:
+        # Avec If-Match, la version vérifiée est celle sur laquelle porte le compare-and-set
+        updated = await repository.update_argument_map(
+            map_uuid, parsed_data, creator_id=None, expected_version=version if if_match is not None else None
+        )
+    except StaleMapVersionError:
+        if if_match is not None:
+            raise HTTPException(status_code=412, detail="La carte a été modifiée depuis sa lecture")
+        raise HTTPException(status_code=409, detail="La carte a été modifiée par une autre requête")
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+    argument_map, changes = updated
+
+    # Valider avant de publier la nouvelle version dans le cache des réponses
+    await repository.db_session.commit()
+    if response_cache is not None:
+        response_cache.set_version(map_uuid, argument_map.version)
+    response.headers["ETag"] = make_etag(map_uuid, argument_map.version)
+    return ArgumentMapUpdateResponseModel(
+        id=str(argument_map.id),
+        uuid=str(argument_map.uuid),
+        version=argument_map.version,
+        changes=ArgumentMapChangesModel(**asdict(changes))
+    )
+
+@router.get(
+    "/{map_uuid}/statements/{external_id}/subtree",
+    response_model=StatementSubtreeModel,
+    summary="Lire une branche d'une carte argumentative",
+    description="Renvoie le statement racine, ses descendants (selon leur chemin ltree) jusqu'à `max_depth` niveaux, "
+                "et les relations entre eux, sans charger le reste de la carte."
+)
+async def get_statement_subtree(
+    map_uuid: uuid.UUID,
+    external_id: str,
+    request: Request,
+    max_depth: int | None = Query(None, ge=0, description="Nombre maximal de niveaux sous le statement racine."),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository),
+    response_cache: ResponseCache | None = Depends(get_response_cache)
+):
+    async def load() -> tuple[int, StatementSubtreeModel]:
+        version = await repository.get_argument_map_version(map_uuid)
+        root = await repository.get_statement(map_uuid, external_id) if version is not None else None
+        if root is None:
+            raise HTTPException(status_code=404, detail="Statement introuvable")
+
+        statements, relationships = await repository.get_statement_subtree(root, max_depth)
+        return version, StatementSubtreeModel(
+            argument_map_uuid=str(map_uuid),
+            root_external_id=external_id,
+            max_depth=max_depth,
+            statements=[_statement_model(statement) for statement in statements],
+            relationships=_relationship_models(relationships, statements)
+        )
+
+    variant = f"subtree:{external_id}:{max_depth}"
+    return await _cached_map_response(map_uuid, variant, request, response_cache, lambda: repository.get_argument_map_version(map_uuid), load)
+
+@router.get(
+    "/{map_uuid}/strength",
+    response_model=ArgumentStrengthModel,
+    summary="Calculer la force des arguments d'une carte",
+    description="Propage la force des statements le long des relations (les soutiens l'augmentent, les oppositions "
+                "la diminuent). Le résultat est mis en cache pour chaque version de la carte et facteur d'amortissement."
+)
+async def get_argument_strength(
+    map_uuid: uuid.UUID,
+    request: Request,
+    damping: float | None = Query(None, ge=0, le=0.99, description="Facteur d'amortissement, arrondi à 2 décimales (par défaut : configuration)."),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository),
+    strength_service: ArgumentStrengthService = Depends(get_argument_strength_service),
+    response_cache: ResponseCache | None = Depends(get_response_cache)
+):
+    # Arrondi : un nombre borné de variantes par carte dans les caches
+    damping = round(strength_service.damping if damping is None else damping, settings.STRENGTH_DAMPING_DECIMALS)
+
+    async def load() -> tuple[int, ArgumentStrengthModel]:
+        version = await repository.get_argument_map_version(map_uuid)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+        strengths = strength_service.get_cached(str(map_uuid), version, damping)
+        if strengths is None:
+            graph = await repository.get_argument_graph(map_uuid)
+            if graph is None:
+                raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+            version, statements, relationships = graph
+            strengths = MapStrengths(
+                statements=[(statement.id, statement.external_id) for statement in statements],
+                result=strength_service.compute([statement.id for statement in statements], relationships, damping)
+            )
+            strength_service.put(str(map_uuid), version, damping, strengths)
+
+        return version, ArgumentStrengthModel(
+            argument_map_uuid=str(map_uuid),
+            version=version,
+            damping=damping,
+            iterations=strengths.result.iterations,
+            converged=strengths.result.converged,
+            scores=[
+                StatementStrengthModel(statement_id=statement_id, external_id=external_id, score=score)
+                for (statement_id, external_id), score in zip(strengths.statements, strengths.result.scores.tolist())
+            ]
+        )
+
+    return await _cached_map_response(map_uuid, f"strength:{damping}", request, response_cache, lambda: repository.get_argument_map_version(map_uuid), load)
+
+@router.get(
+    "/{map_uuid}/versions",
+    response_model=ArgumentMapVersionListModel,
+    summary="Lister les versions d'une carte argumentative",
+    description="Renvoie l'historique des versions enregistrées, de la plus récente à la plus ancienne, sans leur XML."
+)
+async def list_argument_map_versions(
+    map_uuid: uuid.UUID,
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
+):
+    rows = await repository.list_versions(map_uuid)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+    return ArgumentMapVersionListModel(
+        argument_map_uuid=str(map_uuid),
+        versions=[ArgumentMapVersionModel.model_validate(row._asdict()) for row in rows]
+    )
+
+@router.get(
+    "/{map_uuid}/versions/{version}",
+    response_model=ArgumentMapVersionSourceModel,
+    summary="Lire le XML d'une version d'une carte argumentative",
+    description="Reconstruit le XML de la version à partir de l'instantané et des deltas enregistrés."
+)
+async def get_argument_map_version_source(
+    map_uuid: uuid.UUID,
+    version: int,
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
+):
+    xml_content = await repository.get_version_source(map_uuid, version)
+    if xml_content is None:
+        raise HTTPException(status_code=404, detail="Version introuvable")
+    return ArgumentMapVersionSourceModel(argument_map_uuid=str(map_uuid), version=version, xml_content=xml_content)
+
+@router.get(
+    "/{map_uuid}/cross_references/candidates",
+    response_model=CrossReferenceCandidateListModel,
+    summary="Suggérer des références croisées",
+    description="Renvoie les statements des autres cartes de l'organisation qui sont quasi identiques à un statement de "
+                "la carte (signatures MinHash et index LSH, sans comparer chaque paire de statements)."
+)
+async def get_cross_reference_candidates(
+    map_uuid: uuid.UUID,
+    threshold: float | None = Query(None, gt=0, le=1, description="Similarité minimale (par défaut : configuration)."),
+    limit: int | None = Query(None, ge=1, le=100, description="Nombre maximal de suggestions par statement (par défaut : configuration)."),
+    repository: AsyncArgumentMapRepository = Depends(get_argument_map_repository)
+):
+    threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+    limit = settings.SIMILARITY_MAX_CANDIDATES_PER_STATEMENT if limit is None else limit
+    candidates = await repository.get_cross_reference_candidates(map_uuid, threshold, limit)
+    if candidates is None:
+        raise HTTPException(status_code=404, detail="Carte argumentative introuvable")
+    return CrossReferenceCandidateListModel(
+        argument_map_uuid=str(map_uuid),
+        threshold=threshold,
+        candidates=[CrossReferenceCandidateModel(**asdict(candidate)) for candidate in candidates]
+    )
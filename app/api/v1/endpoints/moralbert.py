@@ -0,0 +1,92 @@
+import asyncio
+import json
+import logging
+import tempfile
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.moralbert_ingest_service import (
+    get_moralbert_ingest_service,
+    MoralBERTIngestService,
+    INGEST_FORMATS,
+    detect_format,
+    arrow_available,
+    iter_lines,
+    iterate_in_thread,
+    decode_lines,
+    read_arrow_records
+)
+
+router = APIRouter()
+
+SPOOL_READ_SIZE = 64 * 1024
+
+def _ndjson_line(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+@router.post(
+    "/scores/import",
+    summary="Importer des scores MoralBERT en masse",
+    description="Importe des scores MoralBERT identifiés par `statement_uuid` (colonnes `care_harm_score`, "
+                "`fairness_cheating_score`, `loyalty_betrayal_score`, `authority_subversion_score`, "
+                "`sanctity_degradation_score`), en CSV, JSONL ou Arrow (selon le Content-Type ou le paramètre `format`). "
+                "Le corps est reçu en entier (au plus `MORALBERT_INGEST_MAX_BODY_BYTES` octets, sinon 413), puis importé "
+                "par lots enregistrés chacun dans sa propre transaction "
+                "(les scores existants sont remplacés). Renvoie un flux NDJSON : un événement 'progress' par lot, "
+                "puis un événement final 'complete'."
+)
+async def import_moralbert_scores(
+    request: Request,
+    data_format: str | None = Query(None, alias="format", description="Format du corps : 'csv', 'jsonl' ou 'arrow' (par défaut : Content-Type)."),
+    ingest_service: MoralBERTIngestService = Depends(get_moralbert_ingest_service)
+):
+    data_format = data_format or detect_format(request.headers.get("content-type"))
+    if data_format not in INGEST_FORMATS:
+        raise HTTPException(status_code=415, detail="Format non pris en charge : utilisez text/csv, application/x-ndjson ou Arrow")
+    if data_format == "arrow" and not arrow_available():
+        raise HTTPException(status_code=415, detail="Le format Arrow nécessite pyarrow sur le serveur")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MORALBERT_INGEST_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Corps de requête trop volumineux")
+
+    # Le corps est lu avant la réponse (une StreamingResponse consomme les messages de réception pour détecter
+    # la déconnexion du client) : mis en mémoire, puis sur disque au-delà du seuil. Les écritures et lectures
+    # du fichier, et le décodage Arrow, se font dans un thread de travail
+    loop = asyncio.get_running_loop()
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.MORALBERT_INGEST_SPOOL_MAX_BYTES)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.MORALBERT_INGEST_MAX_BODY_BYTES:
+                raise HTTPException(status_code=413, detail="Corps de requête trop volumineux")
+            await loop.run_in_executor(None, spool.write, chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+
+    async def event_stream():
+        with spool:
+            if data_format == "arrow":
+                records = iterate_in_thread(read_arrow_records(spool))
+            else:
+                chunks = iterate_in_thread(iter(lambda: spool.read(SPOOL_READ_SIZE), b""), batch_size=1)
+                records = decode_lines(iter_lines(chunks), data_format)
+            async for event in _progress_events(ingest_service, records):
+                yield event
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+async def _progress_events(ingest_service: MoralBERTIngestService, records):
+    report = None
+    try:
+        async for report in ingest_service.ingest(records):
+            yield _ndjson_line({"event": "progress", **asdict(report)})
+        yield _ndjson_line({"event": "complete", **asdict(report)})
+    except Exception as e:
+        # Erreur de lecture du corps (Arrow invalide, encodage) : les lots déjà importés restent enregistrés
+        logging.error(f"MoralBERT import aborted: {str(e)}")
+        yield _ndjson_line({"event": "error", "detail": f"Import interrompu : {str(e)}", **(asdict(report) if report else {})})
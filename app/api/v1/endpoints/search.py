@@ -0,0 +1,41 @@
+import uuid
+from dataclasses import asdict
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.database.db import get_async_db_session
+from app.repositories.argument_map_repository import AsyncArgumentMapRepository
+from app.services.statement_search_service import get_statement_search_index
+from app.schemas.search import StatementSearchHitModel, StatementSearchResultModel
+
+router = APIRouter()
+
+def get_search_repository(db: AsyncSession = Depends(get_async_db_session)):
+    return AsyncArgumentMapRepository(db, search_index=get_statement_search_index())
+
+@router.get(
+    "/statements",
+    response_model=StatementSearchResultModel,
+    summary="Rechercher des statements",
+    description="Recherche plein texte dans les statements de toutes les cartes (syntaxe web : mots, \"phrases\", -exclusion), "
+                "triée par pertinence, avec un extrait où les mots trouvés sont entourés de balises <mark>."
+)
+async def search_statements(
+    q: str = Query(..., min_length=1, max_length=500, description="Les mots à rechercher."),
+    organization_id: int | None = Query(None, description="Limiter la recherche aux cartes d'une organisation."),
+    statement_type: Literal["premise", "conclusion", "rebuttal", "counter_conclusion"] | None = Query(
+        None, description="Limiter la recherche à un type de statement."
+    ),
+    map_uuid: uuid.UUID | None = Query(None, description="Limiter la recherche à une carte."),
+    limit: int = Query(20, ge=1, le=settings.SEARCH_MAX_RESULTS, description="Nombre maximal de résultats."),
+    offset: int = Query(0, ge=0, description="Nombre de résultats à ignorer (pagination)."),
+    repository: AsyncArgumentMapRepository = Depends(get_search_repository)
+):
+    hits = await repository.search_statements(q, organization_id, statement_type, map_uuid, limit, offset)
+    return StatementSearchResultModel(
+        query=q,
+        limit=limit,
+        offset=offset,
+        items=[StatementSearchHitModel(**asdict(hit)) for hit in hits]
+    )
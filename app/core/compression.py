@@ -0,0 +1,109 @@
+import gzip
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: gzip only
+    brotli = None
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Map each coding of an Accept-Encoding header to its quality value."""
+    codings = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[coding.strip().lower()] = quality
+    return codings
+
+def select_encoding(header: str | None) -> str | None:
+    """Preferred supported content coding (brotli, then gzip) accepted by the client."""
+    codings = parse_accept_encoding(header)
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if codings.get(coding, codings.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 excluded_media_types: tuple[str, ...] = ("application/x-ndjson", "text/event-stream")):
+        """
+        Negotiate brotli or gzip compression of complete response bodies of at least
+        minimum_size bytes. Streamed responses (several body messages) and excluded media
+        types, such as the NDJSON event stream, are passed through untouched so that events
+        are not held back.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_media_types = excluded_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if "content-encoding" in headers or media_type in self.excluded_media_types:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # Held until the first body message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if start_message is not None:
+                body = message.get("body", b"")
+                held_start, start_message = start_message, None
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(held_start)
+                    await send(message)
+                    return
+
+                compressed = self._compress(body, encoding)
+                headers = MutableHeaders(raw=held_start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed bytes differ from the identity representation
+                    headers["ETag"] = f"W/{etag}"
+                await send(held_start)
+                await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Literal
 from pydantic import field_validator 
 from functools import lru_cache
 from pathlib import Path
@@ -12,8 +12,104 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_MODEL_NAME: str
 
+    # LLM result cache: bounded in-memory LRU+TTL tier and optional persistent SQLite tier
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_SQLITE_PATH: str | None = None
+
+    # Maximum number of concurrent LLM generations per batch request
+    LLM_BATCH_CONCURRENCY: int = 8
+
+    # Response cache of map reads, keyed by (map uuid, version): in-process LRU tier plus an
+    # optional shared backend ("memory" is a process-local stand-in for a shared store)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    RESPONSE_CACHE_BACKEND: Literal["none", "memory"] = "none"
+
+    # Negotiated brotli/gzip compression of complete JSON responses of at least this size
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+
+    # Prometheus-format metrics on /metrics (per-stage latencies, cache hits, validation failures)
+    METRICS_ENABLED: bool = True
+
+    # Asynchronous transform jobs: in-process runners, lease renewed while a job runs
+    # (jobs of a crashed process are retried once their lease expires)
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 3
+    # Maximum wait of a long-poll status request, and grace period for running jobs at shutdown
+    JOB_LONG_POLL_MAX_SECONDS: int = 30
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+
+    # Argument strength propagation: s = clip(base + damping * W s, 0, 1), W holding the signed
+    # (support +, oppose -) relationship weights of each statement, normalized per statement
+    STRENGTH_DAMPING: float = 0.85
+    STRENGTH_BASE_SCORE: float = 0.5
+    STRENGTH_TOLERANCE: float = 1e-6
+    STRENGTH_MAX_ITERATIONS: int = 100
+    # Strengths kept per (map, version, damping), damping rounded to STRENGTH_DAMPING_DECIMALS
+    STRENGTH_CACHE_MAX_ENTRIES: int = 256
+    STRENGTH_DAMPING_DECIMALS: int = 2
+
+    # Map version history: compressed delta against the previous version, with a compressed
+    # snapshot every VERSION_SNAPSHOT_INTERVAL versions or when a delta exceeds VERSION_MAX_DELTA_RATIO
+    # of the document; reconstructed documents are kept in an LRU
+    VERSION_SNAPSHOT_INTERVAL: int = 20
+    VERSION_MAX_DELTA_RATIO: float = 0.5
+    VERSION_CACHE_MAX_ENTRIES: int = 128
+
+    # Statement search: PostgreSQL uses the statements.search_vector GIN index; other databases
+    # use in-memory inverted indexes, one per map (the most recently searched maps are kept)
+    SEARCH_INDEX_MAX_MAPS: int = 1000
+    SEARCH_MAX_RESULTS: int = 100
+
+    # Near-duplicate statements across maps (cross-reference suggestions): MinHash signatures of
+    # SIMILARITY_NUM_PERM hashes over word n-grams, split into SIMILARITY_BANDS LSH bands
+    # (16 bands of 4 rows: pairs above ~0.5 similarity are almost always found)
+    SIMILARITY_NUM_PERM: int = 64
+    SIMILARITY_BANDS: int = 16
+    SIMILARITY_SHINGLE_SIZE: int = 2
+    SIMILARITY_THRESHOLD: float = 0.5
+    SIMILARITY_MAX_CANDIDATES_PER_STATEMENT: int = 5
+
+    # Bulk MoralBERT score imports: rows are upserted MORALBERT_INGEST_CHUNK_SIZE at a time, one
+    # transaction per chunk (a failed chunk does not stop the import); at most
+    # MORALBERT_INGEST_MAX_ERRORS row errors are reported. Uploads are received whole before the
+    # import starts, buffered in memory up to MORALBERT_INGEST_SPOOL_MAX_BYTES, then on disk;
+    # larger bodies than MORALBERT_INGEST_MAX_BODY_BYTES are refused (413)
+    MORALBERT_INGEST_CHUNK_SIZE: int = 1000
+    MORALBERT_INGEST_MAX_ERRORS: int = 100
+    MORALBERT_INGEST_SPOOL_MAX_BYTES: int = 16 * 1024 * 1024
+    MORALBERT_INGEST_MAX_BODY_BYTES: int = 512 * 1024 * 1024
+
+    # Logging: records go through a bounded queue (dropped when full) to console and optional
+    # file handlers running on a background thread; LOG_FORMAT "json" writes one object per line
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_FILE: str | None = "app.log"
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    # Rate limit of hot-path log records (e.g. validation failures): burst per key and interval
+    LOG_RATE_LIMIT_INTERVAL_SECONDS: float = 10.0
+    LOG_RATE_LIMIT_BURST: int = 5
+
     # Database configuration
     DATABASE_URL: str
+    # Optional explicit URL for the async engine (derived from DATABASE_URL when unset)
+    ASYNC_DATABASE_URL: str | None = None
+    # Write statements, relationships and evidence with multi-row INSERTs instead of per-row flushes
+    DB_BULK_INSERT: bool = True
+
+    # Business rules engine: "schematron" (business_rules.sch) or "native" (indexed O(n) checks, same messages)
+    BUSINESS_RULES_ENGINE: Literal["schematron", "native"] = "schematron"
+
+    # Execution of CPU-bound XML validation and parsing: "inline" (on the event loop),
+    # "thread" (thread pool) or "process" (process pool with per-worker precompiled schemas)
+    XML_EXECUTOR_MODE: Literal["inline", "thread", "process"] = "thread"
+    XML_EXECUTOR_MAX_WORKERS: int = 4
 
     # CORS configuration
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
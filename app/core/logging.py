@@ -1,11 +1,178 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import threading
+import time
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable
+from app.core.config import settings
+from app.core.metrics import LOG_RECORDS_DROPPED
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("app.log")
-        ]
-    )
\ No newline at end of file
+# Logging is non-blocking for the code that logs: the root logger only has a QueueHandler, and
+# the actual handlers (console, optional file) run on a QueueListener background thread.
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes of every LogRecord; anything else was passed through `extra=` and is kept in JSON output
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with the `extra=` fields of the record as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process bounded queue: records are dropped (and counted) when the
+    queue is full instead of blocking or raising, and formatting is left to the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they could be mutated later); timestamps, tracebacks and
+        # JSON serialization are done by the formatter on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+def _make_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JSONFormatter()
+    if log_format == "text":
+        return logging.Formatter(TEXT_FORMAT)
+    raise ValueError(f"Unknown log format: {log_format}")
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    log_format: str = settings.LOG_FORMAT,
+    log_file: str | None = settings.LOG_FILE,
+    queue_size: int = settings.LOG_QUEUE_MAX_SIZE
+) -> QueueListener:
+    """
+    Route all log records through a bounded queue to console (and optional file) handlers
+    running on a background thread. Calling it again replaces the previous configuration.
+
+    Returns:
+        QueueListener: The started listener (stopped by shutdown_logging, also registered at exit).
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    formatter = _make_formatter(log_format)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging() -> None:
+    """Detach the queue handler, then write the queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
+class RateLimitedLogger:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval_seconds: float = settings.LOG_RATE_LIMIT_INTERVAL_SECONDS,
+        burst: int = settings.LOG_RATE_LIMIT_BURST,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Logger for hot paths (e.g. validation failures): at most `burst` records per key and
+        interval are emitted; the number of suppressed records is reported with the next
+        emitted record of the same key.
+        """
+        self.logger = logger
+        self.interval_seconds = interval_seconds
+        self.burst = burst
+        self.clock = clock
+        self._windows: dict[str, list] = {}  # key -> [window start, emitted, suppressed]
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, msg: str, *args, **kwargs) -> bool:
+        """
+        Log `msg` unless the key is over its budget. Formatting only happens for emitted records.
+
+        Returns:
+            bool: True if the record was emitted.
+        """
+        return self._log(level, key, msg, args, kwargs)
+
+    def warning(self, key: str, msg: str, *args, **kwargs) -> bool:
+        return self._log(logging.WARNING, key, msg, args, kwargs)
+
+    def error(self, key: str, msg: str, *args, **kwargs) -> bool:
+        return self._log(logging.ERROR, key, msg, args, kwargs)
+
+    def _log(self, level: int, key: str, msg: str, args: tuple, kwargs: dict) -> bool:
+        if not self.logger.isEnabledFor(level):
+            return False
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval_seconds:
+                suppressed = window[2] if window is not None else 0
+                window = self._windows[key] = [now, 0, 0]
+            else:
+                suppressed = 0
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+        if suppressed:
+            msg = f"{msg} ({suppressed} similar messages suppressed)"
+        # Attribute the record to the caller of log/warning/error
+        self.logger.log(level, msg, *args, stacklevel=3, **kwargs)
+        return True
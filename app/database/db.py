@@ -1,7 +1,13 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
 from app.core.config import settings
+from app.core.metrics import track_stage
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -12,6 +18,27 @@ engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url(database_url: str) -> str:
+    """
+    Map a database URL to its async driver: psycopg (v3) for PostgreSQL, aiosqlite for SQLite.
+    URLs that already name another driver are returned unchanged.
+    """
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+psycopg")
+    elif url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+# Configure the async engine used by the API endpoints, so DB I/O does not block the event loop
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True
+)
+
+# Create an async session factory (objects stay usable after commit to build responses)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for ORM models (modern SQLAlchemy 2.0 style)
 class Base(DeclarativeBase):
     pass
@@ -27,4 +54,29 @@ def get_db_session() -> Session:
         raise
     finally:
         db.close()
-        logger.debug("Database session closed")
\ No newline at end of file
+        logger.debug("Database session closed")
+
+# Dependency returning the async session factory (overridable in tests); used directly by
+# code that outlives the request scope, such as streaming responses and background workers
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return AsyncSessionLocal
+
+# Transactional scope: commit on success, rollback on error
+@asynccontextmanager
+async def async_session_scope(session_factory: async_sessionmaker[AsyncSession] | None = None) -> AsyncIterator[AsyncSession]:
+    async with (session_factory or AsyncSessionLocal)() as db:
+        try:
+            yield db
+            with track_stage("db_commit"):
+                await db.commit() # Commit si tout s'est bien passé
+        except Exception:
+            await db.rollback() # Rollback en cas d'erreur
+            raise
+    logger.debug("Async database session closed")
+
+# Dependency to get an async database session
+async def get_async_db_session(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory)
+) -> AsyncIterator[AsyncSession]:
+    async with async_session_scope(session_factory) as db:
+        yield db
@@ -0,0 +1,56 @@
+"""
+Import MoralBERT scores keyed by statement UUID from a CSV, JSONL or Arrow file.
+
+Rows are upserted in chunks, one transaction per chunk: a failed chunk is reported and the
+import goes on. Progress is logged after each chunk.
+
+Usage: python -m app.database.import_moralbert_scores FILE [--format csv|jsonl|arrow] [--database-url URL] [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.core.config import settings
+from app.database.db import get_async_database_url
+from app.services.moralbert_ingest_service import (
+    MoralBERTIngestService, IngestReport, INGEST_FORMATS, detect_format, iterate, decode_lines, read_arrow_records
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+async def run(path: str, data_format: str, database_url: str, chunk_size: int, max_errors: int) -> IngestReport:
+    engine = create_async_engine(get_async_database_url(database_url))
+    ingest_service = MoralBERTIngestService(async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False), chunk_size, max_errors)
+    report = IngestReport()
+    try:
+        if data_format == "arrow":
+            with open(path, "rb") as source:
+                async for report in ingest_service.ingest(iterate(read_arrow_records(source))):
+                    logger.info(f"{report.rows_read} rows read, {report.rows_upserted} upserted, {report.rows_failed} failed, {report.rows_duplicate} duplicates")
+        else:
+            with open(path, encoding="utf-8-sig", newline="") as source:
+                lines = iterate(line.rstrip("\r\n") for line in source)
+                async for report in ingest_service.ingest(decode_lines(lines, data_format)):
+                    logger.info(f"{report.rows_read} rows read, {report.rows_upserted} upserted, {report.rows_failed} failed, {report.rows_duplicate} duplicates")
+    finally:
+        await engine.dispose()
+    for error in report.errors:
+        logger.warning(f"Line {error['line']}: {error['error']}")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", dest="data_format", choices=INGEST_FORMATS, help="Default: from the file extension")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=settings.MORALBERT_INGEST_CHUNK_SIZE)
+    parser.add_argument("--max-errors", type=int, default=settings.MORALBERT_INGEST_MAX_ERRORS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    data_format = args.data_format or detect_format(filename=args.path)
+    if data_format is None:
+        parser.error("cannot infer the format from the file name: use --format")
+    report = asyncio.run(run(args.path, data_format, args.database_url, args.chunk_size, args.max_errors))
+    sys.exit(1 if report.rows_failed else 0)
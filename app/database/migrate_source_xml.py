@@ -0,0 +1,84 @@
+"""
+Migrate argument_maps.source_xml from TEXT to zlib-compressed BYTEA (CompressedText).
+
+On PostgreSQL the column type is first changed in place, each value becoming its UTF-8
+bytes (which CompressedText already reads). Rows are then compressed in batches, one
+transaction per batch, so the migration can be interrupted and run again. Run VACUUM FULL
+(or pg_repack) on argument_maps afterwards to give the freed space back to the system.
+
+Usage: python -m app.database.migrate_source_xml [--database-url URL] [--batch-size 500] [--level 6]
+"""
+import argparse
+import logging
+from sqlalchemy import create_engine, select, update, bindparam, column, table, text, Engine, LargeBinary
+from app.core.config import settings
+from app.database.types import COMPRESSED_PREFIX, compress_text, decompress_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Untyped view of the table: values are read as stored (str, bytes or memoryview)
+argument_maps = table("argument_maps", column("id"), column("source_xml"))
+
+def convert_column(engine: Engine) -> bool:
+    """Change the column type to BYTEA on PostgreSQL if it is still TEXT. Returns True if altered."""
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.begin() as connection:
+        data_type = connection.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'argument_maps' AND column_name = 'source_xml'"
+        )).scalar()
+        if data_type != "text":
+            return False
+        connection.execute(text(
+            "ALTER TABLE argument_maps ALTER COLUMN source_xml TYPE BYTEA USING convert_to(source_xml, 'UTF8')"
+        ))
+    logger.info("argument_maps.source_xml converted to BYTEA")
+    return True
+
+def compress_rows(engine: Engine, batch_size: int = 500, level: int = 6) -> int:
+    """Compress every source_xml value not compressed yet, in id order. Returns the number of rows written."""
+    statement = (
+        update(argument_maps)
+        .where(argument_maps.c.id == bindparam("row_id"))
+        .values(source_xml=bindparam("value", type_=LargeBinary))
+    )
+    last_id = 0
+    compressed = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(argument_maps.c.id, argument_maps.c.source_xml)
+                .where(argument_maps.c.id > last_id)
+                .order_by(argument_maps.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return compressed
+            last_id = rows[-1].id
+            batch = [
+                {"row_id": row.id, "value": compress_text(decompress_text(row.source_xml), level)}
+                for row in rows
+                if row.source_xml is not None
+                and (isinstance(row.source_xml, str) or not bytes(row.source_xml).startswith(COMPRESSED_PREFIX))
+            ]
+            if batch:
+                connection.execute(statement, batch)
+        compressed += len(batch)
+        logger.info(f"Compressed {compressed} source_xml values (up to argument map {last_id})")
+
+def run(database_url: str, batch_size: int, level: int) -> None:
+    engine = create_engine(database_url)
+    convert_column(engine)
+    compressed = compress_rows(engine, batch_size, level)
+    logger.info(f"Migration complete: {compressed} rows compressed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--level", type=int, default=6, help="zlib compression level (1-9)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    run(args.database_url, args.batch_size, args.level)
@@ -1,13 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Float, TIMESTAMP, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Float, TIMESTAMP, LargeBinary, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy_utils import LtreeType
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.ext.compiler import compiles
 from app.database.db import Base
+from app.database.types import CompressedText
 from datetime import datetime, UTC
 import uuid
 
 LTREE = LtreeType
 
+# SQLite renderings of the PostgreSQL-specific types, so the schema can be created
+# in-memory for tests and benchmarks
+@compiles(LtreeType, "sqlite")
+def _compile_ltree_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
 # Table: organizations
 class Organization(Base):
     __tablename__ = "organizations"
@@ -82,11 +94,14 @@ class ArgumentMap(Base):
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    source_xml = Column(Text)
+    # Stored compressed; only export paths need it, so it is never loaded with the row
+    # (select the column explicitly, or use undefer(); lazy loading it raises)
+    source_xml = deferred(Column(CompressedText()), raiseload=True)
     version = Column(Integer, default=1)
     is_published = Column(Boolean, default=False)
-    created_at = Column(TIMESTAMP, default=datetime.now(UTC))
-    updated_at = Column(TIMESTAMP, default=datetime.now(UTC))
+    # Evaluated per row: listings are ordered by creation time
+    created_at = Column(TIMESTAMP, default=lambda: datetime.now(UTC))
+    updated_at = Column(TIMESTAMP, default=lambda: datetime.now(UTC))
     organization = relationship("Organization", back_populates="argument_maps")
     creator = relationship("User", back_populates="created_argument_maps")
     statements = relationship("Statement", back_populates="argument_map")
@@ -105,6 +120,12 @@ class ArgumentMap(Base):
     evidences = relationship("Evidence", back_populates="argument_map")
     entity_relationships = relationship("EntityRelationship", back_populates="argument_map")
     import_logs = relationship("ImportLog", back_populates="argument_map")
+    # Keyset pagination of listings: (created_at, id) descending, per organization or creator
+    __table_args__ = (
+        Index("argument_maps_created_idx", created_at.desc(), id.desc()),
+        Index("argument_maps_org_created_idx", organization_id, created_at.desc(), id.desc()),
+        Index("argument_maps_creator_created_idx", creator_id, created_at.desc(), id.desc()),
+    )
 
 # Table: argument_map_versions
 class ArgumentMapVersion(Base):
@@ -113,12 +134,20 @@ class ArgumentMapVersion(Base):
     argument_map_id = Column(Integer, ForeignKey("argument_maps.id", ondelete="CASCADE"))
     version = Column(Integer, nullable=False)
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    # Full XML of legacy rows; newer rows store a compressed snapshot or delta in payload
     source_xml = Column(Text)
+    storage = Column(String(10))
+    # Snapshot version at the start of the delta chain (the row's own version for snapshots)
+    base_version = Column(Integer)
+    payload = Column(LargeBinary)
     change_description = Column(Text)
-    created_at = Column(TIMESTAMP, default=datetime.now(UTC))
+    created_at = Column(TIMESTAMP, default=lambda: datetime.now(UTC))
     argument_map = relationship("ArgumentMap", back_populates="versions")
     creator = relationship("User")
-    __table_args__ = (UniqueConstraint("argument_map_id", "version"),)
+    __table_args__ = (
+        UniqueConstraint("argument_map_id", "version"),
+        CheckConstraint("storage IN ('snapshot', 'delta')", name="ck_argument_map_versions_storage"),
+    )
 
 # Table: statements
 class Statement(Base):
@@ -139,6 +168,9 @@ class Statement(Base):
     outgoing_relationships = relationship("StatementRelationship", foreign_keys="[StatementRelationship.from_statement_id]", back_populates="from_statement")
     incoming_relationships = relationship("StatementRelationship", foreign_keys="[StatementRelationship.to_statement_id]", back_populates="to_statement")
     cross_references = relationship("CrossMapReference", back_populates="source_statement")
+    __table_args__ = (
+        Index("statements_map_external_id_idx", "argument_map_id", "external_id"),
+    )
 
 # Table: moralbert_scores
 class MoralBERTScore(Base):
@@ -153,6 +185,8 @@ class MoralBERTScore(Base):
     imported_at = Column(TIMESTAMP, default=datetime.now(UTC))
     updated_at = Column(TIMESTAMP, default=datetime.now(UTC))
     statement = relationship("Statement", back_populates="moralbert_scores")
+    # One score row per statement: bulk imports upsert on statement_id
+    __table_args__ = (UniqueConstraint("statement_id"),)
 
 
 # Table: statement_relationships
@@ -173,6 +207,7 @@ class StatementRelationship(Base):
     __table_args__ = (
         UniqueConstraint("from_statement_id", "to_statement_id"),
         CheckConstraint("strength BETWEEN 0 AND 1", name="ck_statement_relationships_strength"),
+        Index("statement_relationships_map_idx", "argument_map_id"),
     )
 
 # Table: cross_map_references
@@ -277,4 +312,28 @@ class XMLSchemaDefinition(Base):
     __table_args__ = (
         UniqueConstraint("name", "version", "schema_type"),
         CheckConstraint("schema_type IN ('XSD', 'SCHEMATRON')", name="ck_xml_schema_definitions_schema_type"),
-    )
\ No newline at end of file
+    )
+
+# Table: transform_jobs
+class TransformJob(Base):
+    __tablename__ = "transform_jobs"
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True)
+    status = Column(String(20), nullable=False, default="pending")
+    input_text = Column(Text, nullable=False)
+    argument_map_id = Column(Integer, ForeignKey("argument_maps.id", ondelete="SET NULL"))
+    error_status_code = Column(Integer)
+    error_message = Column(Text)
+    error_details = Column(JSONB)
+    attempts = Column(Integer, default=0)
+    locked_by = Column(String(255))
+    lease_expires_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, default=datetime.now(UTC))
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, default=datetime.now(UTC))
+    argument_map = relationship("ArgumentMap")
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'running', 'succeeded', 'failed')", name="ck_transform_jobs_status"),
+        Index("transform_jobs_status_idx", "status", "id"),
+    )
@@ -0,0 +1,37 @@
+import zlib
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# Marks zlib-compressed values; it cannot start an XML document, so values migrated from TEXT
+# as plain UTF-8 bytes (see app.database.migrate_source_xml) stay readable until compressed
+COMPRESSED_PREFIX = b"\x01"
+
+def compress_text(value: str, level: int = 6) -> bytes:
+    return COMPRESSED_PREFIX + zlib.compress(value.encode("utf-8"), level)
+
+def decompress_text(value: bytes | memoryview | str) -> str:
+    """Decode a stored value: compressed bytes, plain UTF-8 bytes, or text from a column not yet migrated."""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(value[len(COMPRESSED_PREFIX):]).decode("utf-8")
+    return value.decode("utf-8")
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed in a binary column (BYTEA on PostgreSQL), compressed on write
+    and decompressed on read. The database cannot search or compare the stored values.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, level: int = 6):
+        super().__init__()
+        self.level = level
+
+    def process_bind_param(self, value: str | None, dialect) -> bytes | None:
+        return compress_text(value, self.level) if value is not None else None
+
+    def process_result_value(self, value, dialect) -> str | None:
+        return decompress_text(value) if value is not None else None
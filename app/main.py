@@ -1,12 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE, MetricsMiddleware
 from app.core.logging import setup_logging
 from app.api.v1.endpoints.api import router_v1  # Import the central router
+from app.services.xml_executor_service import get_xml_executor_service
+from app.services.transform_job_service import get_transform_job_worker
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the asynchronous transform job runners
+    if settings.JOB_WORKER_CONCURRENCY > 0:
+        await get_transform_job_worker().start()
+    yield
+    # Let running jobs finish (interrupted jobs go back to the queue)
+    await get_transform_job_worker().stop(settings.JOB_SHUTDOWN_TIMEOUT_SECONDS)
+    # Stop the XML validation/parsing pool
+    get_xml_executor_service().shutdown()
+
 # Initialize FastAPI app
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Setup logging
 setup_logging()
@@ -20,9 +37,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (NDJSON streams are left untouched)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE)
+
+# Request latency and in-flight metrics (outermost: includes compression time)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include the v1 API routes
 app.include_router(router_v1, prefix="/api/v1")
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the Argument Map API"}
\ No newline at end of file
+    return {"message": "Welcome to the Argument Map API"}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
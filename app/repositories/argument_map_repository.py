@@ -1,11 +1,174 @@
-from sqlalchemy.orm import Session
-from app.database.models import ArgumentMap, Statement, StatementRelationship, Evidence
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import event, inspect, insert, select, update, delete, func, or_, cast, literal_column, type_coerce, tuple_, String, Row, Select
+from sqlalchemy.dialects.postgresql import TSVECTOR, REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy_utils import Ltree
+from sqlalchemy_utils.types.ltree import LQUERY
+from app.database.models import ArgumentMap, ArgumentMapVersion, Statement, StatementRelationship, Evidence
+from app.core.metrics import track_stage
+from app.services.version_store_service import VersionStore, VersionRecord
+from app.services.similarity_service import StatementSimilarityIndex, CrossReferenceCandidate
+from app.services.statement_search_service import (
+    StatementSearchIndex, StatementSearchHit, InvertedIndex, SEARCH_TEXT_CONFIG, SEARCH_RANK_NORMALIZATION, HEADLINE_OPTIONS
+)
+import asyncio
+import base64
+import json
 import uuid
 import logging
 
+# Columns returned by listings: never source_xml nor child tables
+ARGUMENT_MAP_SUMMARY_COLUMNS = (
+    ArgumentMap.id,
+    ArgumentMap.uuid,
+    ArgumentMap.organization_id,
+    ArgumentMap.creator_id,
+    ArgumentMap.title,
+    ArgumentMap.description,
+    ArgumentMap.version,
+    ArgumentMap.is_published,
+    ArgumentMap.created_at,
+    ArgumentMap.updated_at,
+)
+
+# Incremental similarity syncs re-read the maps updated shortly before the previous sync:
+# transactions still in flight then, clock skew between processes
+SIMILARITY_SYNC_OVERLAP = timedelta(seconds=60)
+
+def encode_cursor(created_at: datetime, map_id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of the last listed map."""
+    payload = json.dumps([created_at.isoformat(), map_id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, map_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(map_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _new_argument_map(parsed_data: dict, organization_id: int | None, creator_id: int | None) -> ArgumentMap:
+    """Build the ArgumentMap row for a parsed map."""
+    return ArgumentMap(
+        organization_id=organization_id,
+        creator_id=creator_id,
+        title=parsed_data.get("title", ""),
+        description=parsed_data.get("description", ""),
+        source_xml=parsed_data.get("source_xml", "")
+    )
+
+def _statement_rows(argument_map_id: int, statements: list[dict]) -> list[dict]:
+    """Build the Statement insert parameters for a parsed map."""
+    return [
+        {
+            "argument_map_id": argument_map_id,
+            "external_id": stmt.get("external_id"),
+            "statement_text": stmt.get("statement_text"),
+            "statement_type": stmt.get("statement_type"),
+            "path": Ltree(stmt["path"]) if stmt.get("path") else None,  # LtreeType only binds Ltree objects
+            "depth": stmt.get("depth", 0)
+        }
+        for stmt in statements
+    ]
+
+def _relationship_rows(argument_map_id: int, relationships: list[dict], statements_map: dict[str, int]) -> list[dict]:
+    """Build the StatementRelationship insert parameters, resolving external IDs to database IDs."""
+    return [
+        {
+            "argument_map_id": argument_map_id,
+            "from_statement_id": statements_map.get(rel["from_external_id"]),
+            "to_statement_id": statements_map.get(rel["to_external_id"]),
+            "relationship_type": rel["relationship_type"],
+            "convergence_group_id": uuid.UUID(rel["convergence_group_id"]) if rel.get("convergence_group_id") else None,
+            "strength": rel.get("strength")
+        }
+        for rel in relationships
+    ]
+
+def _evidence_rows(argument_map_id: int, evidence: list[dict]) -> list[dict]:
+    """Build the Evidence insert parameters for a parsed map."""
+    return [
+        {
+            "argument_map_id": argument_map_id,
+            "external_id": ev["external_id"],
+            "title": ev["title"],
+            "source_type": ev.get("source_type"),
+            "source_name": ev.get("source_name"),
+            "url": ev.get("url"),
+            "description": ev.get("description"),
+            "credibility_rating": ev.get("credibility_rating")
+        }
+        for ev in evidence
+    ]
+
+# Columns compared when diffing a stored map against a new parsed version
+STATEMENT_DIFF_COLUMNS = ("statement_text", "statement_type", "path", "depth")
+RELATIONSHIP_DIFF_COLUMNS = ("relationship_type", "convergence_group_id", "strength")
+EVIDENCE_DIFF_COLUMNS = ("title", "source_type", "source_name", "url", "description", "credibility_rating")
+
+class StaleMapVersionError(Exception):
+    """Raised when an argument map was modified concurrently during an update."""
+
+@dataclass
+class ArgumentMapChanges:
+    """Number of rows written by an incremental update, per table and operation."""
+    statements_inserted: int = 0
+    statements_updated: int = 0
+    statements_deleted: int = 0
+    relationships_inserted: int = 0
+    relationships_updated: int = 0
+    relationships_deleted: int = 0
+    evidence_inserted: int = 0
+    evidence_updated: int = 0
+    evidence_deleted: int = 0
+
+    @property
+    def row_count(self) -> int:
+        return sum(getattr(self, field.name) for field in fields(self))
+
+    def describe(self) -> str:
+        return ", ".join(f"{field.name}={getattr(self, field.name)}" for field in fields(self) if getattr(self, field.name))
+
+def diff_rows(
+    existing: dict[object, Row],
+    new: dict[object, dict],
+    columns: tuple[str, ...]
+) -> tuple[list[dict], list[dict], list[int]]:
+    """
+    Compare stored rows (with an `id` column) and new row parameters sharing the same keys.
+    Columns missing from a new row keep their stored value.
+
+    Returns:
+        tuple: Rows to insert, {"id", changed columns...} updates, and IDs to delete.
+    """
+    inserts, updates = [], []
+    for key, row in new.items():
+        current = existing.get(key)
+        if current is None:
+            inserts.append(row)
+            continue
+        changed = {column: row[column] for column in columns if column in row and row[column] != getattr(current, column)}
+        if changed:
+            updates.append({"id": current.id, **changed})
+    deletes = [row.id for key, row in existing.items() if key not in new]
+    return inserts, updates, deletes
+
 class ArgumentMapRepository:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, bulk_insert: bool = False):
+        """
+        Args:
+            db_session: SQLAlchemy session used for all operations.
+            bulk_insert: When True, statements, relationships and evidence are written with
+                multi-row INSERT statements instead of one ORM flush per statement.
+        """
         self.db_session = db_session
+        self.bulk_insert = bulk_insert
 
     def create_argument_map(self, parsed_data: dict, organization_id: int | None, creator_id: int | None) -> ArgumentMap:
         """
@@ -21,56 +184,14 @@ class ArgumentMapRepository:
         """
         try:
             # Create the argument map
-            argument_map = ArgumentMap(
-                organization_id=organization_id,
-                creator_id=creator_id,
-                title=parsed_data.get("title", ""),
-                description=parsed_data.get("description", ""),
-                source_xml=parsed_data.get("source_xml", "")
-            )
+            argument_map = _new_argument_map(parsed_data, organization_id, creator_id)
             self.db_session.add(argument_map)
             self.db_session.flush()  # Get the ID without committing
 
-            # Create statements
-            statements_map = {}  # Map external_id to database ID
-            for stmt in parsed_data.get("statements", []):
-                statement = Statement(
-                    argument_map_id=argument_map.id,
-                    external_id=stmt.get("external_id"),
-                    statement_text=stmt.get("statement_text"),
-                    statement_type=stmt.get("statement_type"),
-                    path=stmt.get("path"),  # Assume path is calculated in xml_parsing_service
-                    depth=stmt.get("depth", 0)
-                )
-                self.db_session.add(statement)
-                self.db_session.flush()
-                statements_map[stmt["external_id"]] = statement.id
-
-            # Create relationships
-            for rel in parsed_data.get("relationships", []):
-                relationship = StatementRelationship(
-                    argument_map_id=argument_map.id,
-                    from_statement_id=statements_map.get(rel["from_external_id"]),
-                    to_statement_id=statements_map.get(rel["to_external_id"]),
-                    relationship_type=rel["relationship_type"],
-                    convergence_group_id=uuid.UUID(rel["convergence_group_id"]) if rel.get("convergence_group_id") else None,
-                    strength=rel.get("strength")
-                )
-                self.db_session.add(relationship)
-
-            # Create evidence
-            for ev in parsed_data.get("evidence", []):
-                evidence = Evidence(
-                    argument_map_id=argument_map.id,
-                    external_id=ev["external_id"],
-                    title=ev["title"],
-                    source_type=ev.get("source_type"),
-                    source_name=ev.get("source_name"),
-                    url=ev.get("url"),
-                    description=ev.get("description"),
-                    credibility_rating=ev.get("credibility_rating")
-                )
-                self.db_session.add(evidence)
+            if self.bulk_insert:
+                self._bulk_insert_children(argument_map.id, parsed_data)
+            else:
+                self._insert_children(argument_map.id, parsed_data)
 
             logging.info(f"Created argument map with ID {argument_map.id}")
             return argument_map
@@ -79,8 +200,738 @@ class ArgumentMapRepository:
             logging.error(f"Error preparing argument map for database: {str(e)}")
             raise
 
+    def _insert_children(self, argument_map_id: int, parsed_data: dict) -> None:
+        """
+        Add statements, relationships and evidence through the ORM.
+        Each statement is flushed individually to read back its ID.
+        """
+        # Create statements
+        statements_map = {}  # Map external_id to database ID
+        for row in _statement_rows(argument_map_id, parsed_data.get("statements", [])):
+            statement = Statement(**row)
+            self.db_session.add(statement)
+            self.db_session.flush()
+            statements_map[row["external_id"]] = statement.id
+
+        # Create relationships
+        for row in _relationship_rows(argument_map_id, parsed_data.get("relationships", []), statements_map):
+            self.db_session.add(StatementRelationship(**row))
+
+        # Create evidence
+        for row in _evidence_rows(argument_map_id, parsed_data.get("evidence", [])):
+            self.db_session.add(Evidence(**row))
+
+    def _bulk_insert_children(self, argument_map_id: int, parsed_data: dict) -> None:
+        """
+        Insert statements with a multi-row INSERT ... RETURNING, map external IDs to
+        database IDs in memory, then bulk-insert relationships and evidence.
+        """
+        statement_rows = _statement_rows(argument_map_id, parsed_data.get("statements", []))
+        statements_map = {}  # Map external_id to database ID
+        if statement_rows:
+            result = self.db_session.execute(
+                insert(Statement).returning(Statement.id, Statement.external_id),
+                statement_rows
+            )
+            statements_map = {external_id: statement_id for statement_id, external_id in result}
+
+        relationship_rows = _relationship_rows(argument_map_id, parsed_data.get("relationships", []), statements_map)
+        if relationship_rows:
+            self.db_session.execute(insert(StatementRelationship), relationship_rows)
+
+        evidence_rows = _evidence_rows(argument_map_id, parsed_data.get("evidence", []))
+        if evidence_rows:
+            self.db_session.execute(insert(Evidence), evidence_rows)
+
     def get_argument_map(self, map_id: int) -> ArgumentMap | None:
         """
         Retrieve an argument map by ID.
         """
-        return self.db_session.query(ArgumentMap).filter(ArgumentMap.id == map_id).first()
\ No newline at end of file
+        return self.db_session.query(ArgumentMap).filter(ArgumentMap.id == map_id).first()
+
+# Generated column maintained by PostgreSQL (database-schema.sql), not mapped on Statement
+STATEMENT_SEARCH_VECTOR = literal_column("statements.search_vector", TSVECTOR)
+
+def build_statement_search_query(
+    query: str,
+    organization_id: int | None = None,
+    statement_type: str | None = None,
+    map_uuid: uuid.UUID | None = None,
+    limit: int = 20,
+    offset: int = 0
+) -> Select:
+    """
+    PostgreSQL full-text search over statements: matches come from the search_vector GIN index,
+    are ranked with ts_rank_cd, and only the returned page goes through ts_headline (the
+    costly part, since it re-parses the statement text).
+    """
+    config = cast(SEARCH_TEXT_CONFIG, REGCONFIG)
+    ts_query = func.websearch_to_tsquery(config, query)
+    rank = func.ts_rank_cd(STATEMENT_SEARCH_VECTOR, ts_query, SEARCH_RANK_NORMALIZATION)
+    page = (
+        select(
+            Statement.id.label("statement_id"),
+            ArgumentMap.uuid.label("argument_map_uuid"),
+            Statement.external_id,
+            Statement.statement_type,
+            Statement.statement_text,
+            rank.label("rank")
+        )
+        .join(ArgumentMap, Statement.argument_map_id == ArgumentMap.id)
+        .where(STATEMENT_SEARCH_VECTOR.bool_op("@@")(ts_query))
+    )
+    if organization_id is not None:
+        page = page.where(ArgumentMap.organization_id == organization_id)
+    if statement_type is not None:
+        page = page.where(Statement.statement_type == statement_type)
+    if map_uuid is not None:
+        page = page.where(ArgumentMap.uuid == map_uuid)
+    page = page.order_by(rank.desc(), Statement.id).limit(limit).offset(offset).subquery()
+    return select(
+        *page.c,
+        func.ts_headline(config, page.c.statement_text, ts_query, HEADLINE_OPTIONS).label("snippet")
+    ).order_by(page.c.rank.desc(), page.c.statement_id)
+
+class AsyncArgumentMapRepository:
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        bulk_insert: bool = False,
+        version_store: VersionStore | None = None,
+        search_index: StatementSearchIndex | None = None,
+        similarity_index: StatementSimilarityIndex | None = None
+    ):
+        """
+        Async counterpart of ArgumentMapRepository, used by the API endpoints so that
+        database I/O does not block the event loop.
+
+        Args:
+            db_session: SQLAlchemy async session used for all operations.
+            bulk_insert: When True, statements, relationships and evidence are written with
+                multi-row INSERT statements instead of one ORM flush per statement.
+            version_store: Stores map versions as compressed snapshots and deltas; without
+                it, each version row holds the full source XML.
+            search_index: In-memory statement search used on databases without full-text
+                search (SQLite); a temporary one is built per search when omitted.
+            similarity_index: Near-duplicate statement index; committed maps are queued for it,
+                and it is synced with the database before cross-reference suggestions.
+        """
+        self.db_session = db_session
+        self.bulk_insert = bulk_insert
+        self.version_store = version_store
+        self.search_index = search_index
+        self.similarity_index = similarity_index
+
+    async def create_argument_map(self, parsed_data: dict, organization_id: int | None, creator_id: int | None) -> ArgumentMap:
+        """
+        Create an argument map and its associated statements, relationships, and evidence.
+
+        Args:
+            parsed_data: Dictionary containing title, description, statements, relationships, and evidence.
+            organization_id: ID of the organization.
+            creator_id: ID of the user creating the map.
+
+        Returns:
+            ArgumentMap: The created (flushed, not committed) argument map.
+        """
+        try:
+            with track_stage("db_store"):
+                argument_map = _new_argument_map(parsed_data, organization_id, creator_id)
+                self.db_session.add(argument_map)
+                await self.db_session.flush()  # Get the ID without committing
+
+                if self.bulk_insert:
+                    statements_map = await self._bulk_insert_children(argument_map.id, parsed_data)
+                else:
+                    statements_map = await self._insert_children(argument_map.id, parsed_data)
+
+            if self.similarity_index is not None:
+                self._index_after_commit(argument_map, organization_id, [
+                    (statements_map[statement["external_id"]], statement["external_id"], statement["statement_text"])
+                    for statement in parsed_data.get("statements", [])
+                    if statement["external_id"] in statements_map
+                ])
+
+            logging.info(f"Created argument map with ID {argument_map.id}")
+            return argument_map
+
+        except Exception as e:
+            logging.error(f"Error preparing argument map for database: {str(e)}")
+            raise
+
+    def _index_after_commit(
+        self,
+        argument_map: ArgumentMap,
+        organization_id: int | None,
+        statements: list[tuple[int, str | None, str]]
+    ) -> None:
+        """
+        Queue a created map for the similarity index once its transaction commits, never if it
+        is rolled back. The hook runs on the event loop, so it only records the map: signatures
+        are computed by the next sync, in a worker thread.
+        """
+        similarity_index = self.similarity_index
+        map_uuid, version = str(argument_map.uuid), argument_map.version
+
+        def queue_map(session) -> None:
+            # A rolled-back insert leaves the map transient, even if the session commits later
+            if inspect(argument_map).persistent:
+                similarity_index.queue_map(map_uuid, version, organization_id, statements)
+
+        event.listen(self.db_session.sync_session, "after_commit", queue_map, once=True)
+
+    async def _insert_children(self, argument_map_id: int, parsed_data: dict) -> dict[str, int]:
+        """
+        Add statements, relationships and evidence through the ORM.
+        Each statement is flushed individually to read back its ID.
+        Returns the database ID of each statement external ID.
+        """
+        statements_map = {}  # Map external_id to database ID
+        for row in _statement_rows(argument_map_id, parsed_data.get("statements", [])):
+            statement = Statement(**row)
+            self.db_session.add(statement)
+            await self.db_session.flush()
+            statements_map[row["external_id"]] = statement.id
+
+        for row in _relationship_rows(argument_map_id, parsed_data.get("relationships", []), statements_map):
+            self.db_session.add(StatementRelationship(**row))
+
+        for row in _evidence_rows(argument_map_id, parsed_data.get("evidence", [])):
+            self.db_session.add(Evidence(**row))
+        return statements_map
+
+    async def _bulk_insert_children(self, argument_map_id: int, parsed_data: dict) -> dict[str, int]:
+        """
+        Insert statements with a multi-row INSERT ... RETURNING, map external IDs to
+        database IDs in memory, then bulk-insert relationships and evidence.
+        Returns the database ID of each statement external ID.
+        """
+        statement_rows = _statement_rows(argument_map_id, parsed_data.get("statements", []))
+        statements_map = {}  # Map external_id to database ID
+        if statement_rows:
+            result = await self.db_session.execute(
+                insert(Statement).returning(Statement.id, Statement.external_id),
+                statement_rows
+            )
+            statements_map = {external_id: statement_id for statement_id, external_id in result}
+
+        relationship_rows = _relationship_rows(argument_map_id, parsed_data.get("relationships", []), statements_map)
+        if relationship_rows:
+            await self.db_session.execute(insert(StatementRelationship), relationship_rows)
+
+        evidence_rows = _evidence_rows(argument_map_id, parsed_data.get("evidence", []))
+        if evidence_rows:
+            await self.db_session.execute(insert(Evidence), evidence_rows)
+        return statements_map
+
+    async def update_argument_map(
+        self,
+        map_uuid: uuid.UUID,
+        parsed_data: dict,
+        creator_id: int | None = None,
+        change_description: str | None = None,
+        expected_version: int | None = None
+    ) -> tuple[ArgumentMap, ArgumentMapChanges] | None:
+        """
+        Apply a new parsed version of an existing map by diffing it against the stored rows:
+        statements and evidence are matched by external_id, relationships by their
+        (from, to) external IDs, and only added, changed or removed rows are written.
+        The map version is bumped (compare-and-set on the previous version) and recorded in
+        argument_map_versions; the version before the first update is recorded too.
+        Submitting the stored source XML again changes nothing. With expected_version (e.g.
+        from an If-Match precondition), the update applies only to that version of the map.
+
+        Returns:
+            tuple: The updated (flushed, not committed) map and the row changes, or None if
+                the map does not exist.
+
+        Raises:
+            StaleMapVersionError: If the map was updated concurrently or is not at expected_version.
+        """
+        with track_stage("db_store"):
+            argument_map = (await self.db_session.execute(
+                select(ArgumentMap).where(ArgumentMap.uuid == map_uuid)
+            )).scalars().first()
+            if argument_map is None:
+                return None
+            map_id = argument_map.id
+            previous_version = argument_map.version
+            if expected_version is not None and previous_version != expected_version:
+                raise StaleMapVersionError(f"Argument map {map_uuid} is at version {previous_version}, not {expected_version}")
+            previous_source_xml = (await self.db_session.execute(
+                select(ArgumentMap.source_xml).where(ArgumentMap.id == map_id)
+            )).scalar()
+            source_xml = parsed_data.get("source_xml", "")
+            changes = ArgumentMapChanges()
+            if source_xml == previous_source_xml:
+                return argument_map, changes
+
+            # Bump the version first: concurrent updates of the same map serialize on this row
+            version = (previous_version or 1) + 1
+            result = await self.db_session.execute(
+                update(ArgumentMap)
+                .where(ArgumentMap.id == map_id, ArgumentMap.version == previous_version)
+                .values(
+                    title=parsed_data.get("title", ""),
+                    description=parsed_data.get("description", ""),
+                    source_xml=source_xml,
+                    version=version,
+                    updated_at=datetime.now(UTC)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                raise StaleMapVersionError(f"Argument map {map_uuid} was modified concurrently")
+
+            await self._apply_children_diff(map_id, parsed_data, changes)
+            await self._record_version(map_id, previous_version or 1, previous_source_xml, version, source_xml, creator_id, change_description or changes.describe())
+            await self.db_session.refresh(argument_map, ["title", "description", "version", "updated_at"])
+
+        logging.info(f"Updated argument map {map_id} to version {version} ({changes.row_count} rows written)")
+        return argument_map, changes
+
+    async def _apply_children_diff(self, map_id: int, parsed_data: dict, changes: ArgumentMapChanges) -> None:
+        """Write the statement, relationship and evidence differences of an update."""
+        existing_statements = {row.external_id: row for row in (await self.db_session.execute(
+            select(Statement.id, Statement.external_id, *(getattr(Statement, column) for column in STATEMENT_DIFF_COLUMNS))
+            .where(Statement.argument_map_id == map_id)
+        )).all()}
+        statement_ids = {external_id: row.id for external_id, row in existing_statements.items()}
+        external_ids = {row.id: external_id for external_id, row in existing_statements.items()}
+        existing_relationships = {
+            (external_ids.get(row.from_statement_id), external_ids.get(row.to_statement_id)): row
+            for row in (await self.db_session.execute(
+                select(StatementRelationship.id, StatementRelationship.from_statement_id, StatementRelationship.to_statement_id,
+                       *(getattr(StatementRelationship, column) for column in RELATIONSHIP_DIFF_COLUMNS))
+                .where(StatementRelationship.argument_map_id == map_id)
+            )).all()
+        }
+        existing_evidence = {row.external_id: row for row in (await self.db_session.execute(
+            select(Evidence.id, Evidence.external_id, *(getattr(Evidence, column) for column in EVIDENCE_DIFF_COLUMNS))
+            .where(Evidence.argument_map_id == map_id)
+        )).all()}
+
+        new_statements = {row["external_id"]: row for row in _statement_rows(map_id, parsed_data.get("statements", []))}
+        statement_inserts, statement_updates, statement_deletes = diff_rows(existing_statements, new_statements, STATEMENT_DIFF_COLUMNS)
+        # Relationship rows are keyed by external IDs until new statements have database IDs
+        new_relationships = {}
+        for rel in parsed_data.get("relationships", []):
+            row = _relationship_rows(map_id, [rel], {})[0]
+            if "strength" not in rel:
+                del row["strength"]  # Not part of the XML: keep the stored value
+            new_relationships[(rel["from_external_id"], rel["to_external_id"])] = row
+        relationship_inserts, relationship_updates, relationship_deletes = diff_rows(
+            existing_relationships, new_relationships, RELATIONSHIP_DIFF_COLUMNS
+        )
+        new_evidence = {row["external_id"]: row for row in _evidence_rows(map_id, parsed_data.get("evidence", []))}
+        evidence_inserts, evidence_updates, evidence_deletes = diff_rows(existing_evidence, new_evidence, EVIDENCE_DIFF_COLUMNS)
+
+        updated_at = datetime.now(UTC)
+        for row in (*statement_updates, *evidence_updates):
+            row["updated_at"] = updated_at
+
+        # Relationships go first: they may reference removed statements
+        await self._delete_rows(StatementRelationship, relationship_deletes)
+        await self._delete_rows(Statement, statement_deletes)
+        await self._delete_rows(Evidence, evidence_deletes)
+
+        if statement_inserts:
+            result = await self.db_session.execute(
+                insert(Statement).returning(Statement.id, Statement.external_id), statement_inserts
+            )
+            statement_ids.update({external_id: statement_id for statement_id, external_id in result})
+        await self._update_rows(Statement, statement_updates)
+
+        for key, row in new_relationships.items():
+            row["from_statement_id"] = statement_ids.get(key[0])
+            row["to_statement_id"] = statement_ids.get(key[1])
+        if relationship_inserts:
+            await self.db_session.execute(
+                insert(StatementRelationship), [{"strength": None, **row} for row in relationship_inserts]
+            )
+        await self._update_rows(StatementRelationship, relationship_updates)
+
+        if evidence_inserts:
+            await self.db_session.execute(insert(Evidence), evidence_inserts)
+        await self._update_rows(Evidence, evidence_updates)
+
+        changes.statements_inserted, changes.statements_updated, changes.statements_deleted = (
+            len(statement_inserts), len(statement_updates), len(statement_deletes)
+        )
+        changes.relationships_inserted, changes.relationships_updated, changes.relationships_deleted = (
+            len(relationship_inserts), len(relationship_updates), len(relationship_deletes)
+        )
+        changes.evidence_inserted, changes.evidence_updated, changes.evidence_deleted = (
+            len(evidence_inserts), len(evidence_updates), len(evidence_deletes)
+        )
+
+    async def _delete_rows(self, model, ids: list[int]) -> None:
+        if ids:
+            await self.db_session.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+
+    async def _update_rows(self, model, rows: list[dict]) -> None:
+        """Bulk UPDATE by primary key, one executemany per set of changed columns."""
+        by_columns: dict[tuple[str, ...], list[dict]] = {}
+        for row in rows:
+            by_columns.setdefault(tuple(sorted(row)), []).append(row)
+        for group in by_columns.values():
+            await self.db_session.execute(update(model), group)
+
+    async def _record_version(
+        self,
+        map_id: int,
+        previous_version: int,
+        previous_source_xml: str | None,
+        version: int,
+        source_xml: str,
+        creator_id: int | None,
+        change_description: str
+    ) -> None:
+        """Record a new map version, and the previous one if it was never recorded (maps created by import)."""
+        previous_row = (await self.db_session.execute(
+            select(ArgumentMapVersion.version, ArgumentMapVersion.storage, ArgumentMapVersion.base_version)
+            .where(ArgumentMapVersion.argument_map_id == map_id, ArgumentMapVersion.version == previous_version)
+        )).first()
+        rows = []
+        if self.version_store is None:
+            if previous_row is None:
+                rows.append({"argument_map_id": map_id, "version": previous_version, "source_xml": previous_source_xml})
+            rows.append({"argument_map_id": map_id, "version": version, "source_xml": source_xml})
+        else:
+            # Compression and delta encoding grow with the document: run them off the event loop
+            loop = asyncio.get_running_loop()
+            if previous_row is None:
+                previous_record = await loop.run_in_executor(None, self.version_store.make_record, previous_version, previous_source_xml or "")
+                rows.append(self._version_row(map_id, previous_record))
+            else:
+                previous_record = VersionRecord(previous_row.version, previous_row.storage, previous_row.base_version, None)
+            record = await loop.run_in_executor(
+                None, self.version_store.make_record, version, source_xml, previous_record, previous_source_xml or ""
+            )
+            rows.append(self._version_row(map_id, record))
+        rows[-1].update(creator_id=creator_id, change_description=change_description)
+        for row in rows:
+            self.db_session.add(ArgumentMapVersion(**row))
+        await self.db_session.flush()
+
+    @staticmethod
+    def _version_row(map_id: int, record: VersionRecord) -> dict:
+        return {
+            "argument_map_id": map_id,
+            "version": record.version,
+            "storage": record.storage,
+            "base_version": record.base_version,
+            "payload": record.payload
+        }
+
+    async def list_versions(self, map_uuid: uuid.UUID) -> list[Row] | None:
+        """
+        Recorded versions of a map, newest first, as (version, creator_id, change_description,
+        created_at, storage, stored_bytes) rows (None if the map does not exist).
+        """
+        map_id = (await self.db_session.execute(select(ArgumentMap.id).where(ArgumentMap.uuid == map_uuid))).scalar()
+        if map_id is None:
+            return None
+        result = await self.db_session.execute(
+            select(
+                ArgumentMapVersion.version,
+                ArgumentMapVersion.creator_id,
+                ArgumentMapVersion.change_description,
+                ArgumentMapVersion.created_at,
+                ArgumentMapVersion.storage,
+                func.coalesce(func.length(ArgumentMapVersion.payload), func.length(ArgumentMapVersion.source_xml)).label("stored_bytes")
+            )
+            .where(ArgumentMapVersion.argument_map_id == map_id)
+            .order_by(ArgumentMapVersion.version.desc())
+        )
+        return result.all()
+
+    async def get_version_source(self, map_uuid: uuid.UUID, version: int) -> str | None:
+        """
+        Source XML of a map version, reconstructed from its snapshot and the deltas after it
+        (recently read versions come from the version store LRU). The current version of a map
+        that was never updated is read from the map itself. None if the version does not exist.
+        """
+        map_row = (await self.db_session.execute(
+            select(ArgumentMap.id, ArgumentMap.version).where(ArgumentMap.uuid == map_uuid)
+        )).first()
+        if map_row is None:
+            return None
+        columns = (ArgumentMapVersion.version, ArgumentMapVersion.storage, ArgumentMapVersion.base_version)
+        target = (await self.db_session.execute(
+            select(*columns).where(ArgumentMapVersion.argument_map_id == map_row.id, ArgumentMapVersion.version == version)
+        )).first()
+        if target is None:
+            if version != map_row.version:
+                return None
+            return (await self.db_session.execute(select(ArgumentMap.source_xml).where(ArgumentMap.id == map_row.id))).scalar()
+
+        store = self.version_store or VersionStore(snapshot_interval=1, max_delta_ratio=0, cache_max_entries=0)
+        cached = store.get_cached(map_row.id, version)
+        if cached is not None:
+            return cached
+        chain_start = store.chain_start(VersionRecord(*target, None))
+        rows = (await self.db_session.execute(
+            select(*columns, ArgumentMapVersion.payload, ArgumentMapVersion.source_xml)
+            .where(
+                ArgumentMapVersion.argument_map_id == map_row.id,
+                ArgumentMapVersion.version >= chain_start,
+                ArgumentMapVersion.version <= version
+            )
+            .order_by(ArgumentMapVersion.version)
+        )).all()
+        return store.reconstruct(map_row.id, [VersionRecord(*row) for row in rows])
+
+    async def get_argument_map(self, map_id: int) -> ArgumentMap | None:
+        """
+        Retrieve an argument map by ID.
+        """
+        result = await self.db_session.execute(select(ArgumentMap).where(ArgumentMap.id == map_id))
+        return result.scalars().first()
+
+    async def get_argument_map_with_children(self, map_uuid: uuid.UUID) -> ArgumentMap | None:
+        """
+        Retrieve an argument map by UUID with its statements, relationships and evidence,
+        in a constant number of queries (one SELECT ... IN per collection instead of lazy loads).
+        The source XML is not loaded.
+        """
+        stmt = (
+            select(ArgumentMap)
+            .where(ArgumentMap.uuid == map_uuid)
+            .options(
+                selectinload(ArgumentMap.statements),
+                selectinload(ArgumentMap.statement_relationships),
+                selectinload(ArgumentMap.evidences)
+            )
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalars().first()
+
+    async def get_argument_map_version(self, map_uuid: uuid.UUID) -> int | None:
+        """
+        Retrieve the version of an argument map (None if the map does not exist).
+        """
+        result = await self.db_session.execute(select(ArgumentMap.version).where(ArgumentMap.uuid == map_uuid))
+        return result.scalar()
+
+    async def get_argument_graph(self, map_uuid: uuid.UUID) -> tuple[int, list[Row], list[Row]] | None:
+        """
+        Retrieve the version of a map with its statements as (id, external_id) rows, ordered by id,
+        and its relationships as (from_statement_id, to_statement_id, relationship_type, strength)
+        rows. Only these columns are read (no ORM objects), for graph computations.
+        """
+        map_row = (await self.db_session.execute(
+            select(ArgumentMap.id, ArgumentMap.version).where(ArgumentMap.uuid == map_uuid)
+        )).first()
+        if map_row is None:
+            return None
+        statements = (await self.db_session.execute(
+            select(Statement.id, Statement.external_id).where(Statement.argument_map_id == map_row.id).order_by(Statement.id)
+        )).all()
+        relationships = (await self.db_session.execute(
+            select(
+                StatementRelationship.from_statement_id,
+                StatementRelationship.to_statement_id,
+                StatementRelationship.relationship_type,
+                StatementRelationship.strength
+            ).where(StatementRelationship.argument_map_id == map_row.id)
+        )).all()
+        return map_row.version, statements, relationships
+
+    async def search_statements(
+        self,
+        query: str,
+        organization_id: int | None = None,
+        statement_type: str | None = None,
+        map_uuid: uuid.UUID | None = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> list[StatementSearchHit]:
+        """
+        Full-text search over statement texts, best matches first, with highlighted snippets.
+        PostgreSQL uses the search_vector GIN index (see build_statement_search_query); other
+        databases search in-memory inverted indexes, built per map version on first use.
+        """
+        if self.db_session.get_bind().dialect.name == "postgresql":
+            rows = (await self.db_session.execute(
+                build_statement_search_query(query, organization_id, statement_type, map_uuid, limit, offset)
+            )).all()
+            return [StatementSearchHit(**{**row._asdict(), "argument_map_uuid": str(row.argument_map_uuid)}) for row in rows]
+
+        maps_stmt = select(ArgumentMap.id, ArgumentMap.uuid, ArgumentMap.version)
+        if organization_id is not None:
+            maps_stmt = maps_stmt.where(ArgumentMap.organization_id == organization_id)
+        if map_uuid is not None:
+            maps_stmt = maps_stmt.where(ArgumentMap.uuid == map_uuid)
+        maps = (await self.db_session.execute(maps_stmt)).all()
+
+        search_index = self.search_index or StatementSearchIndex(max_maps=len(maps))
+        indexes = {map_row.id: search_index.get(str(map_row.uuid), map_row.version) for map_row in maps}
+        missing = [map_id for map_id, index in indexes.items() if index is None]
+        if missing:
+            for map_id in missing:
+                indexes[map_id] = InvertedIndex()
+            rows = await self.db_session.execute(
+                select(Statement.argument_map_id, Statement.id, Statement.external_id, Statement.statement_type, Statement.statement_text)
+                .where(Statement.argument_map_id.in_(missing))
+            )
+            for map_id, *statement in rows:
+                indexes[map_id].add(*statement)
+            for map_row in maps:
+                if map_row.id in missing:
+                    search_index.put(str(map_row.uuid), map_row.version, indexes[map_row.id])
+        return search_index.search(
+            ((str(map_row.uuid), indexes[map_row.id]) for map_row in maps), query, statement_type, limit, offset
+        )
+
+    async def sync_similarity_index(self, organization_id: int | None, batch_size: int = 500) -> None:
+        """
+        Bring the maps of an organization in the similarity index in line with the database:
+        maps queued after their commit are indexed first, then maps created or updated (by any
+        process) since the last sync of the organization are (re)indexed. The first sync reads
+        all the maps of the organization; later ones only those updated since the previous sync
+        (minus SIMILARITY_SYNC_OVERLAP). Signatures are computed in a worker thread, off the
+        event loop.
+        """
+        started_at = datetime.now(UTC)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.similarity_index.index_queued)
+        query = select(ArgumentMap.id, ArgumentMap.uuid, ArgumentMap.version, ArgumentMap.organization_id).where(
+            ArgumentMap.organization_id.is_(None) if organization_id is None else ArgumentMap.organization_id == organization_id
+        )
+        synced_at = self.similarity_index.synced_at(organization_id)
+        if synced_at is not None:
+            query = query.where(ArgumentMap.updated_at >= synced_at - SIMILARITY_SYNC_OVERLAP)
+        maps = (await self.db_session.execute(query)).all()
+        indexed = self.similarity_index.versions()
+        stale = [map_row for map_row in maps if indexed.get(str(map_row.uuid)) != map_row.version]
+        for start in range(0, len(stale), batch_size):
+            batch = {map_row.id: map_row for map_row in stale[start:start + batch_size]}
+            statements: dict[int, list[tuple[int, str | None, str]]] = {map_id: [] for map_id in batch}
+            rows = await self.db_session.execute(
+                select(Statement.argument_map_id, Statement.id, Statement.external_id, Statement.statement_text)
+                .where(Statement.argument_map_id.in_(batch))
+                .order_by(Statement.id)
+            )
+            for map_id, *statement in rows:
+                statements[map_id].append(tuple(statement))
+            await loop.run_in_executor(None, self._index_maps, list(batch.values()), statements)
+        self.similarity_index.mark_synced(organization_id, started_at)
+        if stale:
+            logging.info(f"Similarity index synced: {len(stale)} maps indexed")
+
+    def _index_maps(self, maps: list[Row], statements: dict[int, list[tuple[int, str | None, str]]]) -> None:
+        for map_row in maps:
+            self.similarity_index.add_map(str(map_row.uuid), map_row.version, map_row.organization_id, statements[map_row.id])
+
+    async def get_cross_reference_candidates(
+        self,
+        map_uuid: uuid.UUID,
+        threshold: float,
+        max_per_statement: int
+    ) -> list[CrossReferenceCandidate] | None:
+        """
+        Statements of other maps of the same organization that nearly duplicate a statement of
+        the map (candidate CrossMapReference links), from the similarity index after a sync of
+        the organization. Maps deleted since they were indexed are dropped from the index and
+        from the candidates. None if the map does not exist.
+        """
+        map_row = (await self.db_session.execute(
+            select(ArgumentMap.id, ArgumentMap.organization_id).where(ArgumentMap.uuid == map_uuid)
+        )).first()
+        if map_row is None:
+            return None
+        await self.sync_similarity_index(map_row.organization_id)
+        candidates = self.similarity_index.candidates(str(map_uuid), threshold, max_per_statement)
+        targets = {candidate.target_map_uuid for candidate in candidates}
+        if not targets:
+            return candidates
+        existing = {str(value) for value in (await self.db_session.execute(
+            select(ArgumentMap.uuid).where(ArgumentMap.uuid.in_([uuid.UUID(target) for target in targets]))
+        )).scalars()}
+        for deleted in targets - existing:
+            self.similarity_index.remove_map(deleted)
+        return [candidate for candidate in candidates if candidate.target_map_uuid in existing]
+
+    async def get_statement(self, map_uuid: uuid.UUID, external_id: str) -> Statement | None:
+        """
+        Retrieve a statement of a map by its external (XML) ID.
+        """
+        stmt = (
+            select(Statement)
+            .join(ArgumentMap, Statement.argument_map_id == ArgumentMap.id)
+            .where(ArgumentMap.uuid == map_uuid, Statement.external_id == external_id)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalars().first()
+
+    async def get_statement_subtree(self, root: Statement, max_depth: int | None = None) -> tuple[list[Statement], list[StatementRelationship]]:
+        """
+        Retrieve the statements below a root statement (itself included) through their ltree path,
+        down to max_depth levels, and the relationships between them. Only the branch is read.
+
+        On PostgreSQL the path filter (`<@`, or `~ 'root.*{0,N}'` when the depth is bounded) uses the
+        statements_path_idx GIST index; other databases fall back to a prefix match on the path text.
+        """
+        if root.path is None:
+            return [root], []
+
+        if self.db_session.get_bind().dialect.name == "postgresql":
+            if max_depth is None:
+                path_filter = Statement.path.descendant_of(root.path)
+            else:
+                path_filter = Statement.path.lquery(cast(f"{root.path.path}.*{{0,{max_depth}}}", LQUERY))
+        else:
+            # Labels only contain [A-Za-z0-9_]: escape the LIKE wildcard "_"
+            prefix = root.path.path.replace("_", "\\_")
+            path_filter = or_(Statement.path == root.path, type_coerce(Statement.path, String).like(f"{prefix}.%", escape="\\"))
+            if max_depth is not None:
+                path_filter = path_filter & (Statement.depth <= (root.depth or 0) + max_depth)
+
+        statements_stmt = (
+            select(Statement)
+            .where(Statement.argument_map_id == root.argument_map_id, path_filter)
+            .order_by(Statement.path, Statement.id)
+        )
+        statements = list((await self.db_session.execute(statements_stmt)).scalars())
+
+        subtree_ids = select(Statement.id).where(Statement.argument_map_id == root.argument_map_id, path_filter)
+        relationships_stmt = (
+            select(StatementRelationship)
+            .where(
+                StatementRelationship.argument_map_id == root.argument_map_id,
+                StatementRelationship.from_statement_id.in_(subtree_ids),
+                StatementRelationship.to_statement_id.in_(subtree_ids)
+            )
+            .order_by(StatementRelationship.id)
+        )
+        relationships = list((await self.db_session.execute(relationships_stmt)).scalars())
+        return statements, relationships
+
+    async def list_argument_maps(
+        self,
+        limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        organization_id: int | None = None,
+        creator_id: int | None = None,
+        is_published: bool | None = None
+    ) -> list[Row]:
+        """
+        List argument map summaries, newest first, with keyset pagination on (created_at, id):
+        each page starts right after the cursor position, so the cost does not grow with the
+        page number. Up to limit + 1 rows are returned so the caller can detect a next page.
+        """
+        stmt = select(*ARGUMENT_MAP_SUMMARY_COLUMNS)
+        if organization_id is not None:
+            stmt = stmt.where(ArgumentMap.organization_id == organization_id)
+        if creator_id is not None:
+            stmt = stmt.where(ArgumentMap.creator_id == creator_id)
+        if is_published is not None:
+            stmt = stmt.where(ArgumentMap.is_published == is_published)
+        if cursor is not None:
+            # Row-value comparison matching the (created_at DESC, id DESC) indexes
+            stmt = stmt.where(tuple_(ArgumentMap.created_at, ArgumentMap.id) < tuple_(*cursor))
+        stmt = stmt.order_by(ArgumentMap.created_at.desc(), ArgumentMap.id.desc()).limit(limit + 1)
+        result = await self.db_session.execute(stmt)
+        return list(result.all())
+
@@ -0,0 +1,49 @@
+from datetime import datetime, UTC
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import MoralBERTScore, Statement
+import uuid
+
+# The five moral foundation scores of a statement, in [-1, 1]
+MORALBERT_SCORE_COLUMNS = (
+    "care_harm_score",
+    "fairness_cheating_score",
+    "loyalty_betrayal_score",
+    "authority_subversion_score",
+    "sanctity_degradation_score",
+)
+
+class AsyncMoralBERTRepository:
+    def __init__(self, db_session: AsyncSession):
+        """
+        Persistence of MoralBERT scores (one row per statement, unique on statement_id).
+        """
+        self.db = db_session
+
+    async def resolve_statement_ids(self, statement_uuids: Iterable[uuid.UUID]) -> dict[uuid.UUID, int]:
+        """Database ID of each known statement UUID, in a single query."""
+        statement_uuids = list(set(statement_uuids))
+        if not statement_uuids:
+            return {}
+        rows = await self.db.execute(select(Statement.uuid, Statement.id).where(Statement.uuid.in_(statement_uuids)))
+        return {statement_uuid: statement_id for statement_uuid, statement_id in rows}
+
+    async def upsert_scores(self, rows: list[dict]) -> int:
+        """
+        Insert or replace the scores of statements with one multi-row INSERT ... ON CONFLICT
+        (statement_id) DO UPDATE. Rows hold statement_id and the score columns; a statement
+        must appear only once per call.
+        """
+        if not rows:
+            return 0
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        now = datetime.now(UTC)
+        stmt = dialect_insert(MoralBERTScore).values([{**row, "imported_at": now, "updated_at": now} for row in rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MoralBERTScore.statement_id],
+            set_={**{column: stmt.excluded[column] for column in MORALBERT_SCORE_COLUMNS}, "updated_at": stmt.excluded.updated_at}
+        )
+        await self.db.execute(stmt)
+        return len(rows)
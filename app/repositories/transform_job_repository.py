@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import TransformJob, ArgumentMap
+import uuid
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_JOB_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+class AsyncTransformJobRepository:
+    def __init__(self, db_session: AsyncSession):
+        """
+        Persistence of asynchronous transform jobs. Running jobs hold a lease: a job whose
+        lease has expired (worker crash or restart) is claimable again.
+        """
+        self.db = db_session
+
+    async def create_job(self, input_text: str) -> TransformJob:
+        now = datetime.now(UTC)
+        job = TransformJob(status=JOB_PENDING, input_text=input_text, attempts=0, created_at=now, updated_at=now)
+        self.db.add(job)
+        await self.db.flush()
+        return job
+
+    async def get_job(self, job_uuid: uuid.UUID) -> tuple[TransformJob, uuid.UUID | None] | None:
+        """Return the job and the UUID of the argument map it produced, or None if the job does not exist."""
+        stmt = (
+            select(TransformJob, ArgumentMap.uuid)
+            .outerjoin(ArgumentMap, TransformJob.argument_map_id == ArgumentMap.id)
+            .where(TransformJob.uuid == job_uuid)
+        )
+        row = (await self.db.execute(stmt)).first()
+        return (row[0], row[1]) if row else None
+
+    async def claim_next_job(self, worker_id: str, lease_seconds: float, max_attempts: int) -> TransformJob | None:
+        """
+        Lock the oldest pending job (or running job with an expired lease and attempts left) for a worker.
+        On PostgreSQL, FOR UPDATE SKIP LOCKED lets concurrent workers claim distinct jobs; the
+        conditional UPDATE keeps the claim exclusive on databases without row locks.
+        """
+        now = datetime.now(UTC)
+        claimable = or_(
+            TransformJob.status == JOB_PENDING,
+            and_(TransformJob.status == JOB_RUNNING, TransformJob.lease_expires_at < now, TransformJob.attempts < max_attempts)
+        )
+        stmt = (
+            select(TransformJob.id)
+            .where(claimable)
+            .order_by(TransformJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job_id = (await self.db.execute(stmt)).scalar()
+        if job_id is None:
+            return None
+
+        claim = (
+            update(TransformJob)
+            .where(TransformJob.id == job_id, claimable)
+            .values(
+                status=JOB_RUNNING,
+                locked_by=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=TransformJob.attempts + 1,
+                started_at=now,
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if (await self.db.execute(claim)).rowcount != 1:
+            return None
+        return await self.db.get(TransformJob, job_id, populate_existing=True)
+
+    async def fail_exhausted_jobs(self, max_attempts: int) -> int:
+        """
+        Fail the running jobs whose lease has expired after their last allowed attempt (the
+        worker died while running them, e.g. killed for lack of memory). Returns their number.
+        """
+        now = datetime.now(UTC)
+        stmt = (
+            update(TransformJob)
+            .where(TransformJob.status == JOB_RUNNING, TransformJob.lease_expires_at < now, TransformJob.attempts >= max_attempts)
+            .values(
+                status=JOB_FAILED, error_status_code=500, error_message="Internal server error",
+                locked_by=None, lease_expires_at=None, finished_at=now, updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return (await self.db.execute(stmt)).rowcount
+
+    async def renew_lease(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job still held by the worker. Returns False if the job was taken over."""
+        now = datetime.now(UTC)
+        return await self._update_held_job(job_id, worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds), updated_at=now)
+
+    async def complete_job(self, job_id: int, worker_id: str, argument_map_id: int) -> bool:
+        now = datetime.now(UTC)
+        return await self._update_held_job(
+            job_id, worker_id,
+            status=JOB_SUCCEEDED, argument_map_id=argument_map_id,
+            error_status_code=None, error_message=None,
+            locked_by=None, lease_expires_at=None, finished_at=now, updated_at=now
+        )
+
+    async def fail_job(self, job_id: int, worker_id: str, status_code: int, error_message: str, error_details: list[str] | None = None) -> bool:
+        now = datetime.now(UTC)
+        return await self._update_held_job(
+            job_id, worker_id,
+            status=JOB_FAILED, error_status_code=status_code, error_message=error_message, error_details=error_details,
+            locked_by=None, lease_expires_at=None, finished_at=now, updated_at=now
+        )
+
+    async def release_job(self, job_id: int, worker_id: str, error_message: str | None = None) -> bool:
+        """Put a job held by the worker back in the queue (retry or interrupted by shutdown)."""
+        return await self._update_held_job(
+            job_id, worker_id,
+            status=JOB_PENDING, error_message=error_message,
+            locked_by=None, lease_expires_at=None, updated_at=datetime.now(UTC)
+        )
+
+    async def _update_held_job(self, job_id: int, worker_id: str, **values) -> bool:
+        stmt = (
+            update(TransformJob)
+            .where(TransformJob.id == job_id, TransformJob.locked_by == worker_id, TransformJob.status == JOB_RUNNING)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount == 1
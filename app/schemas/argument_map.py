@@ -1,6 +1,7 @@
 # app/models/argument_map.py
 from pydantic import BaseModel, Field
-from typing import Optional  # Pour des champs optionnels futurs, si nécessaire
+from datetime import datetime
+from typing import Annotated, Literal, Optional  # Pour des champs optionnels futurs, si nécessaire
 
 class TextInputModel(BaseModel):
     """
@@ -12,6 +13,18 @@ class TextInputModel(BaseModel):
         description="Le texte brut à transformer en carte argumentative."
     )
 
+# Contenu renvoyé avec les identifiants de la carte créée : le XML complet (par défaut),
+# un simple décompte, ou les données structurées extraites
+ResponseMode = Literal["full", "summary", "parsed"]
+
+class ArgumentMapCountsModel(BaseModel):
+    """
+    Modèle pour le résumé d'une carte argumentative créée.
+    """
+    statements: int = Field(..., description="Le nombre de statements.")
+    relationships: int = Field(..., description="Le nombre de relations.")
+    evidence: int = Field(..., description="Le nombre de preuves.")
+
 class ArgumentMapResponseModel(BaseModel):
     """
     Modèle pour la réponse contenant les détails de la carte argumentative créée.
@@ -24,9 +37,17 @@ class ArgumentMapResponseModel(BaseModel):
         ...,
         description="L'identifiant UUID public de la carte argumentative."
     )
-    xml_content: str = Field(
-        ...,
-        description="Le contenu XML généré pour la carte argumentative."
+    xml_content: Optional[str] = Field(
+        None,
+        description="Le contenu XML généré pour la carte argumentative (mode de réponse 'full')."
+    )
+    summary: Optional[ArgumentMapCountsModel] = Field(
+        None,
+        description="Le nombre de statements, relations et preuves de la carte (mode de réponse 'summary')."
+    )
+    parsed_data: Optional[dict] = Field(
+        None,
+        description="Les données structurées extraites du XML (mode de réponse 'parsed')."
     )
 
     class Config:
@@ -39,4 +60,225 @@ class XMLInputModel(BaseModel):
     xml_content: str = Field(
         ...,
         description="Le contenu XML à importer pour créer la carte argumentative."
-    )
\ No newline at end of file
+    )
+
+class BatchTextInputModel(BaseModel):
+    """
+    Modèle pour l'entrée d'un lot de textes à transformer en cartes argumentatives.
+    """
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Les textes bruts à transformer, chacun en une carte argumentative."
+    )
+
+class BatchItemResultModel(BaseModel):
+    """
+    Modèle pour le résultat d'un texte d'un lot : la carte créée ou l'erreur rencontrée.
+    """
+    index: int = Field(..., description="La position du texte dans le lot.")
+    status: Literal["succeeded", "failed"] = Field(..., description="Le statut du traitement du texte.")
+    id: Optional[str] = Field(None, description="L'identifiant de la carte créée.")
+    uuid: Optional[str] = Field(None, description="L'identifiant UUID public de la carte créée.")
+    xml_content: Optional[str] = Field(None, description="Le contenu XML généré (mode de réponse 'full').")
+    summary: Optional[ArgumentMapCountsModel] = Field(None, description="Le décompte de la carte créée (mode de réponse 'summary').")
+    parsed_data: Optional[dict] = Field(None, description="Les données structurées extraites (mode de réponse 'parsed').")
+    status_code: Optional[int] = Field(None, description="Le code HTTP équivalent à l'erreur.")
+    error: Optional[str] = Field(None, description="Le message d'erreur.")
+    errors: Optional[list[str]] = Field(None, description="Les erreurs de validation XML détaillées.")
+
+class BatchArgumentMapResponseModel(BaseModel):
+    """
+    Modèle pour la réponse d'un lot : un résultat par texte, dans l'ordre de la requête.
+    """
+    results: list[BatchItemResultModel]
+    succeeded: int = Field(..., description="Le nombre de textes transformés et enregistrés.")
+    failed: int = Field(..., description="Le nombre de textes en erreur.")
+
+class TransformJobResponseModel(BaseModel):
+    """
+    Modèle pour l'état d'une tâche asynchrone de transformation de texte.
+    """
+    job_id: str = Field(..., description="L'identifiant UUID de la tâche.")
+    status: Literal["pending", "running", "succeeded", "failed"] = Field(..., description="Le statut de la tâche.")
+    status_url: str = Field(..., description="L'URL de suivi de la tâche.")
+    attempts: int = Field(0, description="Le nombre de tentatives de traitement.")
+    created_at: Optional[datetime] = Field(None, description="La date de création de la tâche.")
+    finished_at: Optional[datetime] = Field(None, description="La date de fin de la tâche.")
+    id: Optional[str] = Field(None, description="L'identifiant de la carte créée (tâche réussie).")
+    uuid: Optional[str] = Field(None, description="L'identifiant UUID public de la carte créée (tâche réussie).")
+    status_code: Optional[int] = Field(None, description="Le code HTTP équivalent à l'erreur (tâche en échec).")
+    error: Optional[str] = Field(None, description="Le message d'erreur (tâche en échec).")
+    errors: Optional[list[str]] = Field(None, description="Les erreurs de validation XML détaillées.")
+
+class StatementModel(BaseModel):
+    """
+    Modèle pour un statement d'une carte argumentative.
+    """
+    id: int = Field(..., description="L'identifiant du statement.")
+    external_id: Optional[str] = Field(None, description="L'identifiant du statement dans le XML source.")
+    statement_text: str = Field(..., description="Le texte du statement.")
+    statement_type: Optional[str] = Field(None, description="Le type du statement (premise, conclusion, rebuttal, counter_conclusion).")
+    path: Optional[str] = Field(None, description="Le chemin hiérarchique (ltree) du statement.")
+    depth: Optional[int] = Field(None, description="La profondeur du statement dans la hiérarchie.")
+
+class RelationshipModel(BaseModel):
+    """
+    Modèle pour une relation entre deux statements.
+    """
+    id: int = Field(..., description="L'identifiant de la relation.")
+    from_statement_id: Optional[int] = Field(None, description="L'identifiant du statement source.")
+    to_statement_id: Optional[int] = Field(None, description="L'identifiant du statement cible.")
+    from_external_id: Optional[str] = Field(None, description="L'identifiant XML du statement source.")
+    to_external_id: Optional[str] = Field(None, description="L'identifiant XML du statement cible.")
+    relationship_type: Optional[str] = Field(None, description="Le type de relation (support, oppose).")
+    convergence_group_id: Optional[str] = Field(None, description="Le groupe de prémisses liées, le cas échéant.")
+    strength: Optional[float] = Field(None, description="La force de la relation.")
+
+class EvidenceModel(BaseModel):
+    """
+    Modèle pour une preuve associée à une carte argumentative.
+    """
+    id: int = Field(..., description="L'identifiant de la preuve.")
+    external_id: Optional[str] = Field(None, description="L'identifiant de la preuve dans le XML source.")
+    title: str = Field(..., description="Le titre de la preuve.")
+    source_type: Optional[str] = None
+    source_name: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+    credibility_rating: Optional[float] = None
+
+class ArgumentMapDetailModel(BaseModel):
+    """
+    Modèle pour une carte argumentative complète : métadonnées, statements, relations et preuves.
+    """
+    id: str = Field(..., description="L'identifiant unique de la carte argumentative.")
+    uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    title: str = Field(..., description="Le titre de la carte.")
+    description: Optional[str] = Field(None, description="La description de la carte.")
+    version: Optional[int] = Field(None, description="La version de la carte.")
+    is_published: Optional[bool] = Field(None, description="Indique si la carte est publiée.")
+    created_at: Optional[datetime] = Field(None, description="La date de création de la carte.")
+    statements: list[StatementModel]
+    relationships: list[RelationshipModel]
+    evidence: list[EvidenceModel]
+
+class StatementSubtreeModel(BaseModel):
+    """
+    Modèle pour une branche d'une carte argumentative, à partir d'un statement racine.
+    """
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    root_external_id: str = Field(..., description="L'identifiant XML du statement racine de la branche.")
+    max_depth: Optional[int] = Field(None, description="Le nombre maximal de niveaux sous la racine.")
+    statements: list[StatementModel]
+    relationships: list[RelationshipModel]
+
+class ArgumentMapSummaryModel(BaseModel):
+    """
+    Modèle pour une carte argumentative dans une liste (sans XML source ni statements).
+    """
+    id: str = Field(..., description="L'identifiant unique de la carte argumentative.")
+    uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    organization_id: Optional[int] = Field(None, description="L'organisation propriétaire de la carte.")
+    creator_id: Optional[int] = Field(None, description="L'utilisateur ayant créé la carte.")
+    title: str = Field(..., description="Le titre de la carte.")
+    description: Optional[str] = Field(None, description="La description de la carte.")
+    version: Optional[int] = Field(None, description="La version de la carte.")
+    is_published: Optional[bool] = Field(None, description="Indique si la carte est publiée.")
+    created_at: Optional[datetime] = Field(None, description="La date de création de la carte.")
+    updated_at: Optional[datetime] = Field(None, description="La date de dernière modification de la carte.")
+
+class ArgumentMapListModel(BaseModel):
+    """
+    Modèle pour une page de cartes argumentatives, de la plus récente à la plus ancienne.
+    """
+    items: list[ArgumentMapSummaryModel]
+    next_cursor: Optional[str] = Field(None, description="Le curseur de la page suivante (absent sur la dernière page).")
+
+class StatementStrengthModel(BaseModel):
+    """
+    Modèle pour la force propagée d'un statement.
+    """
+    statement_id: int = Field(..., description="L'identifiant du statement en base.")
+    external_id: Optional[str] = Field(None, description="L'identifiant du statement dans le XML.")
+    score: float = Field(..., description="La force propagée du statement, entre 0 et 1.")
+
+class ArgumentStrengthModel(BaseModel):
+    """
+    Modèle pour les forces propagées des statements d'une version de carte argumentative.
+    """
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    version: int = Field(..., description="La version de la carte utilisée pour le calcul.")
+    damping: float = Field(..., description="Le facteur d'amortissement de la propagation.")
+    iterations: int = Field(..., description="Le nombre d'itérations effectuées.")
+    converged: bool = Field(..., description="Indique si la propagation a convergé.")
+    scores: list[StatementStrengthModel]
+
+class ArgumentMapChangesModel(BaseModel):
+    """
+    Modèle pour le nombre de lignes écrites par une mise à jour incrémentale.
+    """
+    statements_inserted: int = 0
+    statements_updated: int = 0
+    statements_deleted: int = 0
+    relationships_inserted: int = 0
+    relationships_updated: int = 0
+    relationships_deleted: int = 0
+    evidence_inserted: int = 0
+    evidence_updated: int = 0
+    evidence_deleted: int = 0
+
+class ArgumentMapUpdateResponseModel(BaseModel):
+    """
+    Modèle pour la réponse d'une mise à jour de carte argumentative.
+    """
+    id: str = Field(..., description="L'identifiant unique de la carte argumentative.")
+    uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    version: int = Field(..., description="La version de la carte après la mise à jour.")
+    changes: ArgumentMapChangesModel = Field(..., description="Les lignes insérées, modifiées et supprimées.")
+
+class ArgumentMapVersionModel(BaseModel):
+    """
+    Modèle pour une version enregistrée d'une carte argumentative (sans son XML).
+    """
+    version: int = Field(..., description="Le numéro de version.")
+    creator_id: Optional[int] = Field(None, description="L'utilisateur ayant créé la version.")
+    change_description: Optional[str] = Field(None, description="La description de la modification.")
+    created_at: Optional[datetime] = Field(None, description="La date de création de la version.")
+    storage: Optional[str] = Field(None, description="Le stockage de la version : 'snapshot' (XML complet compressé), 'delta' (différence compressée avec la version précédente) ou vide (XML brut).")
+    stored_bytes: Optional[int] = Field(None, description="La taille stockée de la version, en octets.")
+
+class ArgumentMapVersionListModel(BaseModel):
+    """
+    Modèle pour l'historique des versions d'une carte argumentative, de la plus récente à la plus ancienne.
+    """
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    versions: list[ArgumentMapVersionModel]
+
+class ArgumentMapVersionSourceModel(BaseModel):
+    """
+    Modèle pour le XML source d'une version d'une carte argumentative.
+    """
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    version: int = Field(..., description="Le numéro de version.")
+    xml_content: str = Field(..., description="Le contenu XML de la carte à cette version.")
+
+class CrossReferenceCandidateModel(BaseModel):
+    """
+    Modèle pour un lien suggéré entre un statement de la carte et un statement quasi identique d'une autre carte.
+    """
+    source_statement_id: int = Field(..., description="L'identifiant du statement de la carte.")
+    source_external_id: Optional[str] = Field(None, description="L'identifiant XML du statement de la carte.")
+    target_map_uuid: str = Field(..., description="L'identifiant UUID public de l'autre carte.")
+    target_statement_id: int = Field(..., description="L'identifiant du statement de l'autre carte.")
+    target_external_id: Optional[str] = Field(None, description="L'identifiant XML du statement de l'autre carte.")
+    similarity: float = Field(..., description="La similarité estimée des deux textes (indice de Jaccard des n-grammes de mots), entre 0 et 1.")
+
+class CrossReferenceCandidateListModel(BaseModel):
+    """
+    Modèle pour les liens suggérés entre une carte et les autres cartes de son organisation.
+    """
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte argumentative.")
+    threshold: float = Field(..., description="La similarité minimale des suggestions.")
+    candidates: list[CrossReferenceCandidateModel]
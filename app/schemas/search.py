@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class StatementSearchHitModel(BaseModel):
+    """
+    Modèle pour un statement trouvé par la recherche plein texte.
+    """
+    statement_id: int = Field(..., description="L'identifiant du statement en base.")
+    argument_map_uuid: str = Field(..., description="L'identifiant UUID public de la carte contenant le statement.")
+    external_id: Optional[str] = Field(None, description="L'identifiant du statement dans le XML.")
+    statement_type: Optional[str] = Field(None, description="Le type du statement.")
+    statement_text: str = Field(..., description="Le texte complet du statement.")
+    rank: float = Field(..., description="La pertinence du statement pour la requête (plus elle est élevée, meilleur est le résultat).")
+    snippet: str = Field(..., description="L'extrait du texte autour des mots trouvés, entourés de balises <mark>.")
+
+class StatementSearchResultModel(BaseModel):
+    """
+    Modèle pour une page de résultats de recherche, du plus pertinent au moins pertinent.
+    """
+    query: str = Field(..., description="La requête recherchée.")
+    limit: int = Field(..., description="Le nombre maximal de résultats demandés.")
+    offset: int = Field(..., description="Le nombre de résultats ignorés avant cette page.")
+    items: list[StatementSearchHitModel]
@@ -0,0 +1,89 @@
+import logging
+from dataclasses import dataclass
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.database.db import get_async_session_factory, async_session_scope
+from app.repositories.argument_map_repository import AsyncArgumentMapRepository
+from app.services.llm_service import get_llm_service, LLMService
+from app.services.similarity_service import get_statement_similarity_index
+from app.services.xml_executor_service import get_xml_executor_service, XMLExecutorService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class XMLDocumentValidationError(Exception):
+    """Raised when a generated or imported document fails XSD/Schematron validation."""
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+@dataclass
+class ArgumentMapPipelineResult:
+    id: str
+    uuid: str
+    xml_content: str
+    parsed_data: dict | None = None
+
+class ArgumentMapPipelineService:
+    def __init__(self, llm_service: LLMService, xml_executor_service: XMLExecutorService, session_factory: async_sessionmaker[AsyncSession]):
+        """
+        Text -> XML -> validated parsed_data -> database pipeline. Each call persists in its own
+        transaction, so it can run outside a request scope (streaming, batches, background jobs).
+        """
+        self.llm_service = llm_service
+        self.xml_executor_service = xml_executor_service
+        self.session_factory = session_factory
+
+    async def transform_text(self, text: str) -> ArgumentMapPipelineResult:
+        """
+        Generate the XML for a text with the LLM, then validate and store it.
+
+        Raises:
+            XMLDocumentValidationError: If the generated XML is invalid.
+        """
+        xml_output = await self.llm_service.generate_xml(text)
+        result = await self.store_xml(xml_output)
+        self.llm_service.cache_xml(text, xml_output)
+        return result
+
+    async def store_xml(self, xml_content: str, organization_id: int | None = None, creator_id: int | None = None) -> ArgumentMapPipelineResult:
+        """
+        Validate and parse an XML document (off the event loop), then store the argument map.
+
+        Raises:
+            XMLDocumentValidationError: If the XML is invalid.
+        """
+        result = await self.xml_executor_service.process(xml_content)
+        if not result.is_valid:
+            raise XMLDocumentValidationError(result.errors)
+
+        parsed_data = result.parsed_data
+        parsed_data["source_xml"] = xml_content
+
+        async with async_session_scope(self.session_factory) as db:
+            repository = AsyncArgumentMapRepository(
+                db, bulk_insert=settings.DB_BULK_INSERT, similarity_index=get_statement_similarity_index()
+            )
+            created_map_object = await repository.create_argument_map(
+                parsed_data=parsed_data,
+                organization_id=organization_id,
+                creator_id=creator_id
+            )
+
+        return ArgumentMapPipelineResult(
+            id=str(created_map_object.id),
+            uuid=str(created_map_object.uuid),
+            xml_content=xml_content,
+            parsed_data=parsed_data
+        )
+
+def get_argument_map_pipeline_service(
+    llm_service: LLMService = Depends(get_llm_service),
+    xml_executor_service: XMLExecutorService = Depends(get_xml_executor_service),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory)
+) -> ArgumentMapPipelineService:
+    """
+    Provides an ArgumentMapPipelineService for FastAPI dependency injection.
+    """
+    return ArgumentMapPipelineService(llm_service, xml_executor_service, session_factory)
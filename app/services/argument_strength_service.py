@@ -0,0 +1,139 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+import numpy as np
+from scipy import sparse
+from app.core.config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+RELATIONSHIP_SIGNS = {"support": 1.0, "oppose": -1.0}
+
+@dataclass
+class StrengthResult:
+    scores: np.ndarray
+    iterations: int
+    converged: bool
+
+@dataclass
+class MapStrengths:
+    """Strength of the statements of one map version: (statement id, external id) pairs and their scores."""
+    statements: list[tuple[int, str | None]]
+    result: StrengthResult
+
+class ArgumentStrengthService:
+    def __init__(
+        self,
+        damping: float = settings.STRENGTH_DAMPING,
+        base_score: float = settings.STRENGTH_BASE_SCORE,
+        tolerance: float = settings.STRENGTH_TOLERANCE,
+        max_iterations: int = settings.STRENGTH_MAX_ITERATIONS,
+        cache_max_entries: int = settings.STRENGTH_CACHE_MAX_ENTRIES
+    ):
+        """
+        Propagated strength of every statement of a map, in [0, 1].
+
+        Scores are the fixed point of s = clip(b + d * W s, 0, 1), where b is the base score of
+        each statement and row i of W holds the weights of the relationships targeting
+        statement i: +strength for supports, -strength for oppositions (strength defaults to 1),
+        divided by the sum of their absolute values. Each statement therefore moves from its
+        base score by d times the signed, weighted mean strength of its supporters and
+        opponents. With d < 1 the iteration is a contraction, so it converges on cyclic maps too.
+
+        The strengths of the cache_max_entries most recently used (map, version, damping) are
+        kept, so that repeated requests skip the propagation.
+        """
+        if not 0 <= damping < 1:
+            raise ValueError(f"Damping must be in [0, 1), got {damping}")
+        self.damping = damping
+        self.base_score = base_score
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.cache_max_entries = cache_max_entries
+        self._cache: OrderedDict[tuple[str, int, float], MapStrengths] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_cached(self, map_uuid: str, version: int, damping: float) -> MapStrengths | None:
+        with self._lock:
+            strengths = self._cache.get((map_uuid, version, damping))
+            if strengths is not None:
+                self._cache.move_to_end((map_uuid, version, damping))
+            return strengths
+
+    def put(self, map_uuid: str, version: int, damping: float, strengths: MapStrengths) -> None:
+        with self._lock:
+            self._cache[(map_uuid, version, damping)] = strengths
+            self._cache.move_to_end((map_uuid, version, damping))
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def build_matrix(
+        self,
+        n: int,
+        sources: Sequence[int],
+        targets: Sequence[int],
+        weights: Sequence[float]
+    ) -> sparse.csr_matrix:
+        """
+        Row-normalized sparse influence matrix W (n x n): W[target, source] = weight / sum(|weights| of target).
+        Duplicate edges are summed.
+        """
+        rows = np.asarray(targets, dtype=np.int64)
+        columns = np.asarray(sources, dtype=np.int64)
+        values = np.asarray(weights, dtype=np.float64)
+        totals = np.bincount(rows, weights=np.abs(values), minlength=n)
+        if values.size:
+            nonzero = totals[rows] > 0
+            values = np.divide(values, totals[rows], out=np.zeros_like(values), where=nonzero)
+        return sparse.csr_matrix((values, (rows, columns)), shape=(n, n))
+
+    def propagate(self, matrix: sparse.csr_matrix, base_scores: np.ndarray, damping: float | None = None) -> StrengthResult:
+        """Iterate s = clip(b + d * W s, 0, 1) from s = b until the largest change is below the tolerance."""
+        damping = self.damping if damping is None else damping
+        scores = base_scores.copy()
+        for iteration in range(1, self.max_iterations + 1):
+            updated = np.clip(base_scores + damping * (matrix @ scores), 0.0, 1.0)
+            change = np.max(np.abs(updated - scores)) if scores.size else 0.0
+            scores = updated
+            if change < self.tolerance:
+                return StrengthResult(scores=scores, iterations=iteration, converged=True)
+        logger.warning(f"Strength propagation did not converge in {self.max_iterations} iterations")
+        return StrengthResult(scores=scores, iterations=self.max_iterations, converged=False)
+
+    def compute(
+        self,
+        statement_ids: Sequence[int],
+        relationships: Sequence[tuple[int, int, str, float | None]],
+        damping: float | None = None
+    ) -> StrengthResult:
+        """
+        Scores of a map's statements (same order as statement_ids), from its
+        (from_statement_id, to_statement_id, relationship_type, strength) relationships.
+        Relationships of other types, or between unknown statements, are ignored.
+        """
+        index = {statement_id: position for position, statement_id in enumerate(statement_ids)}
+        sources, targets, weights = [], [], []
+        for from_id, to_id, relationship_type, strength in relationships:
+            sign = RELATIONSHIP_SIGNS.get(relationship_type)
+            source = index.get(from_id)
+            target = index.get(to_id)
+            if sign is None or source is None or target is None:
+                continue
+            sources.append(source)
+            targets.append(target)
+            weights.append(sign * (strength if strength is not None else 1.0))
+
+        n = len(statement_ids)
+        matrix = self.build_matrix(n, sources, targets, weights)
+        return self.propagate(matrix, np.full(n, self.base_score), damping)
+
+@lru_cache()
+def get_argument_strength_service() -> ArgumentStrengthService:
+    """
+    Provides a singleton instance of ArgumentStrengthService for FastAPI dependency injection.
+    """
+    return ArgumentStrengthService()
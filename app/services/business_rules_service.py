@@ -0,0 +1,107 @@
+import logging
+from collections import Counter
+from lxml import etree
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Messages of app/xml_definitions/business_rules.sch, in pattern order
+FROM_REFERENCE_ERROR = "The 'from' attribute must reference an existing statement ID (premise, conclusion, rebuttal, or counter_conclusion)."
+TO_REFERENCE_ERROR = "The 'to' attribute must reference an existing statement ID (premise, conclusion, rebuttal, or counter_conclusion)."
+FOR_REFERENCE_ERROR = "The 'for' attribute in evidence items must reference an existing statement ID (premise, conclusion, rebuttal, or counter_conclusion)."
+GROUP_TARGET_ERROR = ("All supports with the same group_id must target the same conclusion. "
+                      "(Violation: Found a support with group_id '{group_id}' targeting '{to}' while another targets '{other_to}'.)")
+STATEMENT_ID_UNIQUE_ERROR = "The ID attribute '{id}' must be unique across all statements."
+EVIDENCE_ID_UNIQUE_ERROR = "The ID attribute '{id}' for evidence items must be unique."
+SELF_REFERENCE_ERROR = "The 'from' and 'to' attributes must not reference the same statement ID."
+
+class BusinessRulesValidator:
+    def __init__(self, namespace_uri: str = "http://example.com/argument_map"):
+        """
+        Native implementation of the business_rules.sch checks. ID indexes are built once per
+        document, so referential integrity, group_id consistency and ID uniqueness are checked
+        in O(n) instead of rescanning every statement for each reference.
+        Produces the same messages, in the same order, as the Schematron report.
+        """
+        ns = f"{{{namespace_uri}}}"
+        self._statement_tags = tuple(f"{ns}{stmt_type}" for stmt_type in ("premise", "conclusion", "rebuttal", "counter_conclusion"))
+        self._relationship_tags = (f"{ns}support", f"{ns}oppose")
+        self._support_tag = f"{ns}support"
+        self._evidence_tag = f"{ns}evidence"
+        self._item_tag = f"{ns}item"
+
+    def validate(self, xml_doc: etree._Element) -> list[str]:
+        """Return the business-rule violations of a parsed document (empty if it is valid)."""
+        statements = list(xml_doc.iter(*self._statement_tags))
+        relationships = list(xml_doc.iter(*self._relationship_tags))
+        evidence_items = [item for item in xml_doc.iter(self._item_tag) if self._is_evidence_item(item)]
+        statement_ids = {elem.get("id") for elem in statements} - {None}
+
+        errors = []
+        # Relationship references
+        for rel in relationships:
+            if rel.get("from") not in statement_ids:
+                errors.append(FROM_REFERENCE_ERROR)
+            if rel.get("to") not in statement_ids:
+                errors.append(TO_REFERENCE_ERROR)
+
+        # Evidence references
+        for item in evidence_items:
+            if item.get("for") not in statement_ids:
+                errors.append(FOR_REFERENCE_ERROR)
+
+        # Linked premises: supports sharing a group_id must share their target
+        errors.extend(self._group_target_errors(relationships))
+
+        # Statement IDs must be unique among all id attributes of the document
+        id_counts = Counter(elem.get("id") for elem in xml_doc.iter() if elem.get("id") is not None)
+        for elem in statements:
+            stmt_id = elem.get("id")
+            if stmt_id is None or id_counts[stmt_id] != 1:
+                errors.append(STATEMENT_ID_UNIQUE_ERROR.format(id=stmt_id or ""))
+
+        # Evidence IDs must be unique among evidence items
+        evidence_id_counts = Counter(item.get("id") for item in evidence_items if item.get("id") is not None)
+        for item in evidence_items:
+            item_id = item.get("id")
+            if item_id is None or evidence_id_counts[item_id] != 1:
+                errors.append(EVIDENCE_ID_UNIQUE_ERROR.format(id=item_id or ""))
+
+        # No self-referencing relationships
+        for rel in relationships:
+            from_id, to_id = rel.get("from"), rel.get("to")
+            if from_id is None or to_id is None or from_id == to_id:
+                errors.append(SELF_REFERENCE_ERROR)
+
+        return errors
+
+    def _is_evidence_item(self, item: etree._Element) -> bool:
+        parent = item.getparent()
+        return parent is not None and parent.tag == self._evidence_tag
+
+    def _group_target_errors(self, relationships: list[etree._Element]) -> list[str]:
+        """
+        Sibling supports with the same group_id must have the same 'to'. The reported
+        other target is the first sibling (in document order) with a different 'to', which
+        is always one of the first two distinct targets of the group.
+        """
+        grouped = [rel for rel in relationships if rel.tag == self._support_tag and rel.get("group_id") is not None]
+        first_targets: dict[tuple, list[str]] = {}
+        for rel in grouped:
+            to_id = rel.get("to")
+            if to_id is None:
+                continue
+            targets = first_targets.setdefault((rel.getparent(), rel.get("group_id")), [])
+            if len(targets) < 2 and to_id not in targets:
+                targets.append(to_id)
+
+        errors = []
+        for rel in grouped:
+            to_id = rel.get("to")
+            if to_id is None:
+                continue
+            targets = first_targets[(rel.getparent(), rel.get("group_id"))]
+            other_to = next((target for target in targets if target != to_id), None)
+            if other_to is not None:
+                errors.append(GROUP_TARGET_ERROR.format(group_id=rel.get("group_id"), to=to_id, other_to=other_to))
+        return errors
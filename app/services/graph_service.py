@@ -0,0 +1,242 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Sequence
+
+# Graph algorithms over argument map hierarchies. Nodes are integer indexes 0..n-1 and edges
+# are stored in CSR form (offsets + flat target array), so every pass is O(V + E) over lists
+# of ints instead of dictionaries keyed by external ID strings.
+
+@dataclass
+class Hierarchy:
+    """Depths and primary parents of a directed graph (edges go from parent to child)."""
+    depths: list[int]
+    # Primary parent of each node (-1 for roots): the deepest parent, so depth = parent depth + 1
+    parents: list[int]
+    # Every node appears after its primary parent
+    order: list[int]
+    # Strongly connected components with more than one node, or a single node with a self-loop
+    cycles: list[list[int]] = field(default_factory=list)
+
+def to_csr(n: int, sources: Sequence[int], targets: Sequence[int]) -> tuple[list[int], list[int]]:
+    """
+    Adjacency of n nodes in CSR form: the successors of v are adjacency[offsets[v]:offsets[v + 1]],
+    in edge order (counting sort, O(V + E)).
+    """
+    offsets = [0] * (n + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for index in range(n):
+        offsets[index + 1] += offsets[index]
+    positions = offsets[:-1]
+    adjacency = [0] * len(sources)
+    for source, target in zip(sources, targets):
+        adjacency[positions[source]] = target
+        positions[source] += 1
+    return offsets, adjacency
+
+def strongly_connected_components(
+    n: int,
+    offsets: list[int],
+    adjacency: list[int],
+    start_nodes: Sequence[int] | None = None
+) -> list[list[int]]:
+    """
+    Tarjan's algorithm with an explicit stack (no recursion limit on deep maps).
+
+    Args:
+        start_nodes: Restrict the search to the nodes reachable from these (default: all nodes).
+
+    Returns:
+        list[list[int]]: Components in reverse topological order: a component is listed after
+            every component reachable from it.
+    """
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+    for start in (start_nodes if start_nodes is not None else range(n)):
+        if index[start] != -1:
+            continue
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+        # Call stack of (node, next edge position)
+        work = [(start, offsets[start])]
+        while work:
+            node, position = work[-1]
+            end = offsets[node + 1]
+            while position < end:
+                successor = adjacency[position]
+                position += 1
+                if index[successor] == -1:
+                    work[-1] = (node, position)
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, offsets[successor]))
+                    break
+                if on_stack[successor] and index[successor] < low[node]:
+                    low[node] = index[successor]
+            else:
+                work.pop()
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    caller = work[-1][0]
+                    if low[node] < low[caller]:
+                        low[caller] = low[node]
+    return components
+
+def build_hierarchy(n: int, sources: Sequence[int], targets: Sequence[int], sort_keys: Sequence | None = None) -> Hierarchy:
+    """
+    Depth of every node as the longest path from a root (a node without parents), in
+    topological order.
+
+    A node's primary parent is its deepest parent; ties go to the parent with the smallest
+    sort key (its index by default). The acyclic part of the graph is ordered with Kahn's
+    algorithm; the remaining nodes (cycles and everything below them) are split into strongly
+    connected components. Inside a cycle, members entered from outside take their depth from
+    their deepest outside parent (a cycle without outside parent is entered at its smallest
+    member, as a root) and the other members are reached breadth-first along the cycle's edges.
+
+    Args:
+        n: Number of nodes.
+        sources, targets: Edges, from parent to child.
+        sort_keys: Optional per-node keys used to break ties deterministically.
+    """
+    keys = sort_keys if sort_keys is not None else range(n)
+    offsets, children = to_csr(n, sources, targets)
+    depths = [0] * n
+    parents = [-1] * n
+
+    def relax(node: int, skip_component: list[int] | None = None, component_index: int = -1) -> None:
+        """Offer `node` as parent to its children (skipping those of its own component)."""
+        depth = depths[node] + 1
+        key = keys[node]
+        for position in range(offsets[node], offsets[node + 1]):
+            child = children[position]
+            if skip_component is not None and skip_component[child] == component_index:
+                continue
+            if depth > depths[child] or (depth == depths[child] and key < keys[parents[child]]):
+                depths[child] = depth
+                parents[child] = node
+
+    # Kahn's algorithm: a node is final once all its parents are
+    in_degree = [0] * n
+    for target in targets:
+        in_degree[target] += 1
+    order = [node for node in range(n) if in_degree[node] == 0]
+    for node in order:  # The list grows while it is traversed
+        # Same relaxation as relax(), inlined on the hot path
+        depth = depths[node] + 1
+        key = keys[node]
+        for position in range(offsets[node], offsets[node + 1]):
+            child = children[position]
+            if depth > depths[child] or (depth == depths[child] and key < keys[parents[child]]):
+                depths[child] = depth
+                parents[child] = node
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                order.append(child)
+    if len(order) == n:
+        return Hierarchy(depths=depths, parents=parents, order=order)
+
+    # Nodes left with parents are in a cycle or below one; only they are searched for components
+    residual = [node for node in range(n) if in_degree[node] > 0]
+    components = strongly_connected_components(n, offsets, children, residual)
+    component_of = [-1] * n
+    for component_index, component in enumerate(components):
+        for node in component:
+            component_of[node] = component_index
+
+    cycles: list[list[int]] = []
+    for component_index in range(len(components) - 1, -1, -1):
+        component = components[component_index]
+        if len(component) == 1:
+            node = component[0]
+            if any(children[position] == node for position in range(offsets[node], offsets[node + 1])):
+                cycles.append(component)
+            order.append(node)
+            relax(node, component_of, component_index)
+            continue
+
+        cycles.append(sorted(component, key=keys.__getitem__))
+        # Depth and parent of members with an outside parent are already set by relaxation
+        entries = [node for node in component if parents[node] != -1]
+        if not entries:
+            entries = [min(component, key=keys.__getitem__)]
+        entries.sort(key=lambda node: (depths[node], keys[node]))
+        reached = set(entries)
+        queue = deque(entries)
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for position in range(offsets[node], offsets[node + 1]):
+                child = children[position]
+                if child not in reached and component_of[child] == component_index:
+                    reached.add(child)
+                    parents[child] = node
+                    depths[child] = depths[node] + 1
+                    queue.append(child)
+        for node in component:
+            relax(node, component_of, component_index)
+    return Hierarchy(depths=depths, parents=parents, order=order, cycles=cycles)
+
+def primary_paths(hierarchy: Hierarchy, labels: Sequence[str]) -> list[str]:
+    """Dot-separated label path of every node along its chain of primary parents (ltree syntax)."""
+    paths = [""] * len(labels)
+    parents = hierarchy.parents
+    for node in hierarchy.order:
+        parent = parents[node]
+        paths[node] = f"{paths[parent]}.{labels[node]}" if parent != -1 else labels[node]
+    return paths
+
+def ancestor_paths(
+    hierarchy: Hierarchy,
+    labels: Sequence[str],
+    sources: Sequence[int],
+    targets: Sequence[int],
+    max_paths: int = 16
+) -> list[list[str]]:
+    """
+    Root-to-node paths of every node through each of its parents, the primary path first.
+
+    The number of paths can grow exponentially with stacked multi-parent nodes, so at most
+    max_paths are kept per node (linear time for a fixed cap). Edges closing a cycle are not
+    followed.
+    """
+    n = len(labels)
+    parent_offsets, parents_of = to_csr(n, targets, sources)
+    rank = [0] * n
+    for position, node in enumerate(hierarchy.order):
+        rank[node] = position
+    primary = primary_paths(hierarchy, labels)
+    paths: list[list[str]] = [[] for _ in range(n)]
+    for node in hierarchy.order:
+        label = labels[node]
+        node_paths = [primary[node]]
+        seen = {primary[node]}
+        for position in range(parent_offsets[node], parent_offsets[node + 1]):
+            parent = parents_of[position]
+            if rank[parent] >= rank[node]:
+                continue
+            for parent_path in paths[parent]:
+                if len(node_paths) >= max_paths:
+                    break
+                path = f"{parent_path}.{label}"
+                if path not in seen:
+                    seen.add(path)
+                    node_paths.append(path)
+        paths[node] = node_paths
+    return paths
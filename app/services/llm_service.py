@@ -1,13 +1,110 @@
+import hashlib
 import logging
 import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 from functools import lru_cache
+from typing import AsyncIterator, Callable
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from app.core.config import settings
+from app.core.metrics import track_stage, CACHE_REQUESTS
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Bump whenever the prompt template changes so cached results of the old prompt are not reused
+PROMPT_TEMPLATE_VERSION = "1"
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a text before hashing: Unicode NFC, collapsed whitespace, stripped ends.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def make_cache_key(text: str, model_name: str, prompt_version: str = PROMPT_TEMPLATE_VERSION) -> str:
+    """
+    Content-addressed cache key: SHA-256 of (normalized text, model name, prompt template version).
+    """
+    payload = "\x1f".join((prompt_version, model_name, normalize_text(text)))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMResultCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, sqlite_path: str | None = None, clock: Callable[[], float] = time.time):
+        """
+        Two-tier cache for generated XML.
+
+        Args:
+            max_entries: Capacity of the in-memory LRU tier.
+            ttl_seconds: Lifetime of an entry in both tiers.
+            sqlite_path: Optional SQLite file for a persistent tier shared across restarts.
+            clock: Time source (seconds since epoch), injectable for tests.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self._db: sqlite3.Connection | None = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)")
+            self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for key, or None on a miss or an expired entry."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] + self.ttl_seconds > now:
+                    self._store_in_memory(key, row[0], row[1] + self.ttl_seconds)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store value in the in-memory tier and, if configured, in the persistent tier."""
+        now = self.clock()
+        with self._lock:
+            self._store_in_memory(key, value, now + self.ttl_seconds)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)", (key, value, now))
+                self._db.commit()
+
+    def _store_in_memory(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current in-memory size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent_hits": self.persistent_hits,
+            "entries": len(self._entries)
+        }
+
 class LLMService:
     def __init__(self):
         """
@@ -61,6 +158,12 @@ XML Output:
             )
             # Create LCEL chain: prompt | llm
             self.chain = self.prompt | self.llm
+            # Cache of generated XML, so identical texts skip the LLM entirely
+            self.cache = LLMResultCache(
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                sqlite_path=settings.LLM_CACHE_SQLITE_PATH
+            ) if settings.LLM_CACHE_ENABLED else None
             logger.info("LLMService initialized successfully with LCEL.")
         except Exception as e:
             logger.error(f"Error initializing LLMService: {str(e)}")
@@ -80,8 +183,18 @@ XML Output:
             Exception: If an error occurs during generation.
         """
         try:
+            cache_key = make_cache_key(text, settings.OPENAI_MODEL_NAME)
+            if self.cache is not None:
+                cached_xml = self.cache.get(cache_key)
+                if cached_xml is not None:
+                    CACHE_REQUESTS.labels("llm", "hit").inc()
+                    logger.debug("XML served from the LLM result cache.")
+                    return cached_xml
+                CACHE_REQUESTS.labels("llm", "miss").inc()
+
             # Asynchronous execution with LCEL chain
-            result = await self.chain.ainvoke({"text": text})
+            with track_stage("llm_generate"):
+                result = await self.chain.ainvoke({"text": text})
             # Extract content from AIMessage object
             raw_content = result.content
 
@@ -99,6 +212,46 @@ XML Output:
             logger.error(f"Error generating XML: {str(e)}")
             raise
 
+    async def astream_xml(self, text: str) -> AsyncIterator[str]:
+        """
+        Stream the raw LLM output chunk by chunk as it is generated.
+        A cache hit yields the cached XML as a single chunk.
+
+        Args:
+            text (str): The text to transform into XML.
+
+        Yields:
+            str: Successive pieces of the LLM output.
+        """
+        try:
+            cache_key = make_cache_key(text, settings.OPENAI_MODEL_NAME)
+            if self.cache is not None:
+                cached_xml = self.cache.get(cache_key)
+                if cached_xml is not None:
+                    CACHE_REQUESTS.labels("llm", "hit").inc()
+                    logger.debug("XML served from the LLM result cache.")
+                    yield cached_xml
+                    return
+                CACHE_REQUESTS.labels("llm", "miss").inc()
+
+            # Includes the time spent by the consumer on each chunk
+            with track_stage("llm_stream"):
+                async for chunk in self.chain.astream({"text": text}):
+                    if chunk.content:
+                        yield chunk.content
+        except Exception as e:
+            logger.error(f"Error streaming XML: {str(e)}")
+            raise
+
+    def cache_xml(self, text: str, xml_content: str) -> None:
+        """
+        Cache the XML generated for a text. generate_xml and astream_xml do not cache their
+        output: callers call this once the XML has passed validation and parsing, so that an
+        invalid generation is not replayed for the same text.
+        """
+        if self.cache is not None:
+            self.cache.set(make_cache_key(text, settings.OPENAI_MODEL_NAME), xml_content)
+
 # Dependency function with Singleton pattern via lru_cache
 @lru_cache()
 def get_llm_service() -> LLMService:
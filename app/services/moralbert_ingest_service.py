@@ -0,0 +1,271 @@
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import math
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterable, Iterator
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.metrics import track_stage
+from app.database.db import get_async_session_factory, async_session_scope
+from app.repositories.moralbert_repository import AsyncMoralBERTRepository, MORALBERT_SCORE_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow is optional: CSV and JSONL imports only
+    pyarrow = None
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+INGEST_FORMATS = ("csv", "jsonl", "arrow")
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.arrow.file": "arrow",
+}
+FILE_EXTENSION_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".arrow": "arrow", ".arrows": "arrow", ".feather": "arrow"}
+
+def detect_format(content_type: str | None = None, filename: str | None = None) -> str | None:
+    """Input format from a media type (parameters ignored) or a file extension."""
+    if content_type:
+        data_format = CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+        if data_format:
+            return data_format
+    if filename:
+        for extension, data_format in FILE_EXTENSION_FORMATS.items():
+            if filename.lower().endswith(extension):
+                return data_format
+    return None
+
+def arrow_available() -> bool:
+    return pyarrow is not None
+
+@dataclass
+class IngestReport:
+    rows_read: int = 0
+    rows_upserted: int = 0
+    rows_failed: int = 0
+    # Earlier rows of a statement repeated within a chunk, superseded by its last row
+    rows_duplicate: int = 0
+    chunks_committed: int = 0
+    chunks_failed: int = 0
+    # First errors only, as {"line": line or row number, "error": message}
+    errors: list[dict] = field(default_factory=list)
+
+class LineRecordDecoder:
+    def __init__(self, data_format: str):
+        """
+        Decode the lines of a CSV (header line first) or JSONL document into records, one line
+        at a time, so that a document is never held in memory whole. CSV values must not contain
+        line breaks.
+        """
+        if data_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported line format: {data_format}")
+        self.data_format = data_format
+        self.header: list[str] | None = None
+
+    def decode(self, line: str) -> dict | None:
+        """Record of a line, or None for blank lines and the CSV header. Raises ValueError on malformed lines."""
+        if not line.strip():
+            return None
+        if self.data_format == "jsonl":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON: {e.msg}")
+            if not isinstance(record, dict):
+                raise ValueError("Each line must be a JSON object")
+            return record
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} columns, got {len(values)}")
+        return dict(zip(self.header, values))
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """UTF-8 lines (without line terminators) of a byte stream, decoded incrementally."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+async def iterate(items: Iterable) -> AsyncIterator:
+    """Async view of a synchronous iterable (e.g. the lines of a local file)."""
+    for item in items:
+        yield item
+
+async def iterate_in_thread(items: Iterable, batch_size: int = 1000) -> AsyncIterator:
+    """
+    Async view of a synchronous iterable whose iteration blocks (file reads, Arrow decoding):
+    items are pulled batch_size at a time in a worker thread, off the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter(items)
+    while batch := await loop.run_in_executor(None, lambda: list(islice(iterator, batch_size))):
+        for item in batch:
+            yield item
+
+async def decode_lines(lines: AsyncIterable[str], data_format: str) -> AsyncIterator[tuple[int, dict | ValueError]]:
+    """(line number, record) pairs of CSV or JSONL lines; malformed lines give the ValueError instead of a record."""
+    decoder = LineRecordDecoder(data_format)
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        try:
+            record = decoder.decode(line)
+        except ValueError as e:
+            yield line_number, e
+            continue
+        if record is not None:
+            yield line_number, record
+
+def read_arrow_records(source: BinaryIO) -> Iterator[tuple[int, dict]]:
+    """(row number, record) pairs of an Arrow IPC stream or file, one record batch at a time."""
+    if pyarrow is None:
+        raise RuntimeError("Arrow input requires pyarrow")
+    try:
+        batches = iter(pyarrow.ipc.open_stream(source))
+    except pyarrow.ArrowInvalid:
+        source.seek(0)
+        reader = pyarrow.ipc.open_file(source)
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    row_number = 0
+    for batch in batches:
+        for record in batch.to_pylist():
+            row_number += 1
+            yield row_number, record
+
+def parse_score_record(record: dict) -> tuple[uuid.UUID, dict]:
+    """
+    Statement UUID and scores of a record ("statement_uuid" and the five *_score columns).
+    Empty scores are stored as NULL; others must be numbers in [-1, 1].
+    """
+    try:
+        statement_uuid = uuid.UUID(str(record.get("statement_uuid") or "").strip())
+    except ValueError:
+        raise ValueError(f"Invalid statement_uuid: {record.get('statement_uuid')!r}")
+    scores = {}
+    for column in MORALBERT_SCORE_COLUMNS:
+        value = record.get(column)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            scores[column] = None
+            continue
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {column}: {value!r}")
+        if not math.isfinite(score) or not -1.0 <= score <= 1.0:
+            raise ValueError(f"{column} must be between -1 and 1, got {value!r}")
+        scores[column] = score
+    return statement_uuid, scores
+
+class MoralBERTIngestService:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], chunk_size: int, max_errors: int):
+        """
+        Bulk import of MoralBERT scores keyed by statement UUID.
+
+        Records are consumed one at a time and loaded chunk_size at a time: the statement
+        UUIDs of a chunk are resolved with one query and its scores written with one multi-row
+        upsert, in a transaction of its own. Invalid records and unknown statements are
+        reported and skipped; a chunk whose transaction fails is reported and the import goes
+        on with the next one, all its rows counted as failed. When a statement appears several
+        times in a chunk, its last row is kept and the others are counted as duplicates, so
+        that rows_read = rows_upserted + rows_failed + rows_duplicate.
+        """
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def ingest(self, records: AsyncIterable[tuple[int, dict | ValueError]]) -> AsyncIterator[IngestReport]:
+        """
+        Load (line number, record) pairs (a ValueError in place of a record that could not be
+        decoded), yielding the running report after each chunk.
+        """
+        report = IngestReport()
+        chunk: list[tuple[int, dict | ValueError]] = []
+        async for item in records:
+            report.rows_read += 1
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                await self._load_chunk(chunk, report)
+                chunk = []
+                yield report
+        if chunk or not report.rows_read:
+            await self._load_chunk(chunk, report)
+            yield report
+        logger.info(
+            f"MoralBERT import: {report.rows_upserted}/{report.rows_read} rows upserted, "
+            f"{report.rows_failed} failed, {report.chunks_failed} chunks failed"
+        )
+
+    def _fail(self, report: IngestReport, line: int, error: str, rows: int = 1) -> None:
+        report.rows_failed += rows
+        if len(report.errors) < self.max_errors:
+            report.errors.append({"line": line, "error": error})
+
+    async def _load_chunk(self, chunk: list[tuple[int, dict | ValueError]], report: IngestReport) -> None:
+        # Last occurrence of a statement in the chunk wins (an upsert cannot touch a row twice)
+        parsed: dict[uuid.UUID, tuple[int, dict]] = {}
+        for line, record in chunk:
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                statement_uuid, scores = parse_score_record(record)
+            except ValueError as e:
+                self._fail(report, line, str(e))
+                continue
+            if statement_uuid in parsed:
+                report.rows_duplicate += 1
+            parsed[statement_uuid] = (line, scores)
+        if not parsed:
+            return
+
+        rows = []
+        unknown = []
+        try:
+            async with async_session_scope(self.session_factory) as session:
+                repository = AsyncMoralBERTRepository(session)
+                with track_stage("db_store"):
+                    statement_ids = await repository.resolve_statement_ids(parsed)
+                    for statement_uuid, (line, scores) in parsed.items():
+                        statement_id = statement_ids.get(statement_uuid)
+                        if statement_id is None:
+                            unknown.append((line, statement_uuid))
+                            continue
+                        rows.append({"statement_id": statement_id, **scores})
+                    await repository.upsert_scores(rows)
+        except Exception as e:
+            logger.error(f"MoralBERT import chunk failed: {str(e)}")
+            report.chunks_failed += 1
+            lines = [line for line, _ in parsed.values()]
+            self._fail(report, min(lines), f"Chunk of lines {min(lines)}-{max(lines)} not imported: {str(e)}", rows=len(parsed))
+            return
+        for line, statement_uuid in unknown:
+            self._fail(report, line, f"Unknown statement {statement_uuid}")
+        report.rows_upserted += len(rows)
+        report.chunks_committed += 1
+
+def get_moralbert_ingest_service(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory)
+) -> MoralBERTIngestService:
+    """
+    Provides a MoralBERTIngestService for FastAPI dependency injection.
+    """
+    return MoralBERTIngestService(session_factory, settings.MORALBERT_INGEST_CHUNK_SIZE, settings.MORALBERT_INGEST_MAX_ERRORS)
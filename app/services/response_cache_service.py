@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Protocol
+from app.core.config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class CacheBackend(Protocol):
+    """Shared key/value store (e.g. Redis) used as second tier by ResponseCache."""
+    def get(self, key: str) -> bytes | None: ...
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+    def delete(self, key: str) -> None: ...
+
+class InMemoryCacheBackend:
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Process-local stand-in for a shared cache backend (tests, single-process deployments).
+        """
+        self.clock = clock
+        self._values: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._values[key] = (self.clock() + ttl_seconds, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+def make_etag(map_uuid: uuid.UUID | str, version: int) -> str:
+    """Entity tag of an argument map representation: changes whenever the map version changes."""
+    return f'"{map_uuid}-v{version}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an If-None-Match header (list of tags, weak tags or "*") against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, backend: CacheBackend | None = None, clock: Callable[[], float] = time.time):
+        """
+        Cache of serialized argument map responses, keyed by (map uuid, version, variant).
+
+        A version pointer (map uuid -> current version) kept in the shared backend lets
+        conditional requests be answered and cached bodies be found without reading the
+        database. It is never copied into the in-process tier: a write made through another
+        process must be seen at once. Without a backend, callers read the version from the
+        database (a cheap query). Entries of older versions are never served: they are simply
+        no longer reachable once the version moves, and age out of the LRU tier. Writers must
+        call set_version (or invalidate) when a map changes; the TTL bounds staleness for
+        changes made outside the application.
+
+        Args:
+            max_entries: Capacity of the in-process LRU tier.
+            ttl_seconds: Lifetime of an entry in both tiers.
+            backend: Optional shared tier (e.g. Redis), consulted on local misses.
+            clock: Time source (seconds since epoch), injectable for tests.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+
+    def get_version(self, map_uuid: uuid.UUID | str) -> int | None:
+        """Current version of a map from the shared backend (None without a backend or when unknown)."""
+        if self.backend is None:
+            return None
+        value = self.backend.get(self._version_key(map_uuid))
+        return int(value) if value is not None else None
+
+    def set_version(self, map_uuid: uuid.UUID | str, version: int) -> None:
+        if self.backend is not None:
+            self.backend.set(self._version_key(map_uuid), str(version).encode("ascii"), self.ttl_seconds)
+
+    def invalidate(self, map_uuid: uuid.UUID | str) -> None:
+        """Forget the current version of a map, so the next read goes to the database."""
+        if self.backend is not None:
+            self.backend.delete(self._version_key(map_uuid))
+
+    def get(self, map_uuid: uuid.UUID | str, version: int, variant: str) -> bytes | None:
+        """Serialized response body for a map version and representation variant."""
+        body = self._get(self._body_key(map_uuid, version, variant))
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def set(self, map_uuid: uuid.UUID | str, version: int, variant: str, body: bytes) -> None:
+        self._set(self._body_key(map_uuid, version, variant), body)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current in-process size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "backend_hits": self.backend_hits,
+            "entries": len(self._entries)
+        }
+
+    @staticmethod
+    def _version_key(map_uuid: uuid.UUID | str) -> str:
+        return f"argument_map:{map_uuid}:version"
+
+    @staticmethod
+    def _body_key(map_uuid: uuid.UUID | str, version: int, variant: str) -> str:
+        return f"argument_map:{map_uuid}:v{version}:{variant}"
+
+    def _get(self, key: str) -> bytes | None:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.backend_hits += 1
+                self._store_in_memory(key, value, now + self.ttl_seconds)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._store_in_memory(key, value, self.clock() + self.ttl_seconds)
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl_seconds)
+
+    def _store_in_memory(self, key: str, value: bytes, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+@lru_cache()
+def get_response_cache() -> ResponseCache | None:
+    """
+    Provides a singleton ResponseCache for FastAPI dependency injection (None when disabled).
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    backend = InMemoryCacheBackend() if settings.RESPONSE_CACHE_BACKEND == "memory" else None
+    logger.info(f"Response cache enabled (max_entries={settings.RESPONSE_CACHE_MAX_ENTRIES}, backend={settings.RESPONSE_CACHE_BACKEND})")
+    return ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS, backend)
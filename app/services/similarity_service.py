@@ -0,0 +1,220 @@
+import logging
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Sequence
+import numpy as np
+from app.core.config import settings
+from app.services.statement_search_service import tokenize
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Universal hashing modulo the Mersenne prime 2^31 - 1: products stay below 2^62 in int64
+_PRIME = (1 << 31) - 1
+
+@dataclass
+class CrossReferenceCandidate:
+    source_statement_id: int
+    source_external_id: str | None
+    target_map_uuid: str
+    target_statement_id: int
+    target_external_id: str | None
+    similarity: float
+
+@dataclass
+class _IndexedMap:
+    version: int
+    organization_id: int | None
+    # (statement id, external id, MinHash signature) of every indexed statement
+    statements: list[tuple[int, str | None, np.ndarray]]
+
+def shingles(text: str, size: int) -> set[int]:
+    """Hashes of the word n-grams of a text (the whole text when it has fewer than `size` words)."""
+    words = tokenize(text)
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[index:index + size]).encode("utf-8")) for index in range(len(words) - size + 1)}
+
+class StatementSimilarityIndex:
+    def __init__(self, num_perm: int, bands: int, shingle_size: int, seed: int = 1):
+        """
+        Near-duplicate detection across argument maps with MinHash signatures and LSH banding.
+
+        Each statement text is reduced to a signature of num_perm minimum hashes of its word
+        shingles: the fraction of equal positions between two signatures estimates the Jaccard
+        similarity of their shingle sets. Signatures are split into `bands` bands; statements
+        sharing one band are candidates. With r = num_perm / bands rows per band, pairs of
+        similarity s become candidates with probability 1 - (1 - s^r)^bands, an S-curve
+        centered near (1 / bands)^(1 / r). Looking up a map costs one bucket read per band and
+        statement instead of a comparison with every statement of every other map.
+
+        Maps are indexed whole and tagged with their version, so an updated map is re-indexed
+        by the next sync. Syncs are incremental, per organization: the index records when each
+        organization was last synced. Maps known to the application (just committed) can be
+        queued without computing their signatures, and indexed later in a worker thread.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+        self._b = generator.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+        # Odd multipliers combining the rows of a band into one 64-bit bucket key (wrapping arithmetic)
+        self._band_mix = generator.integers(0, 1 << 62, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._maps: dict[str, _IndexedMap] = {}
+        # (band, band hash) -> {(map uuid, position of the statement in the map)}
+        self._buckets: dict[tuple[int, int], set[tuple[str, int]]] = {}
+        # Organization id -> start time of its last sync
+        self._synced_at: dict[int | None, datetime] = {}
+        # (map uuid, version, organization id, statements) waiting for index_queued
+        self._queued: list[tuple[str, int, int | None, Sequence[tuple[int, str | None, str]]]] = []
+        self._lock = threading.Lock()
+
+    def signatures(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        MinHash signatures of texts (one row each), computed for all texts at once, and the
+        mask of texts that have words (the others get no meaningful signature).
+        """
+        shingle_sets = [shingles(text, self.shingle_size) for text in texts]
+        has_words = np.array([bool(hashes) for hashes in shingle_sets], dtype=bool)
+        counts = [len(hashes) for hashes in shingle_sets if hashes]
+        if not counts:
+            return np.zeros((len(texts), self.num_perm), dtype=np.int64), has_words
+        values = np.fromiter((value for hashes in shingle_sets for value in hashes), dtype=np.int64, count=sum(counts)) % _PRIME
+        permuted = (values[:, None] * self._a + self._b) % _PRIME
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        signatures = np.zeros((len(texts), self.num_perm), dtype=np.int64)
+        signatures[has_words] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return signatures, has_words
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """MinHash signature of a text, or None when it has no words."""
+        signatures, has_words = self.signatures([text])
+        return signatures[0] if has_words[0] else None
+
+    def _band_hashes(self, signatures: np.ndarray) -> np.ndarray:
+        """Bucket key of every band of every signature: (n, bands) unsigned 64-bit values."""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        return list(enumerate(self._band_hashes(signature[None, :])[0].tolist()))
+
+    def versions(self) -> dict[str, int]:
+        """Indexed version of every map."""
+        with self._lock:
+            return {map_uuid: indexed.version for map_uuid, indexed in self._maps.items()}
+
+    def synced_at(self, organization_id: int | None) -> datetime | None:
+        with self._lock:
+            return self._synced_at.get(organization_id)
+
+    def mark_synced(self, organization_id: int | None, synced_at: datetime) -> None:
+        with self._lock:
+            self._synced_at[organization_id] = synced_at
+
+    def add_map(
+        self,
+        map_uuid: str,
+        version: int,
+        organization_id: int | None,
+        statements: Sequence[tuple[int, str | None, str]]
+    ) -> None:
+        """Index the (statement id, external id, text) statements of a map version, replacing any previous version."""
+        signatures, has_words = self.signatures([text for _, _, text in statements])
+        indexed = [
+            (statement_id, external_id, signature)
+            for (statement_id, external_id, _), signature, keep in zip(statements, signatures, has_words)
+            if keep
+        ]
+        band_keys = [list(enumerate(row)) for row in self._band_hashes(signatures[has_words]).tolist()]
+        with self._lock:
+            self._remove(map_uuid)
+            self._maps[map_uuid] = _IndexedMap(version, organization_id, indexed)
+            for position, keys in enumerate(band_keys):
+                for key in keys:
+                    self._buckets.setdefault(key, set()).add((map_uuid, position))
+
+    def queue_map(
+        self,
+        map_uuid: str,
+        version: int,
+        organization_id: int | None,
+        statements: Sequence[tuple[int, str | None, str]]
+    ) -> None:
+        """Record a map version to index with the next index_queued call (cheap: no signature is computed)."""
+        with self._lock:
+            self._queued.append((map_uuid, version, organization_id, statements))
+
+    def index_queued(self) -> int:
+        """Index the queued map versions; returns how many were indexed. CPU-bound: run it in a worker thread."""
+        with self._lock:
+            queued, self._queued = self._queued, []
+        for map_uuid, version, organization_id, statements in queued:
+            self.add_map(map_uuid, version, organization_id, statements)
+        return len(queued)
+
+    def remove_map(self, map_uuid: str) -> None:
+        with self._lock:
+            self._remove(map_uuid)
+
+    def _remove(self, map_uuid: str) -> None:
+        indexed = self._maps.pop(map_uuid, None)
+        if indexed is None:
+            return
+        for position, (_, _, signature) in enumerate(indexed.statements):
+            for key in self._band_keys(signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard((map_uuid, position))
+                    if not bucket:
+                        del self._buckets[key]
+
+    def candidates(self, map_uuid: str, threshold: float, max_per_statement: int) -> list[CrossReferenceCandidate]:
+        """
+        Statements of other maps of the same organization whose estimated similarity with a
+        statement of the map is at least threshold: the best max_per_statement per statement,
+        most similar first.
+        """
+        with self._lock:
+            source = self._maps.get(map_uuid)
+            if source is None:
+                return []
+            results = []
+            for source_statement_id, source_external_id, signature in source.statements:
+                seen: set[tuple[str, int]] = set()
+                for key in self._band_keys(signature):
+                    seen.update(member for member in self._buckets.get(key, ()) if member[0] != map_uuid)
+                matches = []
+                for target_uuid, position in seen:
+                    target = self._maps[target_uuid]
+                    if target.organization_id != source.organization_id:
+                        continue
+                    target_statement_id, target_external_id, target_signature = target.statements[position]
+                    similarity = float(np.count_nonzero(signature == target_signature)) / self.num_perm
+                    if similarity >= threshold:
+                        matches.append(CrossReferenceCandidate(
+                            source_statement_id=source_statement_id,
+                            source_external_id=source_external_id,
+                            target_map_uuid=target_uuid,
+                            target_statement_id=target_statement_id,
+                            target_external_id=target_external_id,
+                            similarity=similarity
+                        ))
+                matches.sort(key=lambda match: (-match.similarity, match.target_statement_id))
+                results.extend(matches[:max_per_statement])
+        results.sort(key=lambda match: (-match.similarity, match.source_statement_id, match.target_statement_id))
+        return results
+
+@lru_cache()
+def get_statement_similarity_index() -> StatementSimilarityIndex:
+    """
+    Provides a singleton StatementSimilarityIndex (shared by all requests of the process).
+    """
+    return StatementSimilarityIndex(settings.SIMILARITY_NUM_PERM, settings.SIMILARITY_BANDS, settings.SIMILARITY_SHINGLE_SIZE)
@@ -0,0 +1,187 @@
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable
+from app.core.config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Text search configuration of the statements.search_vector generated column (see
+# database-schema.sql): "simple" lowercases words without stemming, since maps mix languages
+SEARCH_TEXT_CONFIG = "simple"
+# ts_rank_cd normalization 1: divide the rank by 1 + log(document length)
+SEARCH_RANK_NORMALIZATION = 1
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+_WORD = re.compile(r"\w+")
+_QUERY_TERM = re.compile(r'(-?)("[^"]*"|\S+)')
+
+@dataclass
+class StatementSearchHit:
+    statement_id: int
+    argument_map_uuid: str
+    external_id: str | None
+    statement_type: str | None
+    statement_text: str
+    rank: float
+    snippet: str
+
+@dataclass
+class SearchQuery:
+    """Words every match must contain, and words it must not contain."""
+    required: list[str] = field(default_factory=list)
+    excluded: list[str] = field(default_factory=list)
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased words, as the "simple" text search configuration produces them."""
+    return [word.lower() for word in _WORD.findall(text)]
+
+def parse_query(query: str) -> SearchQuery:
+    """
+    Subset of websearch_to_tsquery syntax for the in-memory index: words (and the words of
+    "quoted phrases") are all required, -word excludes. "or" is treated as a plain word.
+    """
+    parsed = SearchQuery()
+    for negated, term in _QUERY_TERM.findall(query):
+        words = tokenize(term)
+        (parsed.excluded if negated else parsed.required).extend(words)
+    return parsed
+
+def highlight(text: str, words: Iterable[str], max_words: int = 35) -> str:
+    """
+    Fragment of text around the first matched word, matched words wrapped in <mark> tags
+    (same markers as the ts_headline options used on PostgreSQL).
+    """
+    words = set(words)
+    matches = list(_WORD.finditer(text))
+    first = next((index for index, match in enumerate(matches) if match.group().lower() in words), 0)
+    start_index = max(0, min(first - max_words // 3, len(matches) - max_words))
+    fragment = matches[start_index:start_index + max_words]
+    if not fragment:
+        return text
+    parts = []
+    position = fragment[0].start()
+    for match in fragment:
+        parts.append(text[position:match.start()])
+        parts.append(f"{HIGHLIGHT_START}{match.group()}{HIGHLIGHT_STOP}" if match.group().lower() in words else match.group())
+        position = match.end()
+    return "".join(parts)
+
+@dataclass
+class IndexedStatement:
+    statement_id: int
+    external_id: str | None
+    statement_type: str | None
+    statement_text: str
+    length: int
+
+class InvertedIndex:
+    def __init__(self):
+        """
+        Inverted index of the statements of one map: word -> {statement id: occurrences}.
+        """
+        self.postings: dict[str, dict[int, int]] = {}
+        self.statements: dict[int, IndexedStatement] = {}
+
+    def add(self, statement_id: int, external_id: str | None, statement_type: str | None, statement_text: str) -> None:
+        words = tokenize(statement_text)
+        self.statements[statement_id] = IndexedStatement(statement_id, external_id, statement_type, statement_text, len(words))
+        for word in words:
+            postings = self.postings.setdefault(word, {})
+            postings[statement_id] = postings.get(statement_id, 0) + 1
+
+    def search(self, query: SearchQuery, statement_type: str | None = None) -> list[tuple[IndexedStatement, float]]:
+        """
+        Statements containing every required word and no excluded word, with a rank close to
+        ts_rank_cd(..., 1): occurrences of the query words divided by 1 + log(length).
+        """
+        if not query.required:
+            return []
+        # Intersect from the rarest word
+        postings = sorted((self.postings.get(word, {}) for word in set(query.required)), key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                return []
+        for word in query.excluded:
+            candidates.difference_update(self.postings.get(word, ()))
+
+        results = []
+        for statement_id in candidates:
+            statement = self.statements[statement_id]
+            if statement_type is not None and statement.statement_type != statement_type:
+                continue
+            occurrences = sum(posting[statement_id] for posting in postings)
+            results.append((statement, occurrences / (1 + math.log(max(statement.length, 1)))))
+        return results
+
+class StatementSearchIndex:
+    def __init__(self, max_maps: int):
+        """
+        In-memory full-text search over statements, used when the database has no text search
+        (SQLite). One inverted index per map, tagged with the map version it was built from:
+        a map is re-indexed when its version changes. The max_maps most recently searched
+        maps are kept.
+        """
+        self.max_maps = max_maps
+        self._indexes: OrderedDict[str, tuple[int, InvertedIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, map_uuid: str, version: int) -> InvertedIndex | None:
+        with self._lock:
+            entry = self._indexes.get(map_uuid)
+            if entry is None or entry[0] != version:
+                return None
+            self._indexes.move_to_end(map_uuid)
+            return entry[1]
+
+    def put(self, map_uuid: str, version: int, index: InvertedIndex) -> None:
+        with self._lock:
+            self._indexes[map_uuid] = (version, index)
+            self._indexes.move_to_end(map_uuid)
+            while len(self._indexes) > self.max_maps:
+                self._indexes.popitem(last=False)
+
+    def search(
+        self,
+        indexes: Iterable[tuple[str, InvertedIndex]],
+        query: str,
+        statement_type: str | None = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> list[StatementSearchHit]:
+        """Ranked hits across the (map uuid, index) pairs, best first (ties by statement id)."""
+        parsed = parse_query(query)
+        matches = [
+            (map_uuid, statement, rank)
+            for map_uuid, index in indexes
+            for statement, rank in index.search(parsed, statement_type)
+        ]
+        matches.sort(key=lambda match: (-match[2], match[1].statement_id))
+        return [
+            StatementSearchHit(
+                statement_id=statement.statement_id,
+                argument_map_uuid=map_uuid,
+                external_id=statement.external_id,
+                statement_type=statement.statement_type,
+                statement_text=statement.statement_text,
+                rank=rank,
+                snippet=highlight(statement.statement_text, parsed.required)
+            )
+            for map_uuid, statement, rank in matches[offset:offset + limit]
+        ]
+
+@lru_cache()
+def get_statement_search_index() -> StatementSearchIndex:
+    """
+    Provides a singleton StatementSearchIndex (shared by all requests of the process).
+    """
+    return StatementSearchIndex(settings.SEARCH_INDEX_MAX_MAPS)
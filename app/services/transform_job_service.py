@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.logging import RateLimitedLogger
+from app.core.metrics import TRANSFORM_JOBS
+from app.database.db import AsyncSessionLocal, async_session_scope
+from app.repositories.transform_job_repository import AsyncTransformJobRepository
+from app.services.argument_map_pipeline_service import ArgumentMapPipelineService, XMLDocumentValidationError
+from app.services.llm_service import get_llm_service
+from app.services.xml_executor_service import get_xml_executor_service
+
+# Configure logger
+logger = logging.getLogger(__name__)
+validation_failure_logger = RateLimitedLogger(logger)
+
+class TransformJobWorker:
+    def __init__(
+        self,
+        pipeline: ArgumentMapPipelineService,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        poll_interval: float,
+        lease_seconds: float,
+        max_attempts: int,
+        worker_id: str | None = None
+    ):
+        """
+        In-process pool of job runners for asynchronous text-to-map requests.
+
+        Job state lives in the transform_jobs table: runners claim jobs with a lease that is
+        renewed while the job runs, so jobs of a crashed or restarted process are picked up
+        again once their lease expires. Failed attempts, including those whose worker died,
+        are retried up to max_attempts (invalid XML is not retried).
+        """
+        self.pipeline = pipeline
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._run_loop(), name=f"transform-job-{index}") for index in range(self.concurrency)]
+        logger.info(f"Transform job worker {self.worker_id} started with {self.concurrency} runners")
+
+    def notify(self) -> None:
+        """Wake idle runners after a job has been enqueued, instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop claiming jobs and let running jobs finish for up to `timeout` seconds. Jobs still
+        running afterwards are cancelled and put back in the queue.
+        """
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"Transform job worker {self.worker_id} stopped ({len(pending)} jobs interrupted)")
+
+    async def _run_loop(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Transform job runner error: {str(e)}")
+                processed = False
+            if processed or self._stopping:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> bool:
+        """
+        Claim and run a single job.
+
+        Returns:
+            bool: False if no job was available.
+        """
+        async with async_session_scope(self.session_factory) as db:
+            repository = AsyncTransformJobRepository(db)
+            exhausted = await repository.fail_exhausted_jobs(self.max_attempts)
+            if exhausted:
+                logger.error(f"{exhausted} jobs failed: worker lost on their last attempt")
+                TRANSFORM_JOBS.labels("failed").inc(exhausted)
+            job = await repository.claim_next_job(self.worker_id, self.lease_seconds, self.max_attempts)
+            if job is None:
+                return False
+            job_id, input_text, attempts = job.id, job.input_text, job.attempts
+
+        heartbeat = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            result = await self.pipeline.transform_text(input_text)
+        except XMLDocumentValidationError as e:
+            validation_failure_logger.error("xml_validation_errors", "XML validation errors (job %d, %d errors), first: %s", job_id, len(e.errors), e.errors[0])
+            await self._finish(job_id, "fail_job", 400, "Invalid XML structure", e.errors)
+            TRANSFORM_JOBS.labels("failed").inc()
+        except asyncio.CancelledError:
+            await self._finish(job_id, "release_job", "Interrupted by worker shutdown")
+            TRANSFORM_JOBS.labels("interrupted").inc()
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error (job {job_id}, attempt {attempts}): {str(e)}")
+            if attempts < self.max_attempts:
+                await self._finish(job_id, "release_job", str(e))
+                TRANSFORM_JOBS.labels("retried").inc()
+            else:
+                await self._finish(job_id, "fail_job", 500, "Internal server error")
+                TRANSFORM_JOBS.labels("failed").inc()
+        else:
+            await self._finish(job_id, "complete_job", int(result.id))
+            TRANSFORM_JOBS.labels("succeeded").inc()
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _finish(self, job_id: int, method: str, *args) -> None:
+        async with async_session_scope(self.session_factory) as db:
+            repository = AsyncTransformJobRepository(db)
+            if not await getattr(repository, method)(job_id, self.worker_id, *args):
+                logger.warning(f"Job {job_id} is no longer held by worker {self.worker_id}; result discarded")
+
+    async def _renew_lease(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with async_session_scope(self.session_factory) as db:
+                    await AsyncTransformJobRepository(db).renew_lease(job_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Lease renewal failed for job {job_id}: {str(e)}")
+
+@lru_cache()
+def get_transform_job_worker() -> TransformJobWorker:
+    """
+    Provides a singleton instance of TransformJobWorker, started and stopped by the application lifespan.
+    """
+    pipeline = ArgumentMapPipelineService(get_llm_service(), get_xml_executor_service(), AsyncSessionLocal)
+    return TransformJobWorker(
+        pipeline,
+        AsyncSessionLocal,
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS
+    )
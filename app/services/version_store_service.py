@@ -0,0 +1,211 @@
+import json
+import logging
+import re
+import threading
+import zlib
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+from app.core.config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+# Diffs work on tag-sized tokens, so single-line documents (typical of generated XML) diff as well as pretty-printed ones
+_TOKEN_BOUNDARY = re.compile(r"(?<=>)")
+
+@dataclass
+class VersionRecord:
+    """Stored form of one map version."""
+    version: int
+    storage: str | None  # SNAPSHOT, DELTA, or None for legacy rows holding the plain source XML
+    base_version: int | None  # Snapshot version at the start of a delta chain
+    payload: bytes | None
+    source_xml: str | None = None
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_BOUNDARY.split(text)
+
+def _matching_runs(old_tokens: Sequence[str], new_tokens: Sequence[str]) -> list[tuple[int, int, int]]:
+    """
+    Runs of equal tokens, as (old start, new start, length) in order, found in O(n log n):
+    tokens occurring once in each sequence are anchors, the longest series of anchors in the
+    same order in both is kept, and each anchor is extended over the equal tokens around it.
+    """
+    old_counts = Counter(old_tokens)
+    new_counts = Counter(new_tokens)
+    old_positions = {token: index for index, token in enumerate(old_tokens) if old_counts[token] == 1}
+    pairs = [
+        (old_positions[token], index)
+        for index, token in enumerate(new_tokens)
+        if new_counts[token] == 1 and token in old_positions
+    ]
+    # Longest increasing subsequence of the old positions (pairs are in new order)
+    tails: list[int] = []
+    tail_pairs: list[int] = []
+    previous = [-1] * len(pairs)
+    for index, (old_index, _) in enumerate(pairs):
+        position = bisect_left(tails, old_index)
+        if position == len(tails):
+            tails.append(old_index)
+            tail_pairs.append(index)
+        else:
+            tails[position] = old_index
+            tail_pairs[position] = index
+        previous[index] = tail_pairs[position - 1] if position else -1
+    anchors = []
+    index = tail_pairs[-1] if tail_pairs else -1
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+
+    runs = []
+    old_end = new_end = 0
+    for old_index, new_index in anchors:
+        if old_index < old_end:
+            continue  # Inside the run of a previous anchor
+        old_start, new_start = old_index, new_index
+        while old_start > old_end and new_start > new_end and old_tokens[old_start - 1] == new_tokens[new_start - 1]:
+            old_start -= 1
+            new_start -= 1
+        old_end, new_end = old_index + 1, new_index + 1
+        while old_end < len(old_tokens) and new_end < len(new_tokens) and old_tokens[old_end] == new_tokens[new_end]:
+            old_end += 1
+            new_end += 1
+        runs.append((old_start, new_start, old_end - old_start))
+    return runs
+
+def encode_delta(previous_text: str, text: str) -> bytes:
+    """
+    zlib-compressed delta turning previous_text into text: a JSON list of [start, end] token
+    ranges copied from the previous text and literal strings, in order. Its cost is linear
+    in the document size (up to a log factor), however scattered the edits.
+    """
+    old_tokens = _tokenize(previous_text)
+    new_tokens = _tokenize(text)
+    # Trim the common prefix and suffix first: small edits leave a short middle to diff
+    prefix = 0
+    limit = min(len(old_tokens), len(new_tokens))
+    while prefix < limit and old_tokens[prefix] == new_tokens[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_tokens[-1 - suffix] == new_tokens[-1 - suffix]:
+        suffix += 1
+
+    ops: list = [[0, prefix]] if prefix else []
+    old_middle = old_tokens[prefix:len(old_tokens) - suffix]
+    new_middle = new_tokens[prefix:len(new_tokens) - suffix]
+    new_position = 0
+    for old_start, new_start, length in _matching_runs(old_middle, new_middle):
+        if new_start > new_position:
+            ops.append("".join(new_middle[new_position:new_start]))
+        ops.append([prefix + old_start, prefix + old_start + length])
+        new_position = new_start + length
+    if new_position < len(new_middle):
+        ops.append("".join(new_middle[new_position:]))
+    if suffix:
+        ops.append([len(old_tokens) - suffix, len(old_tokens)])
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"))
+
+def apply_delta(previous_text: str, delta: bytes) -> str:
+    old_tokens = _tokenize(previous_text)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        parts.append("".join(old_tokens[op[0]:op[1]]) if isinstance(op, list) else op)
+    return "".join(parts)
+
+def encode_snapshot(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"))
+
+def decode_snapshot(payload: bytes) -> str:
+    return zlib.decompress(payload).decode("utf-8")
+
+class VersionStore:
+    def __init__(self, snapshot_interval: int, max_delta_ratio: float, cache_max_entries: int):
+        """
+        Storage policy and reconstruction of argument map versions.
+
+        Each version is stored as a compressed delta against the previous one, except every
+        snapshot_interval-th version of a chain (and versions whose delta is larger than
+        max_delta_ratio times the document), stored as a compressed full snapshot. Reading a
+        version replays the deltas since its snapshot, starting from the closest version kept
+        in an LRU of recently reconstructed documents.
+        """
+        self.snapshot_interval = snapshot_interval
+        self.max_delta_ratio = max_delta_ratio
+        self.cache_max_entries = cache_max_entries
+        self._cache: OrderedDict[tuple[int, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_record(self, version: int, text: str, previous: VersionRecord | None = None, previous_text: str | None = None) -> VersionRecord:
+        """
+        Stored form of a new version, given the record and document of the version before it
+        (a snapshot is written when there is none).
+        """
+        if previous is not None and previous_text is not None:
+            chain_start = previous.base_version if previous.storage == DELTA else previous.version
+            if version - chain_start < self.snapshot_interval:
+                delta = encode_delta(previous_text, text)
+                if len(delta) <= self.max_delta_ratio * len(text):
+                    return VersionRecord(version=version, storage=DELTA, base_version=chain_start, payload=delta)
+        return VersionRecord(version=version, storage=SNAPSHOT, base_version=version, payload=encode_snapshot(text))
+
+    def chain_start(self, record: VersionRecord) -> int:
+        """First version to read to reconstruct a record."""
+        return record.base_version if record.storage == DELTA else record.version
+
+    def reconstruct(self, map_id: int, records: Sequence[VersionRecord]) -> str:
+        """
+        Document of the last record, given the records of its chain in version order (from
+        its snapshot). Every reconstructed version is kept in the LRU.
+        """
+        start = 0
+        text = None
+        with self._lock:
+            for index in range(len(records) - 1, -1, -1):
+                cached = self._cache.get((map_id, records[index].version))
+                if cached is not None:
+                    self._cache.move_to_end((map_id, records[index].version))
+                    start, text = index + 1, cached
+                    break
+
+        for record in records[start:]:
+            if record.storage == DELTA:
+                if text is None:
+                    raise ValueError(f"Delta version {record.version} of map {map_id} has no base document")
+                text = apply_delta(text, record.payload)
+            elif record.storage == SNAPSHOT:
+                text = decode_snapshot(record.payload)
+            else:
+                text = record.source_xml or ""
+            self.remember(map_id, record.version, text)
+        if text is None:
+            raise ValueError(f"No version record to reconstruct for map {map_id}")
+        return text
+
+    def get_cached(self, map_id: int, version: int) -> str | None:
+        with self._lock:
+            text = self._cache.get((map_id, version))
+            if text is not None:
+                self._cache.move_to_end((map_id, version))
+            return text
+
+    def remember(self, map_id: int, version: int, text: str) -> None:
+        with self._lock:
+            self._cache[(map_id, version)] = text
+            self._cache.move_to_end((map_id, version))
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+@lru_cache()
+def get_version_store() -> VersionStore:
+    """
+    Provides a singleton VersionStore (its LRU is shared by all requests of the process).
+    """
+    return VersionStore(settings.VERSION_SNAPSHOT_INTERVAL, settings.VERSION_MAX_DELTA_RATIO, settings.VERSION_CACHE_MAX_ENTRIES)
@@ -0,0 +1,61 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from lxml import etree
+from app.services.xml_validation_service import XMLValidationService
+from app.services.xml_parsing_service import XMLParsingService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+@dataclass
+class XMLDocumentResult:
+    """
+    Outcome of processing an XML document: validation status, errors and,
+    when the document is valid, the extracted parsed_data. timings holds the duration
+    of each stage (seconds) and failure_stage the stage that rejected the document,
+    so they can be recorded by the caller even when processing ran in another process.
+    """
+    is_valid: bool
+    errors: list[str] = field(default_factory=list)
+    parsed_data: dict | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    failure_stage: str | None = None
+
+class XMLDocumentService:
+    def __init__(self, validation_service: XMLValidationService, parsing_service: XMLParsingService):
+        """
+        Parse an XML document once and share the resulting tree between
+        XSD/Schematron validation and data extraction.
+        """
+        self.validation_service = validation_service
+        self.parsing_service = parsing_service
+
+    def process(self, xml_content: str) -> XMLDocumentResult:
+        """
+        Parse, validate and extract an argument map document.
+
+        Args:
+            xml_content (str): The XML document to process.
+
+        Returns:
+            XMLDocumentResult: parsed_data is only populated when the document is valid.
+        """
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            root_element = etree.fromstring(xml_content.encode('utf-8'))
+        except etree.XMLSyntaxError as e:
+            logger.error(f"XML parsing failed: {str(e)}")
+            return XMLDocumentResult(is_valid=False, errors=[f"XML Syntax Error: {str(e)}"], failure_stage="syntax")
+        timings["xml_parse"] = time.perf_counter() - start
+
+        is_valid, errors = self.validation_service.validate_tree(root_element, timings)
+        if not is_valid:
+            failure_stage = "xsd" if any(error.startswith("XSD Error") for error in errors) else "business_rules"
+            return XMLDocumentResult(is_valid=False, errors=errors, timings=timings, failure_stage=failure_stage)
+
+        start = time.perf_counter()
+        parsed_data = self.parsing_service.parse_tree(root_element, xml_content)
+        timings["xml_extract"] = time.perf_counter() - start
+        return XMLDocumentResult(is_valid=True, errors=[], parsed_data=parsed_data, timings=timings)
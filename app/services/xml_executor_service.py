@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from app.core.config import settings
+from app.core.metrics import track_stage, observe_stage, XML_VALIDATION_FAILURES
+from app.services.xml_document_service import XMLDocumentResult, XMLDocumentService
+from app.services.xml_parsing_service import XMLParsingService
+from app.services.xml_validation_service import XMLValidationService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Compiled schemas are kept per worker thread: lxml validators carry their own error log
+# and must not be shared between threads
+_worker_state = threading.local()
+
+def _get_worker_document_service() -> XMLDocumentService:
+    service = getattr(_worker_state, "document_service", None)
+    if service is None:
+        service = XMLDocumentService(XMLValidationService(), XMLParsingService())
+        _worker_state.document_service = service
+    return service
+
+def _init_worker() -> None:
+    """Precompile the XSD and Schematron schemas when a pool worker starts."""
+    _get_worker_document_service()
+
+def _process_xml(xml_content: str) -> XMLDocumentResult:
+    return _get_worker_document_service().process(xml_content)
+
+class XMLExecutorService:
+    def __init__(self, mode: str, max_workers: int):
+        """
+        Run XML validation and parsing off the event loop.
+
+        Args:
+            mode: "inline" runs on the calling thread, "thread" uses a thread pool (lxml releases
+                the GIL for much of its work), "process" uses a process pool.
+            max_workers: Size of the thread or process pool.
+        """
+        self.mode = mode
+        self.executor: Executor | None
+        if mode == "inline":
+            self.executor = None
+        elif mode == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="xml-worker", initializer=_init_worker)
+        elif mode == "process":
+            # spawn avoids forking a process that already runs the event loop and its threads
+            self.executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            raise ValueError(f"Unknown XML executor mode: {mode}")
+        logger.info(f"XMLExecutorService initialized in '{mode}' mode")
+
+    async def process(self, xml_content: str) -> XMLDocumentResult:
+        """
+        Parse, validate and extract an argument map document without blocking the event loop
+        (except in inline mode).
+        """
+        with track_stage("xml_process"):
+            if self.executor is None:
+                result = _process_xml(xml_content)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, _process_xml, xml_content)
+
+        # Stage timings are measured in the worker and recorded here, in the serving process
+        for stage, seconds in result.timings.items():
+            observe_stage(stage, seconds)
+        if result.failure_stage is not None:
+            XML_VALIDATION_FAILURES.labels(result.failure_stage).inc()
+        return result
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+@lru_cache()
+def get_xml_executor_service() -> XMLExecutorService:
+    """
+    Provides a singleton instance of XMLExecutorService for FastAPI dependency injection.
+    """
+    return XMLExecutorService(settings.XML_EXECUTOR_MODE, settings.XML_EXECUTOR_MAX_WORKERS)
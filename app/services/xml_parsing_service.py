@@ -3,13 +3,27 @@ from functools import lru_cache
 import uuid
 import logging
 import re
-from collections import deque
-from typing import Dict, Set, List
+from typing import Dict, List
+from app.services.graph_service import build_hierarchy, primary_paths, ancestor_paths
+
+STATEMENT_TYPES = ("premise", "conclusion", "rebuttal", "counter_conclusion")
+RELATIONSHIP_TYPES = ("support", "oppose")
+EVIDENCE_FIELDS = ("title", "source_type", "source_name", "url", "description", "credibility_rating")
 
 class XMLParsingService:
     def __init__(self):
         self.invalid_id_gen_counter = 0  # Instance variable for unique invalid IDs
         self.namespace_uri = "http://example.com/argument_map"  # URI du namespace
+        # Qualified tag names, computed once and used to dispatch elements in a single traversal
+        ns = f"{{{self.namespace_uri}}}"
+        self._title_tag = f"{ns}title"
+        self._description_tag = f"{ns}description"
+        self._statement_tags = {f"{ns}{stmt_type}": stmt_type for stmt_type in STATEMENT_TYPES}
+        self._relationship_tags = {f"{ns}{rel_type}": rel_type for rel_type in RELATIONSHIP_TYPES}
+        self._evidence_tag = f"{ns}evidence"
+        self._item_tag = f"{ns}item"
+        self._evidence_field_tags = {f"{ns}{field}": field for field in EVIDENCE_FIELDS}
+        self._extracted_tags = (*self._statement_tags, *self._relationship_tags, self._item_tag)
 
     def parse_xml(self, xml_content: str) -> dict:
         """
@@ -17,83 +31,131 @@ class XMLParsingService:
         and assign hierarchical paths and depths.
         """
         try:
-            self.invalid_id_gen_counter = 0  # Reset counter for each parse
             root_element = etree.fromstring(xml_content.encode('utf-8'))
+        except Exception as e:
+            logging.error(f"Error parsing XML: {str(e)}")
+            raise
+        return self.parse_tree(root_element, xml_content)
+
+    def parse_tree(self, root_element: etree._Element, xml_content: str) -> dict:
+        """
+        Extract the dictionary suitable for database storage from an already parsed
+        XML tree, so validation and extraction can share a single parse.
+        """
+        try:
+            self.invalid_id_gen_counter = 0  # Reset counter for each parse
             parsed_data = {
-                "title": root_element.findtext(f"{{{self.namespace_uri}}}title", ""),
-                "description": root_element.findtext(f"{{{self.namespace_uri}}}description", ""),
+                "title": root_element.findtext(self._title_tag, ""),
+                "description": root_element.findtext(self._description_tag, ""),
                 "source_xml": xml_content,
                 "statements": [],
                 "relationships": [],
                 "evidence": []
             }
 
-            # Parse statements with ID validation
-            for stmt_type in ["premise", "conclusion", "rebuttal", "counter_conclusion"]:
-                for elem in root_element.findall(f".//{{{self.namespace_uri}}}{stmt_type}"):
-                    ext_id = elem.get("id")
-                    if not ext_id:
-                        logging.error(f"Statement element {elem.tag} is missing an 'id' attribute. Skipping.")
-                        continue
-                    parsed_data["statements"].append({
-                        "external_id": ext_id,
-                        "statement_text": elem.text or "",
-                        "statement_type": stmt_type,
-                        "path": None,
-                        "depth": 0
-                    })
-
-            # Parse relationships with robust checks
-            for rel_type in ["support", "oppose"]:
-                for elem in root_element.findall(f".//{{{self.namespace_uri}}}{rel_type}"):
-                    from_id_val = elem.get("from")
-                    to_id_val = elem.get("to")
-                    if not from_id_val or not to_id_val:
-                        logging.error(f"Relationship element {elem.tag} is missing 'from' or 'to' attribute. Skipping: from='{from_id_val}', to='{to_id_val}'")
-                        continue
-                    rel_data = {
-                        "from_external_id": from_id_val,
-                        "to_external_id": to_id_val,
-                        "relationship_type": rel_type
-                    }
-                    # Parse group_id if present
-                    group_id = elem.get("group_id")
-                    if group_id:
-                        rel_data["convergence_group_id"] = str(uuid.uuid5(uuid.NAMESPACE_DNS, group_id))
-                    parsed_data["relationships"].append(rel_data)
-
-            # Parse evidence with float conversion
-            for item in root_element.findall(f".//{{{self.namespace_uri}}}evidence/{{{self.namespace_uri}}}item"):
-                cred_rating_text = item.findtext(f"{{{self.namespace_uri}}}credibility_rating")
-                cred_rating_float = None
-                if cred_rating_text is not None:
-                    try:
-                        cred_rating_float = float(cred_rating_text)
-                    except ValueError:
-                        logging.warning(f"Invalid float value for credibility_rating: '{cred_rating_text}' for evidence item {item.get('id')}")
-                parsed_data["evidence"].append({
-                    "external_id": item.get("id"),
-                    "title": item.findtext(f"{{{self.namespace_uri}}}title", ""),
-                    "source_type": item.findtext(f"{{{self.namespace_uri}}}source_type", ""),
-                    "source_name": item.findtext(f"{{{self.namespace_uri}}}source_name", ""),
-                    "url": item.findtext(f"{{{self.namespace_uri}}}url", ""),
-                    "description": item.findtext(f"{{{self.namespace_uri}}}description", ""),
-                    "credibility_rating": cred_rating_float
-                })
+            # Single traversal (tag filtering done by lxml): elements are dispatched on their tag
+            # and collected per type, so the output keeps the type-by-type order (premises first...)
+            statements_by_type: Dict[str, List[dict]] = {stmt_type: [] for stmt_type in STATEMENT_TYPES}
+            relationships_by_type: Dict[str, List[dict]] = {rel_type: [] for rel_type in RELATIONSHIP_TYPES}
+            statement_tags = self._statement_tags
+            relationship_tags = self._relationship_tags
+            for elem in root_element.iterdescendants(*self._extracted_tags):
+                tag = elem.tag
+                stmt_type = statement_tags.get(tag)
+                if stmt_type is not None:
+                    statement = self._extract_statement(elem, stmt_type)
+                    if statement is not None:
+                        statements_by_type[stmt_type].append(statement)
+                    continue
+                rel_type = relationship_tags.get(tag)
+                if rel_type is not None:
+                    relationship = self._extract_relationship(elem, rel_type)
+                    if relationship is not None:
+                        relationships_by_type[rel_type].append(relationship)
+                    continue
+                if elem.getparent().tag == self._evidence_tag:
+                    parsed_data["evidence"].append(self._extract_evidence(elem))
+
+            for stmt_type in STATEMENT_TYPES:
+                parsed_data["statements"].extend(statements_by_type[stmt_type])
+            for rel_type in RELATIONSHIP_TYPES:
+                parsed_data["relationships"].extend(relationships_by_type[rel_type])
 
             # Assign paths and depths
             self.assign_paths_and_depths(parsed_data)
-            logging.info("XML parsed successfully, paths and depths assigned")
+            logging.debug("XML parsed successfully, paths and depths assigned")
             return parsed_data
         except Exception as e:
             logging.error(f"Error parsing XML: {str(e)}")
             raise
 
+    def _extract_statement(self, elem: etree._Element, stmt_type: str) -> dict | None:
+        """Statement dictionary for a statement element, or None if it has no ID."""
+        ext_id = elem.get("id")
+        if not ext_id:
+            logging.error(f"Statement element {elem.tag} is missing an 'id' attribute. Skipping.")
+            return None
+        return {
+            "external_id": ext_id,
+            "statement_text": elem.text or "",
+            "statement_type": stmt_type,
+            "path": None,
+            "depth": 0
+        }
+
+    def _extract_relationship(self, elem: etree._Element, rel_type: str) -> dict | None:
+        """Relationship dictionary for a support/oppose element, or None if 'from' or 'to' is missing."""
+        from_id_val = elem.get("from")
+        to_id_val = elem.get("to")
+        if not from_id_val or not to_id_val:
+            logging.error(f"Relationship element {elem.tag} is missing 'from' or 'to' attribute. Skipping: from='{from_id_val}', to='{to_id_val}'")
+            return None
+        rel_data = {
+            "from_external_id": from_id_val,
+            "to_external_id": to_id_val,
+            "relationship_type": rel_type
+        }
+        # Parse group_id if present
+        group_id = elem.get("group_id")
+        if group_id:
+            rel_data["convergence_group_id"] = str(uuid.uuid5(uuid.NAMESPACE_DNS, group_id))
+        return rel_data
+
+    def _extract_evidence(self, item: etree._Element) -> dict:
+        """Evidence dictionary for an evidence item, reading its child elements in one pass."""
+        # Like findtext: the first matching child wins, and a child without text gives ""
+        values: Dict[str, str] = {}
+        field_tags = self._evidence_field_tags
+        for child in item:
+            field = field_tags.get(child.tag)
+            if field is not None and field not in values:
+                values[field] = child.text or ""
+
+        # Parse credibility_rating with float conversion
+        cred_rating_text = values.get("credibility_rating")
+        cred_rating_float = None
+        if cred_rating_text is not None:
+            try:
+                cred_rating_float = float(cred_rating_text)
+            except ValueError:
+                logging.warning(f"Invalid float value for credibility_rating: '{cred_rating_text}' for evidence item {item.get('id')}")
+        return {
+            "external_id": item.get("id"),
+            "title": values.get("title", ""),
+            "source_type": values.get("source_type", ""),
+            "source_name": values.get("source_name", ""),
+            "url": values.get("url", ""),
+            "description": values.get("description", ""),
+            "credibility_rating": cred_rating_float
+        }
+
     def clean_ltree_label(self, label_str: str) -> str:
         """
         Cleans an external_id to make it a valid ltree label.
         If the label is empty after cleaning, generates a unique label using an instance counter.
         """
+        if label_str.isascii() and label_str.replace("_", "a").isalnum():
+            return label_str  # Already a valid label (the common case)
         cleaned = re.sub(r'[^a-zA-Z0-9_]', '_', label_str)
         if not cleaned:
             unique_id = f"invalid_id_{self.invalid_id_gen_counter}"
@@ -102,62 +164,56 @@ class XMLParsingService:
             return unique_id
         return cleaned
 
-    def assign_paths_and_depths(self, parsed_data: dict) -> None:
+    def assign_paths_and_depths(self, parsed_data: dict, include_ancestor_paths: bool = False) -> None:
         """
-        Assigns hierarchical paths (ltree) and depths to statements based on relationships.
-        
-        Limitations: Cyclic structures are not supported and may result in incomplete ltree paths
-        for nodes within a cycle. The argument map is assumed to be a DAG (Directed Acyclic Graph).
+        Assigns hierarchical paths (ltree) and depths to statements based on support relationships.
+
+        The depth of a statement is its longest support chain to a root, and its path goes
+        through its deepest parent (ties: smallest external ID), so the path always has
+        depth + 1 labels. Cycles are reported in parsed_data["cycles"] (lists of external IDs)
+        and their members still get a path (see graph_service.build_hierarchy).
+
+        Args:
+            include_ancestor_paths: Also store, for each statement, its paths through every
+                parent in "ancestor_paths" (primary path first, capped per statement).
         """
         statements = parsed_data["statements"]
         relationships = parsed_data["relationships"]
-        statement_dict: Dict[str, dict] = {stmt["external_id"]: stmt for stmt in statements}
+        # Duplicate external IDs resolve to the last statement, the others stay isolated
+        node_index: Dict[str, int] = {stmt["external_id"]: index for index, stmt in enumerate(statements)}
         hierarchical_relationship_types = {"support"}
-        children_dict: Dict[str, List[str]] = {}
-        from_ids: Set[str] = set()
+        sources: List[int] = []
+        targets: List[int] = []
 
-        # Build children dictionary with validated IDs
+        # Edges go from the supported statement (parent) to the supporting one (child)
         for rel in relationships:
             if rel["relationship_type"] in hierarchical_relationship_types:
                 to_id = rel["to_external_id"]
                 from_id = rel["from_external_id"]
-                if to_id in statement_dict and from_id in statement_dict:
-                    children_dict.setdefault(to_id, []).append(from_id)
-                    from_ids.add(from_id)
+                parent = node_index.get(to_id)
+                child = node_index.get(from_id)
+                if parent is not None and child is not None:
+                    sources.append(parent)
+                    targets.append(child)
                 else:
                     logging.warning(f"Relationship from '{from_id}' to '{to_id}' references a nonexistent statement ID. Ignored.")
 
-        # Identify roots
-        roots = [stmt["external_id"] for stmt in statements if stmt["external_id"] not in from_ids]
-        visited: Set[str] = set()
-
-        # BFS for path and depth assignment
-        for root_id in roots:
-            if root_id not in statement_dict:
-                continue
-            queue = deque([(root_id, self.clean_ltree_label(root_id), 0)])
-            while queue:
-                current_id, current_path, current_depth = queue.popleft()
-                if current_id in visited:
-                    continue
-                if current_id not in statement_dict:
-                    logging.warning(f"ID {current_id} in queue but missing from statement_dict.")
-                    continue
-                visited.add(current_id)
-                statement_dict[current_id]["path"] = current_path
-                statement_dict[current_id]["depth"] = current_depth
-                children = sorted(children_dict.get(current_id, []))
-                for child_id in children:
-                    if child_id not in visited:
-                        cleaned_child_id = self.clean_ltree_label(child_id)
-                        queue.append((child_id, f"{current_path}.{cleaned_child_id}", current_depth + 1))
-
-        # Handle isolated statements
-        for stmt in statements:
-            if stmt["external_id"] not in visited:
-                stmt["path"] = self.clean_ltree_label(stmt["external_id"])
-                stmt["depth"] = 0
-                logging.info(f"Isolated statement {stmt['external_id']} assigned path {stmt['path']}")
+        external_ids = [stmt["external_id"] for stmt in statements]
+        hierarchy = build_hierarchy(len(statements), sources, targets, sort_keys=external_ids)
+        labels = [self.clean_ltree_label(external_id) for external_id in external_ids]
+        paths = primary_paths(hierarchy, labels)
+        for stmt, path, depth in zip(statements, paths, hierarchy.depths):
+            stmt["path"] = path
+            stmt["depth"] = depth
+        if include_ancestor_paths:
+            for stmt, stmt_paths in zip(statements, ancestor_paths(hierarchy, labels, sources, targets)):
+                stmt["ancestor_paths"] = stmt_paths
+
+        parsed_data["cycles"] = [[external_ids[node] for node in cycle] for cycle in hierarchy.cycles]
+        if hierarchy.cycles:
+            largest = max(parsed_data["cycles"], key=len)
+            logging.warning(f"{len(hierarchy.cycles)} support cycle(s) found, largest: {len(largest)} statements starting with {largest[:5]}")
+
 @lru_cache()
 def get_xml_parsing_service() -> 'XMLParsingService':
     """
@@ -0,0 +1,91 @@
+import logging
+import re
+from lxml import etree
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+STATEMENT_TYPES = {"premise", "conclusion", "rebuttal", "counter_conclusion"}
+RELATIONSHIP_TYPES = {"support", "oppose"}
+
+# Root start/end tags, with or without a namespace prefix
+ROOT_START_RE = re.compile(r"<(?:\w+:)?argument_map[\s>]")
+ROOT_END_RE = re.compile(r"</(?:\w+:)?argument_map\s*>")
+
+class ArgumentMapStreamParser:
+    def __init__(self):
+        """
+        Incremental parser for an argument map document arriving in chunks (e.g. LLM tokens).
+        Text before the <argument_map> root and after its end tag is ignored; statements and
+        relationships are reported as soon as their element is closed.
+        """
+        self._parser = etree.XMLPullParser(events=("end",))
+        self._pending = ""  # Text received before the root start tag was found
+        self._document_parts: list[str] = []
+        self._scan_tail = ""  # End of the previous chunk, to find an end tag split across chunks
+        self.started = False
+        self.finished = False
+        self.failed = False
+
+    @property
+    def document(self) -> str | None:
+        """The XML document received so far, from the root start tag onwards."""
+        return "".join(self._document_parts) if self.started else None
+
+    def feed(self, chunk: str) -> list[dict]:
+        """
+        Feed the next chunk of text and return the statement/relationship events it completed.
+        """
+        if self.finished or not chunk:
+            return []
+
+        if not self.started:
+            self._pending += chunk
+            match = ROOT_START_RE.search(self._pending)
+            if not match:
+                return []
+            self.started = True
+            chunk = self._pending[match.start():]
+            self._pending = ""
+
+        # Stop at the root end tag so trailing text (code fences, comments) is not parsed
+        window = self._scan_tail + chunk
+        end_match = ROOT_END_RE.search(window)
+        if end_match:
+            chunk = chunk[:max(0, end_match.end() - len(self._scan_tail))]
+            self.finished = True
+        self._scan_tail = window[-32:]
+        self._document_parts.append(chunk)
+
+        if self.failed:
+            return []
+        try:
+            self._parser.feed(chunk)
+            return [event for event in map(self._to_event, self._parser.read_events()) if event]
+        except etree.XMLSyntaxError as e:
+            # Keep accumulating the document: the final validation reports the error
+            logger.warning(f"Incremental XML parsing stopped: {str(e)}")
+            self.failed = True
+            return []
+
+    def _to_event(self, parser_event: tuple) -> dict | None:
+        _, elem = parser_event
+        if not isinstance(elem.tag, str):
+            return None
+        local_name = etree.QName(elem).localname
+        if local_name in STATEMENT_TYPES and elem.get("id"):
+            return {
+                "event": "statement",
+                "external_id": elem.get("id"),
+                "statement_type": local_name,
+                "statement_text": elem.text or ""
+            }
+        if local_name in RELATIONSHIP_TYPES and elem.get("from") and elem.get("to"):
+            return {
+                "event": "relationship",
+                "from_external_id": elem.get("from"),
+                "to_external_id": elem.get("to"),
+                "relationship_type": local_name,
+                "group_id": elem.get("group_id")
+            }
+        return None
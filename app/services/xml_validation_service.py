@@ -1,13 +1,27 @@
 import logging
+import time
 from functools import lru_cache
 from lxml import etree
 from lxml.isoschematron import Schematron  # Add this import
 import os
 from app.core.config import settings
+from app.core.logging import RateLimitedLogger
+from app.services.business_rules_service import BusinessRulesValidator
 
 class XMLValidationService:
-    def __init__(self):
+    def __init__(self, business_rules_engine: str | None = None):
+        """
+        Args:
+            business_rules_engine: "schematron" (business_rules.sch) or "native" (indexed Python
+                implementation of the same rules). Defaults to Settings.BUSINESS_RULES_ENGINE.
+        """
         self.logger = logging.getLogger(__name__)
+        self.failure_logger = RateLimitedLogger(self.logger)
+        self.business_rules_engine = business_rules_engine or settings.BUSINESS_RULES_ENGINE
+        if self.business_rules_engine not in ("schematron", "native"):
+            raise ValueError(f"Unknown business rules engine: {self.business_rules_engine}")
+        self.schematron_validator = None
+        self.business_rules_validator = None
         self._load_schemas()
 
     def _load_schemas(self):
@@ -23,6 +37,11 @@ class XMLValidationService:
             self.logger.error(f"Failed to load XSD schema: {str(e)}")
             raise
 
+        if self.business_rules_engine == "native":
+            self.business_rules_validator = BusinessRulesValidator()
+            self.logger.debug("Native business rules validator enabled")
+            return
+
         # Load and compile Schematron schema
         self.sch_path = os.path.join(settings.BASE_DIR, 'app', 'xml_definitions', 'business_rules.sch')
         try:
@@ -36,25 +55,38 @@ class XMLValidationService:
 
     def validate_xml(self, xml_content: str) -> tuple[bool, list[str]]:
         """Validate XML content against XSD and Schematron schemas."""
-        errors = []
-
         # Parse XML content
         try:
             xml_doc = etree.fromstring(xml_content.encode('utf-8'))
         except etree.XMLSyntaxError as e:
             self.logger.error(f"XML parsing failed: {str(e)}")
-            errors.append(f"XML Syntax Error: {str(e)}")
-            return False, errors
+            return False, [f"XML Syntax Error: {str(e)}"]
+
+        return self.validate_tree(xml_doc)
+
+    def validate_tree(self, xml_doc: etree._Element, timings: dict[str, float] | None = None) -> tuple[bool, list[str]]:
+        """
+        Validate an already parsed XML tree against XSD and Schematron schemas.
+        Lets callers that also extract data from the document parse it only once.
+        If timings is given, the durations of the "xsd_validation" and "business_rules"
+        steps are stored in it (seconds).
+        """
+        errors = []
 
         # Step 1: Validate against XSD
-        if not self.xsd_schema.validate(xml_doc):
+        start = time.perf_counter()
+        xsd_valid = self.xsd_schema.validate(xml_doc)
+        if timings is not None:
+            timings["xsd_validation"] = time.perf_counter() - start
+        if not xsd_valid:
             errors.extend([
                 f"XSD Error (Line {err.line}, Col {err.column}): {err.message}"
                 for err in self.xsd_schema.error_log
             ])
             self.logger.debug("XSD validation failed")
 
-        # Step 2: Validate against Schematron
+        # Step 2: Validate business rules (Schematron or native engine)
+        start = time.perf_counter()
         if self.schematron_validator:
             if not self.schematron_validator.validate(xml_doc):
                 svrl_report = self.schematron_validator.validation_report
@@ -66,12 +98,19 @@ class XMLValidationService:
                         errors.append(error_text[0].strip())
                 if failed_asserts:
                     self.logger.debug("Schematron validation failed")
+        elif self.business_rules_validator:
+            business_rule_errors = self.business_rules_validator.validate(xml_doc)
+            if business_rule_errors:
+                errors.extend(business_rule_errors)
+                self.logger.debug("Business rules validation failed")
+        if timings is not None:
+            timings["business_rules"] = time.perf_counter() - start
 
         is_valid = len(errors) == 0
         if is_valid:
-            self.logger.info("XML validation successful")
+            self.logger.debug("XML validation successful")
         else:
-            self.logger.warning(f"XML validation failed with errors: {errors}")
+            self.failure_logger.warning("xml_validation_failed", "XML validation failed with %d errors, first: %s", len(errors), errors[0])
 
         return is_valid, errors
     
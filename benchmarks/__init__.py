@@ -0,0 +1,6 @@
+import os
+
+# Settings are instantiated at import time: provide local defaults so benchmarks run without a .env
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-key")
+os.environ.setdefault("OPENAI_MODEL_NAME", "gpt-benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
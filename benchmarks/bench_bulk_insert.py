@@ -0,0 +1,44 @@
+"""
+Compare ArgumentMapRepository.create_argument_map with per-statement flushes (ORM mode)
+and multi-row INSERT ... RETURNING (bulk mode) as the number of statements grows.
+
+Usage: python -m benchmarks.bench_bulk_insert [--database-url URL] [--sizes 100 1000 10000]
+"""
+import argparse
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from benchmarks.database import create_benchmark_engine
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.repositories.argument_map_repository import ArgumentMapRepository
+from app.services.xml_parsing_service import XMLParsingService
+
+def run(database_url: str, sizes: list[int]) -> None:
+    engine = create_benchmark_engine(database_url)
+    round_trips = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_round_trips(*args):
+        nonlocal round_trips
+        round_trips += 1
+
+    parsing_service = XMLParsingService()
+    print(f"{'statements':>10} {'mode':>5} {'seconds':>9} {'statements/s':>13} {'round trips':>12}")
+    for size in sizes:
+        parsed_data = parsing_service.parse_xml(generate_argument_map_xml(size))
+        for bulk_insert in (False, True):
+            round_trips = 0
+            with Session(engine) as session:
+                start = time.perf_counter()
+                ArgumentMapRepository(session, bulk_insert=bulk_insert).create_argument_map(parsed_data, None, None)
+                session.commit()
+                elapsed = time.perf_counter() - start
+            mode = "bulk" if bulk_insert else "orm"
+            print(f"{size:>10} {mode:>5} {elapsed:>9.3f} {size / elapsed:>13.0f} {round_trips:>12}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2000, 10000])
+    args = parser.parse_args()
+    run(args.database_url, args.sizes)
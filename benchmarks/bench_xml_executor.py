@@ -0,0 +1,55 @@
+"""
+Measure event-loop latency while concurrent imports are validated and parsed
+in each XMLExecutorService mode (inline, thread, process).
+
+Usage: python -m benchmarks.bench_xml_executor [--statements 500] [--concurrency 16] [--workers 4]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.services.xml_executor_service import XMLExecutorService
+
+HEARTBEAT_INTERVAL = 0.005
+
+async def _heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up compared to the requested interval."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+async def _run_mode(mode: str, workers: int, xml_content: str, concurrency: int) -> None:
+    service = XMLExecutorService(mode, workers)
+    try:
+        await service.process(xml_content)  # Warm up the pool and its compiled schemas
+        lags: list[float] = []
+        stop = asyncio.Event()
+        heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.process(xml_content) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await heartbeat
+        assert all(result.is_valid for result in results)
+        lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+        p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+        print(f"{mode:>8} {elapsed:>9.3f} {statistics.median(lags_ms):>12.2f} {p99:>12.2f} {lags_ms[-1]:>12.2f}")
+    finally:
+        service.shutdown()
+
+async def run(statements: int, concurrency: int, workers: int) -> None:
+    xml_content = generate_argument_map_xml(statements)
+    print(f"{concurrency} concurrent documents of {statements} statements, {workers} workers")
+    print(f"{'mode':>8} {'seconds':>9} {'lag p50 ms':>12} {'lag p99 ms':>12} {'lag max ms':>12}")
+    for mode in ("inline", "thread", "process"):
+        await _run_mode(mode, workers, xml_content, concurrency)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--statements", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.statements, args.concurrency, args.workers))
@@ -0,0 +1,44 @@
+"""
+Time XMLParsingService extraction over synthetic maps of 10 to 100k statements.
+
+Reports the tree parse (etree.fromstring), the extraction with path/depth assignment
+(parse_tree) and path/depth assignment alone (assign_paths_and_depths).
+
+Usage: python -m benchmarks.bench_xml_parsing [--sizes 10 100 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import copy
+import time
+from lxml import etree
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.services.xml_parsing_service import XMLParsingService
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(sizes: list[int], repeat: int) -> None:
+    service = XMLParsingService()
+    print(f"{'statements':>10} {'fromstring ms':>14} {'parse_tree ms':>14} {'paths ms':>10} {'extract ms':>11}")
+    for size in sizes:
+        xml_content = generate_argument_map_xml(size)
+        root_element = etree.fromstring(xml_content.encode("utf-8"))
+        parsed_data = service.parse_tree(root_element, xml_content)
+
+        fromstring_time = _best_of(repeat, lambda: etree.fromstring(xml_content.encode("utf-8")))
+        parse_tree_time = _best_of(repeat, lambda: service.parse_tree(root_element, xml_content))
+        paths_time = _best_of(repeat, lambda: service.assign_paths_and_depths(copy.deepcopy(parsed_data)))
+        paths_time -= _best_of(repeat, lambda: copy.deepcopy(parsed_data))
+        print(f"{size:>10} {fromstring_time * 1000:>14.2f} {parse_tree_time * 1000:>14.2f} "
+              f"{paths_time * 1000:>10.2f} {(parse_tree_time - paths_time) * 1000:>11.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
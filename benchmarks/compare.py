@@ -0,0 +1,50 @@
+"""
+Compare two benchmark result files written by benchmarks.run_suite.
+
+Prints the best time of each (stage, variant, statements) measured in both files and the
+candidate/baseline ratio; exits with status 1 if any ratio exceeds 1 + threshold.
+
+Usage: python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+def load_results(path: Path) -> dict[tuple, float]:
+    report = json.loads(path.read_text())
+    return {(row["stage"], row["variant"], row["statements"]): row["best_ms"] for row in report["results"]}
+
+def compare(baseline: dict[tuple, float], candidate: dict[tuple, float], threshold: float) -> list[dict]:
+    """Rows measured in both runs, with their ratio and whether they regressed beyond the threshold."""
+    rows = []
+    for key in sorted(baseline.keys() & candidate.keys(), key=lambda key: (key[0], key[1] or "", key[2])):
+        ratio = candidate[key] / baseline[key] if baseline[key] > 0 else float("inf")
+        rows.append({
+            "stage": key[0],
+            "variant": key[1],
+            "statements": key[2],
+            "baseline_ms": baseline[key],
+            "candidate_ms": candidate[key],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold
+        })
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1, help="Tolerated slowdown (0.1 = 10%%)")
+    args = parser.parse_args()
+
+    rows = compare(load_results(args.baseline), load_results(args.candidate), args.threshold)
+    print(f"{'stage':<26} {'variant':<11} {'statements':>10} {'baseline ms':>12} {'candidate ms':>13} {'ratio':>7}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['stage']:<26} {row['variant'] or '':<11} {row['statements']:>10} {row['baseline_ms']:>12.2f} "
+              f"{row['candidate_ms']:>13.2f} {row['ratio']:>7.2f}{flag}")
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+from sqlalchemy import create_engine, Engine
+from app.database.db import Base
+from app.database.models import ArgumentMap, Statement, StatementRelationship, Evidence
+
+ARGUMENT_MAP_TABLES = [ArgumentMap.__table__, Statement.__table__, StatementRelationship.__table__, Evidence.__table__]
+
+def create_benchmark_engine(database_url: str = "sqlite://") -> Engine:
+    """
+    Create an engine with the argument map tables. Defaults to an in-memory SQLite database;
+    pass a PostgreSQL URL to benchmark against a local server.
+    """
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine, tables=ARGUMENT_MAP_TABLES)
+    return engine
@@ -0,0 +1,140 @@
+"""
+Benchmark the argument map pipeline stages over synthetic maps and save the results as JSON.
+
+Stages: validate_xml (XSD + business rules), parse_xml, assign_paths_and_depths and
+create_argument_map (bulk and ORM inserts) against SQLite or a local PostgreSQL server
+(the ltree extension must be installed). Compare two result files with benchmarks.compare.
+
+Usage: python -m benchmarks.run_suite [--sizes 10 100 1000 10000 100000] [--repeat 3]
+           [--fan-out 3] [--max-depth N] [--linked-group-ratio 0.2] [--evidence-density 0.1]
+           [--database-url postgresql://...] [--output results.json]
+"""
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from sqlalchemy.orm import Session
+from benchmarks.database import create_benchmark_engine
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.repositories.argument_map_repository import ArgumentMapRepository
+from app.services.xml_parsing_service import XMLParsingService
+from app.services.xml_validation_service import XMLValidationService
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def _measure(repeat: int, func, setup=None) -> dict:
+    """Run func `repeat` times (with a fresh untimed setup() argument if given) and summarize the timings."""
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return {
+        "best_ms": min(timings) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "repeat": repeat
+    }
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args: argparse.Namespace) -> dict:
+    shape = {
+        "fan_out": args.fan_out,
+        "max_depth": args.max_depth,
+        "linked_group_ratio": args.linked_group_ratio,
+        "evidence_density": args.evidence_density,
+        "seed": args.seed
+    }
+    validators = {engine: XMLValidationService(business_rules_engine=engine) for engine in args.rules_engines}
+    parsing_service = XMLParsingService()
+    engine = create_benchmark_engine(args.database_url)
+    results = []
+
+    def record(stage: str, variant: str | None, size: int, measurement: dict) -> None:
+        results.append({"stage": stage, "variant": variant, "statements": size, **measurement})
+        print(f"{stage:<26} {variant or '':<11} {size:>8} {measurement['best_ms']:>12.2f} {measurement['mean_ms']:>12.2f}")
+
+    def bench_size(size: int, recorder) -> None:
+        xml_content = generate_argument_map_xml(size, **shape)
+        parsed_data = parsing_service.parse_xml(xml_content)
+        parsed_data["source_xml"] = xml_content
+
+        for rules_engine, validator in validators.items():
+            if rules_engine == "schematron" and size > args.max_schematron_size:
+                continue  # Schematron checks are quadratic in the number of statements
+            recorder("validate_xml", rules_engine, size, _measure(args.repeat, lambda: validator.validate_xml(xml_content)))
+
+        recorder("parse_xml", None, size, _measure(args.repeat, lambda: parsing_service.parse_xml(xml_content)))
+        recorder("assign_paths_and_depths", None, size, _measure(
+            args.repeat, parsing_service.assign_paths_and_depths, setup=lambda: copy.deepcopy(parsed_data)
+        ))
+
+        for insert_mode in args.insert_modes:
+            if insert_mode == "orm" and size > args.max_orm_size:
+                continue  # One flush per statement
+
+            def create(session: Session) -> None:
+                ArgumentMapRepository(session, bulk_insert=insert_mode == "bulk").create_argument_map(parsed_data, None, None)
+                session.commit()
+                session.close()
+
+            recorder("create_argument_map", insert_mode, size, _measure(args.repeat, create, setup=lambda: Session(engine)))
+
+    # Untimed warm-up pass: statement compilation caches, connection pool, imports
+    bench_size(10, lambda *measurement: None)
+
+    print(f"{'stage':<26} {'variant':<11} {'statements':>8} {'best ms':>12} {'mean ms':>12}")
+    for size in args.sizes:
+        bench_size(size, record)
+
+    engine.dispose()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "shape": shape
+        },
+        "results": results
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--linked-group-ratio", type=float, default=0.2)
+    parser.add_argument("--evidence-density", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules-engines", nargs="+", choices=["schematron", "native"], default=["schematron", "native"])
+    parser.add_argument("--max-schematron-size", type=int, default=2000)
+    parser.add_argument("--insert-modes", nargs="+", choices=["bulk", "orm"], default=["bulk", "orm"])
+    parser.add_argument("--max-orm-size", type=int, default=10000)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        output = RESULTS_DIR / f"{stamp}_{report['meta']['commit'] or 'nocommit'}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
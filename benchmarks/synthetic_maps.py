@@ -0,0 +1,71 @@
+import random
+from xml.sax.saxutils import escape
+
+NAMESPACE_URI = "http://example.com/argument_map"
+
+def generate_argument_map_xml(
+    n_statements: int,
+    fan_out: int = 3,
+    evidence_density: float = 0.1,
+    seed: int = 0,
+    max_depth: int | None = None,
+    linked_group_ratio: float = 0.0
+) -> str:
+    """
+    Generate a valid argument map document with n_statements statements.
+
+    Statements form a support tree rooted at a single conclusion, filled breadth-first with
+    fan_out children per node. With max_depth, nodes at that depth get no children: once the
+    shallower levels are full, further statements are spread round-robin over them (so the
+    effective fan-out grows). linked_group_ratio is the fraction of parents whose supporting
+    premises form one linked group (shared group_id); evidence_density is the fraction of
+    statements with an evidence item.
+    """
+    rng = random.Random(seed)
+    depths = [0]
+    parents = [None]
+    open_parents = [0]  # Nodes that can still receive children, breadth-first
+    child_counts = [0]
+    next_parent = 0
+    for index in range(1, n_statements):
+        if next_parent < len(open_parents) and child_counts[open_parents[next_parent]] >= fan_out:
+            next_parent += 1
+        saturated = next_parent >= len(open_parents)
+        if saturated:
+            # Every node within max_depth has fan_out children: keep filling them round-robin
+            parent = open_parents[index % len(open_parents)]
+        else:
+            parent = open_parents[next_parent]
+        parents.append(parent)
+        depths.append(depths[parent] + 1)
+        child_counts[parent] += 1
+        child_counts.append(0)
+        if not saturated and (max_depth is None or depths[index] < max_depth):
+            open_parents.append(index)
+
+    linked_parents = set()
+    if linked_group_ratio > 0:
+        linked_parents = {index for index in range(n_statements) if child_counts[index] > 1 and rng.random() < linked_group_ratio}
+
+    statements = ['<arg:conclusion id="s0">Main conclusion</arg:conclusion>']
+    relationships = []
+    evidence = []
+    for index in range(1, n_statements):
+        parent = parents[index]
+        statements.append(f'<arg:premise id="s{index}">{escape(f"Premise {index} supporting s{parent}")}</arg:premise>')
+        group = f' group_id="g{parent}"' if parent in linked_parents else ""
+        relationships.append(f'<arg:support from="s{index}" to="s{parent}"{group}/>')
+    for index in range(n_statements):
+        if rng.random() < evidence_density:
+            evidence.append(
+                f'<arg:item id="e{index}" for="s{index}"><arg:title>Evidence for s{index}</arg:title>'
+                f'<arg:credibility_rating>{rng.random():.2f}</arg:credibility_rating></arg:item>'
+            )
+    return (
+        f'<arg:argument_map xmlns:arg="{NAMESPACE_URI}">'
+        f'<arg:title>Synthetic map ({n_statements} statements)</arg:title>'
+        f'<arg:statements>{"".join(statements)}</arg:statements>'
+        f'<arg:relationships>{"".join(relationships)}</arg:relationships>'
+        f'<arg:evidence>{"".join(evidence)}</arg:evidence>'
+        '</arg:argument_map>'
+    )
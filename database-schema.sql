@@ -60,20 +60,28 @@ CREATE TABLE argument_maps (
     creator_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
     title VARCHAR(255) NOT NULL,
     description TEXT,
-    source_xml TEXT,
+    source_xml BYTEA,  -- zlib-compressed XML (see app/database/types.py); migrate older databases with python -m app.database.migrate_source_xml
     version INTEGER DEFAULT 1,  -- For tracking versions
     is_published BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Keyset pagination of listings: (created_at, id) descending, per organization or creator
+CREATE INDEX argument_maps_created_idx ON argument_maps (created_at DESC, id DESC);
+CREATE INDEX argument_maps_org_created_idx ON argument_maps (organization_id, created_at DESC, id DESC);
+CREATE INDEX argument_maps_creator_created_idx ON argument_maps (creator_id, created_at DESC, id DESC);
+
 -- Argument map versions for change history
 CREATE TABLE argument_map_versions (
     id SERIAL PRIMARY KEY,
     argument_map_id INTEGER REFERENCES argument_maps(id) ON DELETE CASCADE,
     version INTEGER NOT NULL,
     creator_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
-    source_xml TEXT,
+    source_xml TEXT,  -- Full XML (legacy rows); newer rows use storage/payload
+    storage VARCHAR(10) CHECK (storage IN ('snapshot', 'delta')),
+    base_version INTEGER,  -- Snapshot version at the start of the delta chain
+    payload BYTEA,  -- zlib-compressed snapshot or delta against the previous version
     change_description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(argument_map_id, version)
@@ -91,16 +99,23 @@ CREATE TABLE statements (
     position INTEGER,
     path LTREE,  -- Hierarchical path for efficient tree retrieval
     depth INTEGER DEFAULT 0,
+    -- Full-text search document ("simple": lowercased words, no stemming, as maps mix languages)
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', statement_text)) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX statements_path_idx ON statements USING GIST (path);
+-- Statement search (@@ websearch_to_tsquery, ranked with ts_rank_cd). On an existing database:
+-- ALTER TABLE statements ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', statement_text)) STORED;
+CREATE INDEX statements_search_vector_idx ON statements USING GIN (search_vector);
+-- Per-map reads (eager loading) and lookups by XML ID
+CREATE INDEX statements_map_external_id_idx ON statements (argument_map_id, external_id);
 
 -- MoralBERT Scores for statements
 CREATE TABLE moralbert_scores (
     id SERIAL PRIMARY KEY,
-    statement_id INTEGER REFERENCES statements(id) ON DELETE CASCADE,
+    statement_id INTEGER UNIQUE REFERENCES statements(id) ON DELETE CASCADE,  -- Upsert key of bulk imports
     care_harm_score FLOAT CHECK (care_harm_score BETWEEN -1.0 AND 1.0),
     fairness_cheating_score FLOAT CHECK (fairness_cheating_score BETWEEN -1.0 AND 1.0),
     loyalty_betrayal_score FLOAT CHECK (loyalty_betrayal_score BETWEEN -1.0 AND 1.0),
@@ -109,6 +124,8 @@ CREATE TABLE moralbert_scores (
     imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+-- On an existing database (after removing duplicate rows per statement):
+-- ALTER TABLE moralbert_scores ADD CONSTRAINT moralbert_scores_statement_id_key UNIQUE (statement_id);
 
 -- Statement relationships - captures support/oppose and linked premises
 CREATE TABLE statement_relationships (
@@ -124,6 +141,8 @@ CREATE TABLE statement_relationships (
     UNIQUE(from_statement_id, to_statement_id)
 );
 
+CREATE INDEX statement_relationships_map_idx ON statement_relationships (argument_map_id);
+
 -- Cross-map references - allowing one argument map to reference another
 CREATE TABLE cross_map_references (
     id SERIAL PRIMARY KEY,
@@ -206,3 +225,24 @@ CREATE TABLE xml_schema_definitions (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(name, version, schema_type)
 );
+
+-- Transform jobs - asynchronous text-to-map requests processed by the worker pool
+CREATE TABLE transform_jobs (
+    id SERIAL PRIMARY KEY,
+    uuid UUID DEFAULT uuid_generate_v4() UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'succeeded', 'failed')),
+    input_text TEXT NOT NULL,
+    argument_map_id INTEGER REFERENCES argument_maps(id) ON DELETE SET NULL,
+    error_status_code INTEGER,
+    error_message TEXT,
+    error_details JSONB,
+    attempts INTEGER DEFAULT 0,
+    locked_by VARCHAR(255),  -- Worker currently holding the job
+    lease_expires_at TIMESTAMP,  -- Running jobs whose lease expired are picked up again
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX transform_jobs_status_idx ON transform_jobs (status, id);
@@ -1 +1,341 @@
 # Tests for argument map API endpoints
+
+def test_import_xml_creates_argument_map(client, valid_xml):
+    """
+    Vérifie qu'un XML valide est importé et que la carte est renvoyée.
+    """
+    response = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == "1"
+    assert body["xml_content"] == valid_xml
+
+def test_import_xml_rejects_invalid_xml(client, valid_xml):
+    """
+    Vérifie qu'un XML ne respectant pas les règles métier renvoie une erreur 400.
+    """
+    response = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml.replace('to="c1"', 'to="c2"')})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("XML invalide")
+
+class FakeStreamingLLMService:
+    """Stand-in for LLMService streaming the XML in small chunks."""
+    def __init__(self, xml_content):
+        self.xml_content = xml_content
+        self.cached = {}
+
+    async def astream_xml(self, text):
+        for start in range(0, len(self.xml_content), 16):
+            yield self.xml_content[start:start + 16]
+
+    def cache_xml(self, text, xml_content):
+        self.cached[text] = xml_content
+
+def test_transform_text_stream_emits_statements_then_complete(client, valid_xml):
+    """
+    Vérifie que le flux NDJSON contient les statements puis l'événement final après enregistrement.
+    """
+    import json
+    from app.main import app
+    from app.services.llm_service import get_llm_service
+
+    app.dependency_overrides[get_llm_service] = lambda: FakeStreamingLLMService(valid_xml)
+    response = client.post("/api/v1/argument_map/transform_text_to_xml/stream/", json={"text": "Un texte"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["statement", "statement", "relationship", "complete"]
+    assert events[-1]["id"] == "1"
+    assert events[-1]["xml_content"] == valid_xml
+
+class FakeConcurrentLLMService:
+    """Stand-in for LLMService recording how many generations run at the same time."""
+    def __init__(self, xml_content):
+        self.xml_content = xml_content
+        self.running = 0
+        self.max_running = 0
+        self.cached = {}
+
+    async def generate_xml(self, text):
+        import asyncio
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return self.xml_content if text != "invalide" else self.xml_content.replace('to="c1"', 'to="c2"')
+
+    def cache_xml(self, text, xml_content):
+        self.cached[text] = xml_content
+
+def test_transform_text_batch_reports_each_item(client, valid_xml, monkeypatch):
+    """
+    Vérifie que chaque texte du lot est traité indépendamment, sous la limite de concurrence.
+    """
+    from app.core.config import settings
+    from app.main import app
+    from app.services.llm_service import get_llm_service
+
+    fake_llm_service = FakeConcurrentLLMService(valid_xml)
+    app.dependency_overrides[get_llm_service] = lambda: fake_llm_service
+    monkeypatch.setattr(settings, "LLM_BATCH_CONCURRENCY", 2)
+
+    response = client.post("/api/v1/argument_map/transform_text_to_xml/batch/", json={"texts": ["a", "invalide", "b", "c"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["results"]] == ["succeeded", "failed", "succeeded", "succeeded"]
+    assert body["results"][1]["status_code"] == 400
+    assert (body["succeeded"], body["failed"]) == (3, 1)
+    assert fake_llm_service.max_running == 2
+    # Seuls les XML validés sont mis en cache
+    assert set(fake_llm_service.cached) == {"a", "b", "c"}
+
+def test_transform_job_is_accepted_and_pollable(client):
+    """
+    Vérifie que la création d'une tâche répond 202 avec une URL de suivi consultable.
+    """
+    response = client.post("/api/v1/argument_map/transform_text_to_xml/jobs/", json={"text": "Un texte"})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "pending"
+    assert response.headers["location"] == body["status_url"]
+
+    status_response = client.get(body["status_url"], params={"wait": 0.1})
+    assert status_response.status_code == 200
+    assert status_response.json()["job_id"] == body["job_id"]
+    assert status_response.json()["status"] == "pending"
+
+def test_transform_job_unknown_id_returns_404(client):
+    """
+    Vérifie qu'une tâche inconnue renvoie une erreur 404.
+    """
+    import uuid
+
+    response = client.get(f"/api/v1/argument_map/transform_text_to_xml/jobs/{uuid.uuid4()}")
+
+    assert response.status_code == 404
+
+def test_get_argument_map_and_subtree(client, valid_xml):
+    """
+    Vérifie la lecture d'une carte importée et d'une branche à partir d'un statement.
+    """
+    created = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+
+    response = client.get(f"/api/v1/argument_map/{created['uuid']}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] == "Test Map"
+    assert [statement["external_id"] for statement in body["statements"]] == ["p1", "c1"]
+    assert body["relationships"][0]["from_external_id"] == "p1"
+    assert body["relationships"][0]["to_external_id"] == "c1"
+
+    subtree = client.get(f"/api/v1/argument_map/{created['uuid']}/statements/c1/subtree", params={"max_depth": 0})
+    assert subtree.status_code == 200
+    assert [statement["path"] for statement in subtree.json()["statements"]] == ["c1"]
+
+    missing = client.get(f"/api/v1/argument_map/{created['uuid']}/statements/zz/subtree")
+    assert missing.status_code == 404
+
+def test_get_argument_strength_is_cached_per_version(client, valid_xml):
+    """
+    Vérifie le calcul de la force des statements et sa revalidation par ETag.
+    """
+    created = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+
+    response = client.get(f"/api/v1/argument_map/{created['uuid']}/strength", params={"damping": 0.5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["converged"] is True
+    scores = {score["external_id"]: score["score"] for score in body["scores"]}
+    assert scores == {"p1": 0.5, "c1": 0.75}
+
+    revalidated = client.get(
+        f"/api/v1/argument_map/{created['uuid']}/strength",
+        params={"damping": 0.5},
+        headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+    # Facteur arrondi à 2 décimales : même variante, borné à 0.99
+    rounded = client.get(f"/api/v1/argument_map/{created['uuid']}/strength", params={"damping": 0.504})
+    assert rounded.json()["damping"] == 0.5 and rounded.headers["etag"] == response.headers["etag"]
+    assert client.get(f"/api/v1/argument_map/{created['uuid']}/strength", params={"damping": 1}).status_code == 422
+
+    missing = client.get("/api/v1/argument_map/00000000-0000-0000-0000-000000000000/strength")
+    assert missing.status_code == 404
+
+def test_update_argument_map_applies_diff_and_moves_etag(client, valid_xml):
+    """
+    Vérifie la mise à jour incrémentale : nouvelle version, nouvel ETag et If-Match obsolète refusé (412).
+    """
+    created = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+    first_read = client.get(f"/api/v1/argument_map/{created['uuid']}")
+    updated_xml = valid_xml.replace("Premise 1", "Premise 1 (révisée)")
+
+    response = client.put(
+        f"/api/v1/argument_map/{created['uuid']}",
+        json={"xml_content": updated_xml},
+        headers={"If-Match": first_read.headers["etag"]}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["version"] == 2
+    assert body["changes"]["statements_updated"] == 1
+    assert body["changes"]["relationships_inserted"] == 0
+
+    reread = client.get(f"/api/v1/argument_map/{created['uuid']}", headers={"If-None-Match": first_read.headers["etag"]})
+    assert reread.status_code == 200
+    assert reread.headers["etag"] == response.headers["etag"]
+    assert reread.json()["statements"][0]["statement_text"] == "Premise 1 (révisée)"
+
+    stale = client.put(
+        f"/api/v1/argument_map/{created['uuid']}",
+        json={"xml_content": valid_xml},
+        headers={"If-Match": first_read.headers["etag"]}
+    )
+    assert stale.status_code == 412
+
+    missing = client.put("/api/v1/argument_map/00000000-0000-0000-0000-000000000000", json={"xml_content": valid_xml})
+    assert missing.status_code == 404
+
+    versions = client.get(f"/api/v1/argument_map/{created['uuid']}/versions").json()["versions"]
+    assert [version["version"] for version in versions] == [2, 1]
+    assert [version["storage"] for version in versions] == ["delta", "snapshot"]
+    assert client.get(f"/api/v1/argument_map/{created['uuid']}/versions/1").json()["xml_content"] == valid_xml
+    assert client.get(f"/api/v1/argument_map/{created['uuid']}/versions/2").json()["xml_content"] == updated_xml
+    assert client.get(f"/api/v1/argument_map/{created['uuid']}/versions/3").status_code == 404
+
+def test_update_through_another_process_is_seen_by_cached_reads(client, valid_xml):
+    """
+    Vérifie qu'une mise à jour faite par un autre processus (autre cache local, même backend partagé)
+    est visible immédiatement par les lectures servies depuis le cache.
+    """
+    from app.main import app
+    from app.services.response_cache_service import get_response_cache, ResponseCache, InMemoryCacheBackend
+
+    backend = InMemoryCacheBackend()
+    reader_cache = ResponseCache(max_entries=100, ttl_seconds=60, backend=backend)
+    writer_cache = ResponseCache(max_entries=100, ttl_seconds=60, backend=backend)
+    created = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+
+    app.dependency_overrides[get_response_cache] = lambda: reader_cache
+    first_read = client.get(f"/api/v1/argument_map/{created['uuid']}")
+    assert first_read.headers["etag"] == f'"{created["uuid"]}-v1"'
+
+    app.dependency_overrides[get_response_cache] = lambda: writer_cache
+    updated_xml = valid_xml.replace("Premise 1", "Premise 1 (révisée)")
+    updated = client.put(f"/api/v1/argument_map/{created['uuid']}", json={"xml_content": updated_xml})
+    assert updated.status_code == 200
+
+    app.dependency_overrides[get_response_cache] = lambda: reader_cache
+    reread = client.get(f"/api/v1/argument_map/{created['uuid']}", headers={"If-None-Match": first_read.headers["etag"]})
+    assert reread.status_code == 200
+    assert reread.headers["etag"] == updated.headers["etag"] == f'"{created["uuid"]}-v2"'
+    assert reread.json()["statements"][0]["statement_text"] == "Premise 1 (révisée)"
+
+def test_list_argument_maps_pages_with_cursor(client, valid_xml):
+    """
+    Vérifie la liste paginée des cartes et le rejet d'un curseur invalide.
+    """
+    for _ in range(3):
+        client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml})
+
+    first_page = client.get("/api/v1/argument_map/", params={"limit": 2}).json()
+    assert [item["id"] for item in first_page["items"]] == ["3", "2"]
+    assert "xml_content" not in first_page["items"][0]
+
+    second_page = client.get("/api/v1/argument_map/", params={"limit": 2, "cursor": first_page["next_cursor"]}).json()
+    assert [item["id"] for item in second_page["items"]] == ["1"]
+    assert second_page["next_cursor"] is None
+
+    assert client.get("/api/v1/argument_map/", params={"cursor": "invalide"}).status_code == 400
+
+def test_get_argument_map_revalidates_without_loading_the_map(client, async_session_factory, valid_xml):
+    """
+    Vérifie que les lectures portent un ETag et qu'un If-None-Match valide renvoie 304 sans charger la carte :
+    seule sa version est lue en base, et aucune requête SQL avec un backend partagé.
+    """
+    from sqlalchemy import event
+    from app.main import app
+    from app.services.response_cache_service import get_response_cache, ResponseCache, InMemoryCacheBackend
+
+    def read_twice(map_uuid, etag):
+        queries = []
+        engine = async_session_factory.kw["bind"].sync_engine
+        listener = lambda *args: queries.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            not_modified = client.get(f"/api/v1/argument_map/{map_uuid}", headers={"If-None-Match": etag})
+            cached = client.get(f"/api/v1/argument_map/{map_uuid}")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert cached.status_code == 200
+        return cached, queries
+
+    local = ResponseCache(max_entries=100, ttl_seconds=60)
+    app.dependency_overrides[get_response_cache] = lambda: local
+    created = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+    first = client.get(f"/api/v1/argument_map/{created['uuid']}")
+    etag = first.headers["etag"]
+    assert etag == f'"{created["uuid"]}-v1"'
+    cached, queries = read_twice(created["uuid"], etag)
+    assert cached.json() == first.json()
+    assert len(queries) == 2 and all(query.startswith("SELECT argument_maps.version \nFROM argument_maps") for query in queries)
+
+    shared = ResponseCache(max_entries=100, ttl_seconds=60, backend=InMemoryCacheBackend())
+    app.dependency_overrides[get_response_cache] = lambda: shared
+    client.get(f"/api/v1/argument_map/{created['uuid']}")
+    cached, queries = read_twice(created["uuid"], etag)
+    assert cached.json() == first.json()
+    assert queries == []
+
+def test_import_xml_summary_mode_omits_xml(client, valid_xml):
+    """
+    Vérifie que les modes 'summary' et 'parsed' ne renvoient pas le XML importé.
+    """
+    summary = client.post("/api/v1/argument_map/import_xml/", params={"response_mode": "summary"}, json={"xml_content": valid_xml}).json()
+    assert set(summary) == {"id", "uuid", "summary"}
+    assert summary["summary"] == {"statements": 2, "relationships": 1, "evidence": 0}
+
+    parsed = client.post("/api/v1/argument_map/import_xml/", params={"response_mode": "parsed"}, json={"xml_content": valid_xml}).json()
+    assert "xml_content" not in parsed
+    assert "source_xml" not in parsed["parsed_data"]
+    assert [stmt["external_id"] for stmt in parsed["parsed_data"]["statements"]] == ["p1", "c1"]
+
+def test_metrics_endpoint_exposes_stage_latencies(client, valid_xml):
+    """
+    Vérifie que /metrics expose les durées par étape et les échecs de validation.
+    """
+    client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml})
+    client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml.replace('to="c1"', 'to="c2"')})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    for stage in ("xml_parse", "xsd_validation", "business_rules", "xml_extract", "db_store", "db_commit"):
+        assert f'argument_map_stage_duration_seconds_count{{stage="{stage}"}}' in body
+    assert 'xml_validation_failures_total{stage="business_rules"}' in body
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/argument_map/import_xml/",status="200"}' in body
+
+def test_cross_reference_candidates_suggest_near_duplicates(client, valid_xml):
+    """
+    Vérifie les suggestions de références croisées entre deux cartes contenant les mêmes statements.
+    """
+    first = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+    second = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+
+    body = client.get(f"/api/v1/argument_map/{first['uuid']}/cross_references/candidates").json()
+    assert {(item["source_external_id"], item["target_external_id"]) for item in body["candidates"]} == {("p1", "p1"), ("c1", "c1")}
+    assert {item["target_map_uuid"] for item in body["candidates"]} == {second["uuid"]}
+    assert all(item["similarity"] == 1.0 for item in body["candidates"])
+
+    missing = client.get("/api/v1/argument_map/00000000-0000-0000-0000-000000000000/cross_references/candidates")
+    assert missing.status_code == 404
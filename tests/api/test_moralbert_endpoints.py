@@ -0,0 +1,50 @@
+# Tests for MoralBERT API endpoints
+import pytest
+
+@pytest.mark.asyncio
+async def test_import_moralbert_scores_streams_progress(client, async_session_factory, parsed_data):
+    """
+    Vérifie l'import de scores MoralBERT en JSONL : événements de progression NDJSON, erreurs par ligne, format refusé.
+    """
+    import json
+    import httpx
+    from sqlalchemy import select
+    from app.database.models import Statement
+    from app.repositories.argument_map_repository import AsyncArgumentMapRepository
+
+    # Carte et requêtes sur la boucle d'événements du test, celle de la base en mémoire
+    async with async_session_factory() as session:
+        await AsyncArgumentMapRepository(session, bulk_insert=True).create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+        uuids = [str(value) for value in (await session.execute(select(Statement.uuid).order_by(Statement.id))).scalars()]
+    lines = [json.dumps({"statement_uuid": statement_uuid, "care_harm_score": 0.5}) for statement_uuid in uuids]
+    lines.append(json.dumps({"statement_uuid": uuids[0], "care_harm_score": 2}))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=client.app), base_url="http://testserver") as async_client:
+        response = await async_client.post(
+            "/api/v1/moralbert/scores/import",
+            content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        unsupported = await async_client.post("/api/v1/moralbert/scores/import", content="x", headers={"Content-Type": "application/xml"})
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["progress", "complete"]
+    rows = len(uuids) + 1
+    assert (events[-1]["rows_read"], events[-1]["rows_upserted"], events[-1]["rows_failed"]) == (rows, len(uuids), 1)
+    assert events[-1]["errors"][0]["line"] == rows
+    assert unsupported.status_code == 415
+
+def test_import_moralbert_scores_refuses_large_bodies(client, monkeypatch):
+    """
+    Vérifie qu'un corps plus grand que MORALBERT_INGEST_MAX_BODY_BYTES est refusé (413), annoncé ou non par Content-Length.
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MORALBERT_INGEST_MAX_BODY_BYTES", 10)
+    announced = client.post("/api/v1/moralbert/scores/import", content="x" * 11, headers={"Content-Type": "text/csv"})
+    assert announced.status_code == 413
+
+    chunked = client.post("/api/v1/moralbert/scores/import", content=iter([b"x" * 6, b"x" * 6]), headers={"Content-Type": "text/csv"})
+    assert chunked.status_code == 413
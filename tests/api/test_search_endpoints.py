@@ -0,0 +1,23 @@
+# Tests for search API endpoints
+
+def test_search_statements_returns_ranked_highlighted_hits(client, valid_xml):
+    """
+    Vérifie la recherche plein texte : filtres par carte et par type, extraits surlignés, réindexation après mise à jour.
+    """
+    first = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml}).json()
+    second = client.post("/api/v1/argument_map/import_xml/", json={"xml_content": valid_xml.replace("Premise 1", "Another premise")}).json()
+
+    body = client.get("/api/v1/search/statements", params={"q": "premise"}).json()
+    assert {item["argument_map_uuid"] for item in body["items"]} == {first["uuid"], second["uuid"]}
+    assert body["items"][0]["snippet"].lower().count("<mark>premise</mark>") == 1
+
+    filtered = client.get("/api/v1/search/statements", params={"q": "premise", "map_uuid": second["uuid"]}).json()
+    assert [item["statement_text"] for item in filtered["items"]] == ["Another premise"]
+    conclusions = client.get("/api/v1/search/statements", params={"q": "conclusion", "statement_type": "conclusion"}).json()
+    assert len(conclusions["items"]) == 2
+
+    client.put(f"/api/v1/argument_map/{first['uuid']}", json={"xml_content": valid_xml.replace("Premise 1", "Hypothesis")})
+    updated = client.get("/api/v1/search/statements", params={"q": "hypothesis"}).json()
+    assert [item["argument_map_uuid"] for item in updated["items"]] == [first["uuid"]]
+
+    assert client.get("/api/v1/search/statements", params={"q": ""}).status_code == 422
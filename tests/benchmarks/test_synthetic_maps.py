@@ -0,0 +1,44 @@
+# Tests for the synthetic argument map generator and the benchmark comparison
+import pytest
+from benchmarks.compare import compare
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.services.xml_parsing_service import XMLParsingService
+from app.services.xml_validation_service import XMLValidationService
+
+@pytest.mark.parametrize("shape", [
+    {},
+    {"fan_out": 2, "max_depth": 3},
+    {"fan_out": 4, "linked_group_ratio": 1.0, "evidence_density": 0.5},
+])
+def test_generated_maps_are_valid(shape):
+    """
+    Vérifie que les cartes générées respectent le XSD et les règles métier, quelle que soit leur forme.
+    """
+    xml_content = generate_argument_map_xml(200, **shape)
+
+    is_valid, errors = XMLValidationService().validate_xml(xml_content)
+
+    assert is_valid, errors
+
+def test_generator_shape_parameters():
+    """
+    Vérifie la profondeur maximale et les groupes de prémisses liées.
+    """
+    parsed_data = XMLParsingService().parse_xml(generate_argument_map_xml(500, fan_out=2, max_depth=3, linked_group_ratio=1.0))
+
+    assert len(parsed_data["statements"]) == 500
+    assert max(stmt["depth"] for stmt in parsed_data["statements"]) == 3
+    groups = {rel["convergence_group_id"] for rel in parsed_data["relationships"]}
+    assert None not in groups
+    assert len(groups) == 7  # Every node above the depth limit: 1 + 2 + 4
+
+def test_compare_flags_regressions():
+    """
+    Vérifie la détection des régressions au-delà du seuil.
+    """
+    baseline = {("parse_xml", None, 1000): 10.0, ("validate_xml", "native", 1000): 10.0}
+    candidate = {("parse_xml", None, 1000): 10.5, ("validate_xml", "native", 1000): 13.0, ("parse_xml", None, 10): 1.0}
+
+    rows = compare(baseline, candidate, threshold=0.1)
+
+    assert [(row["stage"], row["regression"]) for row in rows] == [("parse_xml", False), ("validate_xml", True)]
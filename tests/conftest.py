@@ -0,0 +1,108 @@
+import os
+
+# Settings are instantiated at import time: provide test defaults before any app import
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("OPENAI_MODEL_NAME", "gpt-test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+def _argument_map_tables():
+    from app.database.models import (
+        ArgumentMap, ArgumentMapVersion, Statement, StatementRelationship, Evidence, TransformJob, MoralBERTScore
+    )
+    return [
+        ArgumentMap.__table__, ArgumentMapVersion.__table__, Statement.__table__,
+        StatementRelationship.__table__, Evidence.__table__, TransformJob.__table__, MoralBERTScore.__table__
+    ]
+
+@pytest.fixture
+def valid_xml():
+    """
+    Argument map XML (one premise supporting a conclusion) that passes every validation stage.
+    """
+    return """<arg:argument_map xmlns:arg="http://example.com/argument_map">
+    <arg:title>Test Map</arg:title>
+    <arg:statements>
+        <arg:premise id="p1">Premise 1</arg:premise>
+        <arg:conclusion id="c1">Conclusion</arg:conclusion>
+    </arg:statements>
+    <arg:relationships>
+        <arg:support from="p1" to="c1"/>
+    </arg:relationships>
+</arg:argument_map>"""
+
+@pytest.fixture
+def parsed_data():
+    """
+    Parsed argument map (statements, relationships, evidence) as handed to the repositories.
+    """
+    return {
+        "title": "Test Map",
+        "description": "Test Description",
+        "source_xml": "<argument_map/>",
+        "statements": [
+            {"external_id": "p1", "statement_text": "Premise 1", "statement_type": "premise", "path": "c1.p1", "depth": 1},
+            {"external_id": "p2", "statement_text": "Premise 2", "statement_type": "premise", "path": "c1.p2", "depth": 1},
+            {"external_id": "c1", "statement_text": "Conclusion", "statement_type": "conclusion", "path": "c1", "depth": 0},
+        ],
+        "relationships": [
+            {"from_external_id": "p1", "to_external_id": "c1", "relationship_type": "support",
+             "convergence_group_id": "6ba7b810-9dad-11d1-80b4-00c04fd430c8"},
+            {"from_external_id": "p2", "to_external_id": "c1", "relationship_type": "oppose"},
+        ],
+        "evidence": [
+            {"external_id": "e1", "title": "Evidence Title", "source_type": "Article", "source_name": "",
+             "url": "", "description": "", "credibility_rating": 0.8},
+        ],
+    }
+
+@pytest.fixture
+def db_session():
+    """
+    Session on an in-memory SQLite database holding the argument map and job tables.
+    """
+    from app.database.db import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=_argument_map_tables())
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+@pytest_asyncio.fixture
+async def async_session_factory():
+    """
+    Async session factory on a single shared in-memory SQLite connection holding the argument map and job tables.
+    """
+    from app.database.db import Base
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(lambda sync_connection: Base.metadata.create_all(sync_connection, tables=_argument_map_tables()))
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest.fixture
+def client(async_session_factory):
+    """
+    TestClient whose endpoints use the in-memory async database.
+    """
+    from fastapi.testclient import TestClient
+    from app.database.db import get_async_session_factory
+    from app.main import app
+    from app.services.similarity_service import get_statement_similarity_index
+    from app.services.version_store_service import get_version_store
+
+    # Map IDs restart with each database: drop the process-wide cache of reconstructed versions
+    get_version_store.cache_clear()
+    # Per-organization sync times of the similarity index do not carry over to a new database
+    get_statement_similarity_index.cache_clear()
+    app.dependency_overrides[get_async_session_factory] = lambda: async_session_factory
+    yield TestClient(app)
+    app.dependency_overrides.clear()
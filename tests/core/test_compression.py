@@ -0,0 +1,70 @@
+# Tests for the response compression middleware
+import gzip
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware, select_encoding
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse("x" * 1000, headers={"ETag": '"m1-v1"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("x" * 10)
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for _ in range(3):
+                yield "y" * 500 + "\n"
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+def test_select_encoding_honours_preferences():
+    """
+    Vérifie la négociation de l'encodage (brotli préféré, q=0 exclu).
+    """
+    assert select_encoding("gzip, br") == "br"
+    assert select_encoding("gzip, br;q=0") == "gzip"
+    assert select_encoding("identity") is None
+    assert select_encoding(None) is None
+
+def test_large_responses_are_compressed():
+    """
+    Vérifie que les grandes réponses sont compressées et que l'ETag devient faible.
+    """
+    client = _app()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"m1-v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < 1000
+    assert response.text == "x" * 1000
+
+def test_small_and_ndjson_responses_are_not_compressed():
+    """
+    Vérifie que les petites réponses et les flux NDJSON ne sont pas compressés.
+    """
+    client = _app()
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    stream = client.get("/stream", headers={"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in stream.headers
+    assert len(stream.text.splitlines()) == 3
+
+def test_gzip_payload_is_valid():
+    """
+    Vérifie que le corps compressé est du gzip valide.
+    """
+    client = _app()
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw) == b"x" * 1000
@@ -0,0 +1,94 @@
+# Tests for the queue-based logging setup
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueListener
+from app.core.logging import JSONFormatter, NonBlockingQueueHandler, RateLimitedLogger
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread().name)
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+def test_json_formatter_includes_extra_fields_and_exception():
+    """
+    Vérifie que le format JSON produit un objet par ligne avec les champs `extra` et la trace d'exception.
+    """
+    logger = logging.getLogger("tests.json")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logger.makeRecord("tests.json", logging.ERROR, __file__, 1, "Échec %s", ("import",), sys.exc_info(), extra={"map_uuid": "abc"})
+
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "tests.json"
+    assert entry["message"] == "Échec import"
+    assert entry["map_uuid"] == "abc"
+    assert "ValueError: boom" in entry["exception"]
+
+def test_queue_handler_hands_records_to_listener_thread():
+    """
+    Vérifie que les handlers s'exécutent sur le thread du listener, et non sur le thread appelant.
+    """
+    log_queue = queue.Queue(maxsize=100)
+    target = ListHandler()
+    listener = QueueListener(log_queue, target)
+    logger = _logger("tests.queue", NonBlockingQueueHandler(log_queue))
+    listener.start()
+    try:
+        values = ["a"]
+        logger.info("values=%s", values)
+        values.append("b")  # Les arguments sont fusionnés au moment de l'appel
+    finally:
+        listener.stop()
+
+    assert [record.getMessage() for record in target.records] == ["values=['a']"]
+    assert target.threads[0] != threading.current_thread().name
+
+def test_queue_handler_drops_records_when_queue_is_full():
+    """
+    Vérifie qu'une file pleine ne bloque pas l'appelant : les enregistrements en trop sont comptés et abandonnés.
+    """
+    log_queue = queue.Queue(maxsize=2)
+    handler = NonBlockingQueueHandler(log_queue)
+    logger = _logger("tests.full", handler)
+
+    for index in range(5):
+        logger.warning("record %d", index)
+
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_rate_limited_logger_reports_suppressed_records():
+    """
+    Vérifie la limite par clé et intervalle, et le décompte des messages supprimés dans la fenêtre suivante.
+    """
+    now = [0.0]
+    target = ListHandler()
+    rate_limited = RateLimitedLogger(_logger("tests.rate", target), interval_seconds=10, burst=2, clock=lambda: now[0])
+
+    emitted = [rate_limited.warning("validation", "failure %d", index) for index in range(5)]
+    assert emitted == [True, True, False, False, False]
+    assert rate_limited.warning("other", "other key")
+
+    now[0] = 10.0
+    assert rate_limited.warning("validation", "failure %d", 5)
+
+    messages = [record.getMessage() for record in target.records]
+    assert messages == ["failure 0", "failure 1", "other key", "failure 5 (3 similar messages suppressed)"]
+    assert target.records[-1].funcName == "test_rate_limited_logger_reports_suppressed_records"
@@ -0,0 +1,30 @@
+# Tests for the Prometheus-format metrics
+from app.core.metrics import MetricsRegistry
+
+def test_registry_renders_prometheus_text_format():
+    """
+    Vérifie le rendu des compteurs, jauges et histogrammes au format texte Prometheus.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("status",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    latency = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+
+    requests.labels("200").inc()
+    requests.labels("200").inc(2)
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    latency.labels("parse").observe(0.05)
+    latency.labels("parse").observe(0.5)
+    latency.labels("parse").observe(5)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{status="200"} 3' in lines
+    assert "in_flight 1" in lines
+    assert 'latency_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{stage="parse"} 5.55' in lines
+    assert 'latency_seconds_count{stage="parse"} 3' in lines
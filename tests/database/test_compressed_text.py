@@ -0,0 +1,48 @@
+# Tests for the compressed, deferred source_xml column and its migration
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import InvalidRequestError
+from app.database.models import ArgumentMap
+from app.database.migrate_source_xml import compress_rows
+from app.database.types import COMPRESSED_PREFIX, decompress_text
+
+SOURCE_XML = "<argument_map>" + "<statement>Texte répété</statement>" * 200 + "</argument_map>"
+
+def test_source_xml_is_stored_compressed_and_deferred(db_session):
+    """
+    Vérifie que le XML est compressé en base, relu à l'identique, et jamais chargé avec la carte.
+    """
+    db_session.add(ArgumentMap(title="Carte", source_xml=SOURCE_XML))
+    db_session.commit()
+    db_session.expunge_all()
+
+    stored = db_session.execute(text("SELECT source_xml FROM argument_maps")).scalar()
+    assert stored.startswith(COMPRESSED_PREFIX)
+    assert len(stored) < len(SOURCE_XML.encode("utf-8")) / 10
+    assert db_session.execute(select(ArgumentMap.source_xml)).scalar() == SOURCE_XML
+
+    argument_map = db_session.execute(select(ArgumentMap)).scalars().one()
+    assert "source_xml" not in argument_map.__dict__
+    with pytest.raises(InvalidRequestError):
+        argument_map.source_xml
+
+def test_migration_compresses_legacy_rows_once(db_session):
+    """
+    Vérifie que la migration compresse le XML brut (texte ou octets UTF-8) et ignore les lignes déjà compressées.
+    """
+    connection = db_session.connection()
+    connection.execute(text("INSERT INTO argument_maps (id, title, source_xml) VALUES (1, 'texte', :xml)"), {"xml": SOURCE_XML})
+    connection.execute(text("INSERT INTO argument_maps (id, title, source_xml) VALUES (2, 'octets', :xml)"), {"xml": SOURCE_XML.encode("utf-8")})
+    connection.execute(text("INSERT INTO argument_maps (id, title, source_xml) VALUES (3, 'vide', NULL)"))
+    db_session.commit()
+    # Les valeurs non migrées restent lisibles
+    assert db_session.execute(select(ArgumentMap.source_xml).where(ArgumentMap.id == 1)).scalar() == SOURCE_XML
+
+    engine = db_session.get_bind()
+    assert compress_rows(engine, batch_size=2) == 2
+    assert compress_rows(engine, batch_size=2) == 0
+
+    stored = db_session.execute(text("SELECT source_xml FROM argument_maps ORDER BY id")).scalars().all()
+    assert [value.startswith(COMPRESSED_PREFIX) for value in stored[:2]] == [True, True]
+    assert stored[2] is None
+    assert [decompress_text(value) for value in stored[:2]] == [SOURCE_XML, SOURCE_XML]
@@ -0,0 +1,357 @@
+import pytest
+from sqlalchemy import select
+from app.database.models import Statement, StatementRelationship, Evidence
+from app.repositories.argument_map_repository import ArgumentMapRepository, AsyncArgumentMapRepository
+
+def _snapshot(db_session, argument_map_id):
+    statements = db_session.execute(
+        select(Statement.id, Statement.external_id, Statement.statement_type, Statement.path, Statement.depth)
+        .where(Statement.argument_map_id == argument_map_id)
+    ).all()
+    external_ids = {row.id: row.external_id for row in statements}
+    relationships = db_session.execute(
+        select(StatementRelationship.from_statement_id, StatementRelationship.to_statement_id,
+               StatementRelationship.relationship_type, StatementRelationship.convergence_group_id)
+        .where(StatementRelationship.argument_map_id == argument_map_id)
+    ).all()
+    evidence = db_session.execute(
+        select(Evidence.external_id, Evidence.title, Evidence.credibility_rating)
+        .where(Evidence.argument_map_id == argument_map_id)
+    ).all()
+    return (
+        sorted((row.external_id, row.statement_type, str(row.path), row.depth) for row in statements),
+        sorted((external_ids[row[0]], external_ids[row[1]], row[2], row[3]) for row in relationships),
+        sorted(tuple(row) for row in evidence),
+    )
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_create_argument_map_persists_children(db_session, bulk_insert, parsed_data):
+    """
+    Vérifie que les modes ORM et bulk enregistrent les mêmes statements, relations et preuves.
+    """
+    repository = ArgumentMapRepository(db_session, bulk_insert=bulk_insert)
+    argument_map = repository.create_argument_map(parsed_data, organization_id=None, creator_id=None)
+    db_session.commit()
+
+    statements, relationships, evidence = _snapshot(db_session, argument_map.id)
+    assert statements == [
+        ("c1", "conclusion", "c1", 0),
+        ("p1", "premise", "c1.p1", 1),
+        ("p2", "premise", "c1.p2", 1),
+    ]
+    assert [rel[:3] for rel in relationships] == [("p1", "c1", "support"), ("p2", "c1", "oppose")]
+    assert str(relationships[0][3]) == "6ba7b810-9dad-11d1-80b4-00c04fd430c8"
+    assert evidence == [("e1", "Evidence Title", 0.8)]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk_insert", [False, True])
+async def test_async_create_argument_map_persists_children(async_session_factory, bulk_insert, parsed_data):
+    """
+    Vérifie que le repository async enregistre la carte et ses enfants.
+    """
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=bulk_insert)
+        argument_map = await repository.create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+
+        snapshot = await session.run_sync(lambda sync_session: _snapshot(sync_session, argument_map.id))
+        fetched = await repository.get_argument_map(argument_map.id)
+
+    statements, relationships, evidence = snapshot
+    assert [stmt[0] for stmt in statements] == ["c1", "p1", "p2"]
+    assert [rel[:3] for rel in relationships] == [("p1", "c1", "support"), ("p2", "c1", "oppose")]
+    assert evidence == [("e1", "Evidence Title", 0.8)]
+    assert fetched.title == "Test Map"
+
+SUBTREE_DATA = {
+    "title": "Subtree Map",
+    "statements": [
+        {"external_id": "c1", "statement_text": "Conclusion", "statement_type": "conclusion", "path": "c1", "depth": 0},
+        {"external_id": "p_1", "statement_text": "Premise 1", "statement_type": "premise", "path": "c1.p_1", "depth": 1},
+        {"external_id": "p11", "statement_text": "Premise 11", "statement_type": "premise", "path": "c1.p11", "depth": 1},
+        {"external_id": "p2", "statement_text": "Premise 2", "statement_type": "premise", "path": "c1.p_1.p2", "depth": 2},
+        {"external_id": "p3", "statement_text": "Premise 3", "statement_type": "premise", "path": "c1.p_1.p2.p3", "depth": 3},
+    ],
+    "relationships": [
+        {"from_external_id": "p_1", "to_external_id": "c1", "relationship_type": "support"},
+        {"from_external_id": "p11", "to_external_id": "c1", "relationship_type": "support"},
+        {"from_external_id": "p2", "to_external_id": "p_1", "relationship_type": "support"},
+        {"from_external_id": "p3", "to_external_id": "p2", "relationship_type": "support"},
+    ],
+    "evidence": [],
+}
+
+@pytest.mark.asyncio
+async def test_get_argument_map_with_children_uses_constant_queries(async_session_factory, parsed_data):
+    """
+    Vérifie que la lecture complète charge statements, relations et preuves sans chargement paresseux.
+    """
+    from sqlalchemy import event
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True)
+        argument_map = await repository.create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+
+    statements_seen = []
+    engine = async_session_factory.kw["bind"].sync_engine
+    listener = lambda *args: statements_seen.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        async with async_session_factory() as session:
+            fetched = await AsyncArgumentMapRepository(session).get_argument_map_with_children(argument_map.uuid)
+            external_ids = sorted(statement.external_id for statement in fetched.statements)
+            relationship_count = len(fetched.statement_relationships)
+            evidence_count = len(fetched.evidences)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert external_ids == ["c1", "p1", "p2"]
+    assert relationship_count == 2
+    assert evidence_count == 1
+    assert len(statements_seen) == 4
+    assert "source_xml" not in statements_seen[0]
+
+@pytest.mark.asyncio
+async def test_get_statement_subtree_filters_by_path_and_depth(async_session_factory):
+    """
+    Vérifie que la branche ne contient que les descendants du statement racine, dans la limite de profondeur.
+    """
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True)
+        argument_map = await repository.create_argument_map(SUBTREE_DATA, organization_id=None, creator_id=None)
+        await session.commit()
+
+        root = await repository.get_statement(argument_map.uuid, "p_1")
+        statements, relationships = await repository.get_statement_subtree(root)
+        limited_statements, limited_relationships = await repository.get_statement_subtree(root, max_depth=1)
+
+    assert [statement.external_id for statement in statements] == ["p_1", "p2", "p3"]
+    assert len(relationships) == 2
+    assert [statement.external_id for statement in limited_statements] == ["p_1", "p2"]
+    assert len(limited_relationships) == 1
+
+@pytest.mark.asyncio
+async def test_list_argument_maps_paginates_with_keyset_cursor(async_session_factory, parsed_data):
+    """
+    Vérifie que la pagination par curseur parcourt toutes les cartes, de la plus récente à la plus ancienne.
+    """
+    from datetime import datetime
+    from sqlalchemy import update
+    from app.database.models import ArgumentMap
+    from app.repositories.argument_map_repository import encode_cursor, decode_cursor
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True)
+        for index in range(5):
+            await repository.create_argument_map({**parsed_data, "title": f"Map {index}"}, organization_id=None, creator_id=None)
+        # Two maps share the same creation time: the id breaks the tie
+        await session.execute(update(ArgumentMap).where(ArgumentMap.id.in_([2, 3])).values(created_at=datetime(2024, 1, 1)))
+        await session.commit()
+
+        titles, cursor = [], None
+        while True:
+            rows = await repository.list_argument_maps(limit=2, cursor=cursor)
+            titles.extend(row.title for row in rows[:2])
+            if len(rows) <= 2:
+                break
+            cursor = decode_cursor(encode_cursor(rows[1].created_at, rows[1].id))
+
+    assert titles == ["Map 4", "Map 3", "Map 0", "Map 2", "Map 1"]
+    assert "source_xml" not in rows[0]._fields
+
+@pytest.mark.asyncio
+async def test_update_argument_map_writes_only_the_diff(async_session_factory, parsed_data):
+    """
+    Vérifie que la mise à jour n'écrit que les différences, incrémente la version et l'historise.
+    """
+    import copy
+    from app.database.models import ArgumentMapVersion
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True)
+        argument_map = await repository.create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+
+    # p2 modifié, p1 supprimé (avec sa relation), p3 ajouté sous p2, preuve inchangée
+    new_data = copy.deepcopy(parsed_data)
+    new_data["source_xml"] = "<argument_map version='2'/>"
+    new_data["statements"] = [
+        {"external_id": "p2", "statement_text": "Premise 2 (révisée)", "statement_type": "premise", "path": "c1.p2", "depth": 1},
+        {"external_id": "c1", "statement_text": "Conclusion", "statement_type": "conclusion", "path": "c1", "depth": 0},
+        {"external_id": "p3", "statement_text": "Premise 3", "statement_type": "premise", "path": "c1.p2.p3", "depth": 2},
+    ]
+    new_data["relationships"] = [
+        {"from_external_id": "p2", "to_external_id": "c1", "relationship_type": "oppose"},
+        {"from_external_id": "p3", "to_external_id": "p2", "relationship_type": "support"},
+    ]
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session)
+        updated, changes = await repository.update_argument_map(argument_map.uuid, new_data)
+        await session.commit()
+        snapshot = await session.run_sync(lambda sync_session: _snapshot(sync_session, argument_map.id))
+        versions = (await session.execute(
+            select(ArgumentMapVersion.version, ArgumentMapVersion.source_xml).order_by(ArgumentMapVersion.version)
+        )).all()
+
+    assert updated.version == 2
+    assert (changes.statements_inserted, changes.statements_updated, changes.statements_deleted) == (1, 1, 1)
+    assert (changes.relationships_inserted, changes.relationships_updated, changes.relationships_deleted) == (1, 0, 1)
+    assert (changes.evidence_inserted, changes.evidence_updated, changes.evidence_deleted) == (0, 0, 0)
+    statements, relationships, evidence = snapshot
+    assert statements == [("c1", "conclusion", "c1", 0), ("p2", "premise", "c1.p2", 1), ("p3", "premise", "c1.p2.p3", 2)]
+    assert [rel[:3] for rel in relationships] == [("p2", "c1", "oppose"), ("p3", "p2", "support")]
+    assert evidence == [("e1", "Evidence Title", 0.8)]
+    assert [tuple(row) for row in versions] == [(1, "<argument_map/>"), (2, "<argument_map version='2'/>")]
+
+    # Le même XML ne change rien
+    async with async_session_factory() as session:
+        unchanged, no_changes = await AsyncArgumentMapRepository(session).update_argument_map(argument_map.uuid, new_data)
+    assert unchanged.version == 2
+    assert no_changes.row_count == 0
+
+@pytest.mark.asyncio
+async def test_update_argument_map_detects_concurrent_update(async_session_factory, parsed_data):
+    """
+    Vérifie qu'une mise à jour concurrente (version déjà incrémentée) ou sur une version attendue dépassée est refusée.
+    """
+    from sqlalchemy import update
+    from app.database.models import ArgumentMap
+    from app.repositories.argument_map_repository import StaleMapVersionError
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True)
+        argument_map = await repository.create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session)
+        original_execute = session.execute
+
+        async def execute_with_concurrent_write(statement, *args, **kwargs):
+            # Une autre transaction incrémente la version juste avant la mise à jour conditionnelle
+            if getattr(statement, "is_update", False) and statement.table.name == "argument_maps":
+                await original_execute(update(ArgumentMap).where(ArgumentMap.id == argument_map.id).values(version=5))
+            return await original_execute(statement, *args, **kwargs)
+
+        session.execute = execute_with_concurrent_write
+        with pytest.raises(StaleMapVersionError):
+            await repository.update_argument_map(argument_map.uuid, {**parsed_data, "source_xml": "<argument_map v='2'/>"})
+
+    # Version attendue (If-Match) déjà dépassée : refus, même si la carte n'est plus modifiée entre-temps
+    async with async_session_factory() as session:
+        await session.execute(update(ArgumentMap).where(ArgumentMap.id == argument_map.id).values(version=2))
+        await session.commit()
+        repository = AsyncArgumentMapRepository(session)
+        with pytest.raises(StaleMapVersionError):
+            await repository.update_argument_map(argument_map.uuid, {**parsed_data, "source_xml": "<argument_map v='3'/>"}, expected_version=1)
+
+@pytest.mark.asyncio
+async def test_version_history_is_stored_as_snapshots_and_deltas(async_session_factory, parsed_data):
+    """
+    Vérifie que l'historique est stocké en instantanés et deltas compressés, et que chaque version est reconstruite.
+    """
+    from app.database.models import ArgumentMapVersion
+    from app.services.version_store_service import VersionStore
+
+    def source(version):
+        statements = "".join(f"<statement id='s{index}'>Statement {index} v{version if index == version else 0}</statement>" for index in range(200))
+        return f"<argument_map>{statements}</argument_map>"
+
+    store = VersionStore(snapshot_interval=3, max_delta_ratio=0.5, cache_max_entries=0)
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, bulk_insert=True, version_store=store)
+        argument_map = await repository.create_argument_map({**parsed_data, "source_xml": source(1)}, organization_id=None, creator_id=None)
+        for version in range(2, 6):
+            await repository.update_argument_map(argument_map.uuid, {**parsed_data, "source_xml": source(version)})
+        await session.commit()
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, version_store=store)
+        rows = (await session.execute(
+            select(ArgumentMapVersion.version, ArgumentMapVersion.storage, ArgumentMapVersion.base_version, ArgumentMapVersion.source_xml)
+            .order_by(ArgumentMapVersion.version)
+        )).all()
+        sources = [await repository.get_version_source(argument_map.uuid, version) for version in range(1, 6)]
+        listed = await repository.list_versions(argument_map.uuid)
+        missing = await repository.get_version_source(argument_map.uuid, 6)
+
+    assert [tuple(row) for row in rows] == [
+        (1, "snapshot", 1, None), (2, "delta", 1, None), (3, "delta", 1, None), (4, "snapshot", 4, None), (5, "delta", 4, None)
+    ]
+    assert sources == [source(version) for version in range(1, 6)]
+    assert [row.version for row in listed] == [5, 4, 3, 2, 1]
+    assert all(row.stored_bytes < len(source(5)) / 4 for row in listed)
+    assert missing is None
+
+def test_statement_search_query_uses_text_search_index():
+    """
+    Vérifie la requête PostgreSQL : filtre @@ sur la colonne indexée, classement ts_rank_cd, extrait sur la seule page.
+    """
+    import uuid
+    from sqlalchemy.dialects import postgresql
+    from app.repositories.argument_map_repository import build_statement_search_query
+
+    sql = str(build_statement_search_query("émissions", organization_id=1, statement_type="premise", map_uuid=uuid.uuid4(), limit=5)
+              .compile(dialect=postgresql.dialect()))
+    assert "statements.search_vector @@ websearch_to_tsquery" in sql
+    assert "ts_rank_cd(statements.search_vector" in sql
+    assert "argument_maps.organization_id = " in sql and "statements.statement_type = " in sql
+    # ts_headline n'est calculé que sur la page sélectionnée (sous-requête limitée)
+    assert sql.index("ts_headline") < sql.index("LIMIT")
+
+
+@pytest.mark.asyncio
+async def test_similarity_index_is_synced_with_the_database(async_session_factory, parsed_data):
+    """
+    Vérifie qu'une création est mise en file pour l'index de similarité après son commit (jamais après un rollback), que
+    l'index est resynchronisé de façon incrémentale (cartes créées ailleurs, mises à jour), et que les cartes supprimées
+    sont retirées.
+    """
+    from sqlalchemy import delete
+    from app.database.models import ArgumentMap
+    from app.services.similarity_service import StatementSimilarityIndex
+
+    index = StatementSimilarityIndex(num_perm=64, bands=16, shingle_size=2)
+    async with async_session_factory() as session:
+        rolled_back = await AsyncArgumentMapRepository(session, similarity_index=index).create_argument_map(
+            parsed_data, organization_id=None, creator_id=None
+        )
+        await session.rollback()
+        indexed = await AsyncArgumentMapRepository(session, bulk_insert=True, similarity_index=index).create_argument_map(
+            parsed_data, organization_id=None, creator_id=None
+        )
+        assert index.versions() == {}
+        # Carte créée sans l'index (autre processus)
+        other = await AsyncArgumentMapRepository(session).create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+    assert index.versions() == {}
+    assert index.index_queued() == 1
+    assert index.versions() == {str(indexed.uuid): 1}
+    assert str(rolled_back.uuid) not in index.versions()
+
+    async with async_session_factory() as session:
+        repository = AsyncArgumentMapRepository(session, similarity_index=index)
+        candidates = await repository.get_cross_reference_candidates(indexed.uuid, threshold=0.5, max_per_statement=5)
+        assert {(c.source_external_id, c.target_external_id) for c in candidates} == {("p1", "p1"), ("p2", "p2"), ("c1", "c1")}
+        assert all(c.target_map_uuid == str(other.uuid) for c in candidates)
+        assert index.synced_at(None) is not None
+
+        # Synchronisation suivante : seules les cartes modifiées depuis sont relues
+        new_data = {**parsed_data, "source_xml": "<argument_map v='2'/>", "statements": [
+            {"external_id": "c1", "statement_text": "Une toute autre conclusion", "statement_type": "conclusion", "path": "c1", "depth": 0},
+        ], "relationships": []}
+        await repository.update_argument_map(other.uuid, new_data)
+        await session.commit()
+        assert await repository.get_cross_reference_candidates(indexed.uuid, threshold=0.5, max_per_statement=5) == []
+        assert index.versions()[str(other.uuid)] == 2
+
+        # Carte supprimée : retirée de l'index par la recherche de candidats
+        duplicate = await AsyncArgumentMapRepository(session).create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+        assert len(await repository.get_cross_reference_candidates(indexed.uuid, threshold=0.5, max_per_statement=5)) == 3
+        await session.execute(delete(ArgumentMap).where(ArgumentMap.id == duplicate.id))
+        await session.commit()
+        assert await repository.get_cross_reference_candidates(indexed.uuid, threshold=0.5, max_per_statement=5) == []
+        assert str(duplicate.uuid) not in index.versions()
+        assert await repository.get_cross_reference_candidates(duplicate.uuid, threshold=0.5, max_per_statement=5) is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from app.services.argument_strength_service import ArgumentStrengthService, MapStrengths
+
+def test_support_raises_and_oppose_lowers_scores():
+    """
+    Vérifie qu'un soutien augmente la force de la conclusion et qu'une opposition la diminue.
+    """
+    service = ArgumentStrengthService(damping=0.5, base_score=0.5)
+    # 1 soutient 0, 2 s'oppose à 3
+    result = service.compute([10, 11, 12, 13], [(11, 10, "support", None), (12, 13, "oppose", None)])
+
+    assert result.converged
+    np.testing.assert_allclose(result.scores, [0.75, 0.5, 0.5, 0.25])
+
+def test_weights_are_normalized_per_statement():
+    """
+    Vérifie que les relations entrantes sont pondérées par leur force et normalisées par statement.
+    """
+    service = ArgumentStrengthService(damping=0.5, base_score=0.5)
+    # 0 est soutenu par 1 (force 0.8) et contesté par 2 (force 0.2) : moyenne signée (0.8 - 0.2) * 0.5
+    result = service.compute([1, 2, 3], [(2, 1, "support", 0.8), (3, 1, "oppose", 0.2), (3, 2, "rebut", None)])
+
+    assert result.scores[0] == pytest.approx(0.5 + 0.5 * 0.6 * 0.5)
+
+def test_propagation_converges_on_cycles_and_clips_scores():
+    """
+    Vérifie la convergence sur un cycle de soutiens et que les scores restent dans [0, 1].
+    """
+    service = ArgumentStrengthService(damping=0.9, base_score=0.5)
+    result = service.compute([1, 2, 3], [(1, 2, "support", None), (2, 3, "support", None), (3, 1, "support", None)])
+
+    assert result.converged
+    np.testing.assert_allclose(result.scores, [1.0, 1.0, 1.0])
+
+def test_invalid_damping_is_rejected():
+    """
+    Vérifie qu'un amortissement hors de [0, 1) est refusé (la convergence ne serait plus garantie).
+    """
+    with pytest.raises(ValueError):
+        ArgumentStrengthService(damping=1.0)
+
+def test_strengths_are_cached_per_map_version_and_damping():
+    """
+    Vérifie le cache des forces par (carte, version, amortissement) et l'éviction des moins récemment utilisées.
+    """
+    service = ArgumentStrengthService(damping=0.5, base_score=0.5, cache_max_entries=2)
+    strengths = MapStrengths(statements=[(1, "p1")], result=service.compute([1], []))
+    service.put("a", 1, 0.5, strengths)
+    service.put("a", 2, 0.5, strengths)
+    assert service.get_cached("a", 1, 0.5) is strengths
+    assert service.get_cached("a", 1, 0.6) is None
+
+    service.put("b", 1, 0.5, strengths)
+    assert service.get_cached("a", 2, 0.5) is None
+    assert service.get_cached("a", 1, 0.5) is strengths
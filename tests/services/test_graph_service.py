@@ -0,0 +1,63 @@
+from app.services.graph_service import (
+    build_hierarchy, primary_paths, ancestor_paths, strongly_connected_components, to_csr
+)
+
+def _edges(pairs):
+    return [parent for parent, _ in pairs], [child for _, child in pairs]
+
+def test_depth_is_longest_path_and_primary_parent_is_deepest():
+    """
+    Vérifie que la profondeur est le plus long chemin depuis une racine et que le parent principal
+    est le plus profond (à égalité : plus petite clé).
+    """
+    # 0 -> 1 -> 2 -> 4, 0 -> 4, 0 -> 3 -> 5, 1 -> 5 : 4 a deux parents, 5 deux parents de même profondeur
+    sources, targets = _edges([(0, 1), (1, 2), (2, 4), (0, 4), (0, 3), (3, 5), (1, 5)])
+    hierarchy = build_hierarchy(6, sources, targets, sort_keys=["a", "b", "c", "e", "d", "f"])
+
+    assert hierarchy.depths == [0, 1, 2, 1, 3, 2]
+    assert hierarchy.parents == [-1, 0, 1, 0, 2, 1]  # 5 : parents 3 ("e") et 1 ("b") à égalité
+    assert hierarchy.cycles == []
+    assert primary_paths(hierarchy, ["a", "b", "c", "e", "d", "f"]) == ["a", "a.b", "a.b.c", "a.e", "a.b.c.d", "a.b.f"]
+
+def test_cycles_are_reported_and_still_get_paths():
+    """
+    Vérifie la détection des cycles (entrés depuis l'extérieur, sans parent extérieur, boucle sur soi)
+    et l'attribution de chemins cohérents avec les profondeurs.
+    """
+    # 0 -> 1 -> 2 -> 1 (cycle entré par 1), 2 -> 3 ; 4 -> 5 -> 4 (cycle racine) ; 6 -> 6
+    sources, targets = _edges([(0, 1), (1, 2), (2, 1), (2, 3), (4, 5), (5, 4), (6, 6)])
+    labels = ["r", "a", "b", "c", "x", "y", "s"]
+    hierarchy = build_hierarchy(7, sources, targets, sort_keys=labels)
+
+    assert sorted(hierarchy.cycles) == [[1, 2], [4, 5], [6]]
+    assert hierarchy.depths == [0, 1, 2, 3, 0, 1, 0]
+    paths = primary_paths(hierarchy, labels)
+    assert paths == ["r", "r.a", "r.a.b", "r.a.b.c", "x", "x.y", "s"]
+    assert all(path.count(".") == depth for path, depth in zip(paths, hierarchy.depths))
+
+def test_strongly_connected_components_handles_deep_graphs():
+    """
+    Vérifie que l'algorithme de Tarjan itératif supporte une très longue chaîne refermée en cycle.
+    """
+    n = 50000
+    sources = list(range(n))
+    targets = [(node + 1) % n for node in range(n)]
+    offsets, adjacency = to_csr(n, sources, targets)
+
+    components = strongly_connected_components(n, offsets, adjacency)
+    assert len(components) == 1
+    assert len(components[0]) == n
+
+def test_ancestor_paths_follow_every_parent():
+    """
+    Vérifie que les chemins via chaque parent sont produits, le chemin principal en premier, et plafonnés.
+    """
+    # Deux racines 0 et 1 soutenues par 2, lui-même soutenu par 3
+    sources, targets = _edges([(0, 2), (1, 2), (2, 3)])
+    labels = ["c1", "c2", "p", "q"]
+    hierarchy = build_hierarchy(4, sources, targets, sort_keys=labels)
+
+    paths = ancestor_paths(hierarchy, labels, sources, targets)
+    assert paths[2] == ["c1.p", "c2.p"]
+    assert paths[3] == ["c1.p.q", "c2.p.q"]
+    assert ancestor_paths(hierarchy, labels, sources, targets, max_paths=1)[3] == ["c1.p.q"]
@@ -1 +1,67 @@
 # Tests for LLM service
+import pytest
+from types import SimpleNamespace
+from app.services.llm_service import LLMService, LLMResultCache, make_cache_key
+
+XML_OUTPUT = "<argument_map><title>T</title></argument_map>"
+
+class FakeChain:
+    """Stand-in for the LCEL chain that counts LLM calls."""
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        return SimpleNamespace(content=self.content)
+
+def test_cache_key_normalizes_text():
+    """
+    Vérifie que la clé ignore les différences d'espaces mais dépend du modèle et de la version du prompt.
+    """
+    key = make_cache_key("Un  texte\n à analyser ", "gpt-a", "1")
+    assert key == make_cache_key("Un texte à analyser", "gpt-a", "1")
+    assert key != make_cache_key("Un texte à analyser", "gpt-b", "1")
+    assert key != make_cache_key("Un texte à analyser", "gpt-a", "2")
+
+def test_cache_evicts_least_recently_used_and_expires_entries():
+    now = [1000.0]
+    cache = LLMResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # "a" devient le plus récent
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "persistent_hits": 0, "entries": 1}
+
+def test_persistent_tier_survives_a_new_cache(tmp_path):
+    sqlite_path = str(tmp_path / "llm_cache.sqlite")
+    LLMResultCache(max_entries=2, ttl_seconds=60, sqlite_path=sqlite_path).set("k", XML_OUTPUT)
+
+    cache = LLMResultCache(max_entries=2, ttl_seconds=60, sqlite_path=sqlite_path)
+    assert cache.get("k") == XML_OUTPUT
+    assert cache.persistent_hits == 1
+
+@pytest.mark.asyncio
+async def test_generate_xml_cache_hit_skips_llm():
+    """
+    Vérifie qu'un texte déjà transformé est servi depuis le cache sans appeler le LLM, une fois son XML validé et mis en cache.
+    """
+    service = LLMService()
+    service.chain = FakeChain(f"Voici le XML : {XML_OUTPUT}")
+
+    first = await service.generate_xml("Un texte")
+    # Non encore validé : pas de mise en cache
+    assert await service.generate_xml("Un texte") == first
+    assert service.chain.calls == 2
+
+    service.cache_xml("Un texte", first)
+    second = await service.generate_xml("  Un   texte ")
+
+    assert first == second == XML_OUTPUT
+    assert service.chain.calls == 2
+    assert service.cache.stats()["hits"] == 1
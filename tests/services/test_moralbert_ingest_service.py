@@ -0,0 +1,112 @@
+# Tests for the bulk MoralBERT score import
+import pytest
+from sqlalchemy import select
+from app.database.models import MoralBERTScore, Statement
+from app.repositories.argument_map_repository import AsyncArgumentMapRepository
+from app.services.moralbert_ingest_service import (
+    MoralBERTIngestService, decode_lines, iter_lines, iterate, parse_score_record, detect_format
+)
+
+HEADER = "statement_uuid,care_harm_score,fairness_cheating_score,loyalty_betrayal_score,authority_subversion_score,sanctity_degradation_score"
+
+async def _statement_uuids(async_session_factory, parsed_data):
+    async with async_session_factory() as session:
+        await AsyncArgumentMapRepository(session, bulk_insert=True).create_argument_map(parsed_data, organization_id=None, creator_id=None)
+        await session.commit()
+        rows = await session.execute(select(Statement.external_id, Statement.uuid))
+        return {external_id: str(statement_uuid) for external_id, statement_uuid in rows}
+
+async def _scores(async_session_factory):
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(Statement.external_id, MoralBERTScore.care_harm_score, MoralBERTScore.sanctity_degradation_score)
+            .join(Statement, MoralBERTScore.statement_id == Statement.id)
+            .order_by(Statement.external_id)
+        )
+        return [tuple(row) for row in rows]
+
+async def _collect(generator):
+    return [item async for item in generator]
+
+def test_parse_score_record_validates_uuid_and_ranges():
+    """
+    Vérifie la validation d'une ligne : UUID obligatoire, scores entre -1 et 1, scores vides enregistrés à NULL.
+    """
+    statement_uuid, scores = parse_score_record({"statement_uuid": "6ba7b810-9dad-11d1-80b4-00c04fd430c8", "care_harm_score": "0.5", "fairness_cheating_score": ""})
+    assert str(statement_uuid) == "6ba7b810-9dad-11d1-80b4-00c04fd430c8"
+    assert scores["care_harm_score"] == 0.5 and scores["fairness_cheating_score"] is None
+
+    for record, message in [
+        ({"statement_uuid": "abc"}, "Invalid statement_uuid"),
+        ({"statement_uuid": "6ba7b810-9dad-11d1-80b4-00c04fd430c8", "care_harm_score": "1.5"}, "between -1 and 1"),
+        ({"statement_uuid": "6ba7b810-9dad-11d1-80b4-00c04fd430c8", "care_harm_score": "nan"}, "between -1 and 1"),
+        ({"statement_uuid": "6ba7b810-9dad-11d1-80b4-00c04fd430c8", "care_harm_score": "élevé"}, "Invalid care_harm_score"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            parse_score_record(record)
+
+    assert detect_format("text/csv; charset=utf-8") == "csv"
+    assert detect_format(None, "scores.NDJSON") == "jsonl"
+    assert detect_format("application/octet-stream", "scores.arrow") == "arrow"
+
+@pytest.mark.asyncio
+async def test_lines_are_decoded_incrementally():
+    """
+    Vérifie le découpage en lignes d'un flux d'octets (caractères coupés entre deux blocs) et le décodage CSV / JSONL.
+    """
+    body = f"{HEADER}\r\nu1,0.1,0.2,0.3,0.4,0.5\r\n\r\nu2,0.1\r\n".encode("utf-8")
+    chunks = [body[:7], body[7:60], body[60:]]
+    records = await _collect(decode_lines(iter_lines(iterate(chunks)), "csv"))
+    assert records[0] == (2, {"statement_uuid": "u1", "care_harm_score": "0.1", "fairness_cheating_score": "0.2",
+                              "loyalty_betrayal_score": "0.3", "authority_subversion_score": "0.4", "sanctity_degradation_score": "0.5"})
+    assert records[1][0] == 4 and isinstance(records[1][1], ValueError)
+
+    text = '{"statement_uuid": "é"}\n[1]\n'.encode("utf-8")
+    records = await _collect(decode_lines(iter_lines(iterate([text[:17], text[17:]])), "jsonl"))
+    assert records[0] == (1, {"statement_uuid": "é"})
+    assert str(records[1][1]) == "Each line must be a JSON object"
+
+@pytest.mark.asyncio
+async def test_ingest_upserts_by_chunk_and_isolates_failures(async_session_factory, parsed_data, monkeypatch):
+    """
+    Vérifie l'import par lots : lignes invalides et statements inconnus signalés, mise à jour des scores existants,
+    et poursuite de l'import après l'échec d'un lot.
+    """
+    from app.repositories.moralbert_repository import AsyncMoralBERTRepository
+
+    uuids = await _statement_uuids(async_session_factory, parsed_data)
+    service = MoralBERTIngestService(async_session_factory, chunk_size=2, max_errors=10)
+    lines = [
+        HEADER,
+        f"{uuids['p1']},0.1,0,0,0,-0.1",
+        "not-a-uuid,0,0,0,0,0",
+        f"{uuids['p2']},0.2,0,0,0,-0.2",
+        "6ba7b810-9dad-11d1-80b4-00c04fd430c8,0,0,0,0,0",
+        f"{uuids['c1']},0.3,0,0,0,",
+    ]
+    reports = await _collect(service.ingest(decode_lines(iterate(lines), "csv")))
+    report = reports[-1]
+    assert len(reports) == 3
+    assert (report.rows_read, report.rows_upserted, report.rows_failed, report.rows_duplicate, report.chunks_committed) == (5, 3, 2, 0, 3)
+    assert [error["line"] for error in report.errors] == [3, 5]
+    assert await _scores(async_session_factory) == [("c1", 0.3, None), ("p1", 0.1, -0.1), ("p2", 0.2, -0.2)]
+
+    # Réimport : le second lot échoue dès la résolution des UUID, toutes ses lignes sont comptées en échec
+    original_resolve = AsyncMoralBERTRepository.resolve_statement_ids
+    calls = []
+
+    async def failing_resolve(self, statement_uuids):
+        calls.append(len(statement_uuids))
+        if len(calls) == 2:
+            raise RuntimeError("connexion perdue")
+        return await original_resolve(self, statement_uuids)
+
+    monkeypatch.setattr(AsyncMoralBERTRepository, "resolve_statement_ids", failing_resolve)
+    lines = [HEADER, f"{uuids['p1']},0.9,0,0,0,0", f"{uuids['p1']},0.8,0,0,0,0", f"{uuids['p2']},0.9,0,0,0,0", f"{uuids['c1']},0.9,0,0,0,0"]
+    report = (await _collect(service.ingest(decode_lines(iterate(lines), "csv"))))[-1]
+    assert (report.rows_upserted, report.rows_failed, report.rows_duplicate) == (1, 2, 1)
+    assert report.rows_read == report.rows_upserted + report.rows_failed + report.rows_duplicate
+    assert (report.chunks_committed, report.chunks_failed) == (1, 1)
+    assert report.errors == [{"line": 4, "error": "Chunk of lines 4-5 not imported: connexion perdue"}]
+    # Doublon dans un lot : la dernière ligne l'emporte
+    assert await _scores(async_session_factory) == [("c1", 0.3, None), ("p1", 0.8, 0.0), ("p2", 0.2, -0.2)]
@@ -0,0 +1,78 @@
+# Tests for the versioned response cache
+from app.services.response_cache_service import ResponseCache, InMemoryCacheBackend, make_etag, etag_matches
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_bodies_are_keyed_by_version_and_variant():
+    """
+    Vérifie qu'une nouvelle version rend les réponses de l'ancienne inaccessibles.
+    """
+    cache = ResponseCache(max_entries=10, ttl_seconds=60, backend=InMemoryCacheBackend())
+    cache.set_version("m1", 1)
+    cache.set("m1", 1, "full", b"v1")
+
+    assert cache.get_version("m1") == 1
+    assert cache.get("m1", 1, "full") == b"v1"
+    assert cache.get("m1", 1, "subtree:c1:None") is None
+
+    cache.set_version("m1", 2)
+    assert cache.get("m1", 2, "full") is None
+    cache.invalidate("m1")
+    assert cache.get_version("m1") is None
+
+def test_version_pointer_is_only_kept_in_the_shared_backend():
+    """
+    Vérifie que le pointeur de version n'est jamais copié localement : une écriture d'un autre processus est vue
+    immédiatement, et sans backend la version doit être lue en base.
+    """
+    backend = InMemoryCacheBackend()
+    worker_a = ResponseCache(max_entries=10, ttl_seconds=60, backend=backend)
+    worker_b = ResponseCache(max_entries=10, ttl_seconds=60, backend=backend)
+    worker_a.set_version("m1", 1)
+    assert worker_b.get_version("m1") == 1
+
+    worker_b.set_version("m1", 2)
+    assert worker_a.get_version("m1") == 2
+    assert worker_a.stats()["entries"] == 0
+
+    local = ResponseCache(max_entries=10, ttl_seconds=60)
+    local.set_version("m1", 1)
+    assert local.get_version("m1") is None
+
+def test_lru_tier_is_bounded_and_backend_refills_it():
+    """
+    Vérifie l'éviction LRU du niveau local et la relecture depuis le backend partagé.
+    """
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(clock=clock)
+    cache = ResponseCache(max_entries=2, ttl_seconds=60, backend=backend, clock=clock)
+    for index in range(3):
+        cache.set(f"m{index}", 1, "full", f"body{index}".encode())
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get("m0", 1, "full") == b"body0"
+    assert cache.stats()["backend_hits"] == 1
+
+    # A second process sharing the backend sees the entries
+    other = ResponseCache(max_entries=2, ttl_seconds=60, backend=backend, clock=clock)
+    assert other.get("m2", 1, "full") == b"body2"
+
+    clock.now += 61
+    assert other.get("m1", 1, "full") is None
+
+def test_etag_matching():
+    """
+    Vérifie l'évaluation de If-None-Match (listes, ETags faibles et "*").
+    """
+    etag = make_etag("m1", 3)
+    assert etag == '"m1-v3"'
+    assert etag_matches('"m1-v3"', etag)
+    assert etag_matches('"other", W/"m1-v3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"m1-v2"', etag)
+    assert not etag_matches(None, etag)
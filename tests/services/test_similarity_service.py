@@ -0,0 +1,55 @@
+# Tests for the MinHash / LSH near-duplicate statement index
+from app.services.similarity_service import StatementSimilarityIndex, shingles
+
+TEXT = "Les énergies renouvelables réduisent fortement les émissions de gaz à effet de serre en Europe"
+
+def _index():
+    return StatementSimilarityIndex(num_perm=64, bands=16, shingle_size=2)
+
+def test_signature_agreement_estimates_jaccard_similarity():
+    """
+    Vérifie que la proportion de positions égales des signatures approche l'indice de Jaccard des n-grammes.
+    """
+    index = _index()
+    variant = TEXT.replace("fortement", "nettement")
+    first, second = shingles(TEXT, 2), shingles(variant, 2)
+    jaccard = len(first & second) / len(first | second)
+
+    estimate = (index.signature(TEXT) == index.signature(variant)).mean()
+    assert abs(estimate - jaccard) < 0.2
+    assert (index.signature(TEXT.upper()) == index.signature(TEXT)).all()
+    assert index.signature("!!!") is None
+    assert shingles("Un", 2) == shingles("un", 2) and len(shingles("Un", 2)) == 1
+
+def test_candidates_link_near_duplicates_of_other_maps_of_the_organization():
+    """
+    Vérifie que seuls les quasi-doublons des autres cartes de la même organisation sont suggérés.
+    """
+    index = _index()
+    index.add_map("m1", 1, 7, [(1, "p1", TEXT), (2, "p2", "Le nucléaire est une énergie pilotable")])
+    index.add_map("m2", 1, 7, [(10, "a", TEXT + " aujourd'hui"), (11, "b", "Les trains de nuit reviennent")])
+    index.add_map("m3", 1, 8, [(20, "x", TEXT)])
+    index.add_map("m4", 1, 7, [(30, "y", TEXT)])
+
+    candidates = index.candidates("m1", threshold=0.5, max_per_statement=5)
+    assert [(c.source_statement_id, c.target_map_uuid, c.target_statement_id) for c in candidates] == [(1, "m4", 30), (1, "m2", 10)]
+    assert candidates[0].similarity == 1.0
+    assert len(index.candidates("m1", threshold=0.5, max_per_statement=1)) == 1
+
+def test_maps_are_replaced_and_removed():
+    """
+    Vérifie qu'une nouvelle version d'une carte remplace l'ancienne dans l'index et qu'une carte supprimée disparaît.
+    """
+    index = _index()
+    index.add_map("m1", 1, None, [(1, "p1", TEXT)])
+    index.add_map("m2", 1, None, [(10, "a", TEXT)])
+    assert len(index.candidates("m1", 0.5, 5)) == 1
+
+    index.add_map("m2", 2, None, [(12, "a", "Un texte sans rapport avec le premier")])
+    assert index.versions() == {"m1": 1, "m2": 2}
+    assert index.candidates("m1", 0.5, 5) == []
+
+    index.add_map("m2", 3, None, [(13, "a", TEXT)])
+    index.remove_map("m2")
+    assert index.candidates("m1", 0.5, 5) == []
+    assert index._buckets.keys() == {key for key in index._band_keys(index.signature(TEXT))}
@@ -0,0 +1,56 @@
+# Tests for the in-memory statement search fallback
+from app.services.statement_search_service import InvertedIndex, StatementSearchIndex, parse_query, highlight
+
+def _index():
+    index = InvertedIndex()
+    index.add(1, "p1", "premise", "Les énergies renouvelables réduisent les émissions")
+    index.add(2, "p2", "premise", "Le nucléaire réduit les émissions, les émissions de CO2 surtout")
+    index.add(3, "c1", "conclusion", "Il faut réduire les émissions")
+    return index
+
+def test_parse_query_follows_web_search_syntax():
+    """
+    Vérifie la syntaxe de requête : mots requis, phrases entre guillemets et exclusions.
+    """
+    parsed = parse_query('Émissions "énergies renouvelables" -nucléaire')
+    assert parsed.required == ["émissions", "énergies", "renouvelables"]
+    assert parsed.excluded == ["nucléaire"]
+
+def test_search_requires_every_word_and_ranks_by_density():
+    """
+    Vérifie l'intersection des mots, les exclusions, le filtre par type et le classement par pertinence.
+    """
+    search_index = StatementSearchIndex(max_maps=10)
+    hits = search_index.search([("m1", _index())], "émissions")
+    # Le statement 2 contient deux fois le mot ; le 3, plus court, passe devant le 1
+    assert [hit.statement_id for hit in hits] == [2, 3, 1]
+    assert hits[0].snippet.count("<mark>émissions</mark>") == 2
+
+    assert [hit.statement_id for hit in search_index.search([("m1", _index())], "émissions -nucléaire")] == [3, 1]
+    assert [hit.statement_id for hit in search_index.search([("m1", _index())], "émissions", statement_type="conclusion")] == [3]
+    assert search_index.search([("m1", _index())], "émissions charbon") == []
+    assert [hit.statement_id for hit in search_index.search([("m1", _index())], "émissions", limit=1, offset=1)] == [3]
+
+def test_indexes_are_reused_until_the_map_version_changes():
+    """
+    Vérifie que l'index d'une carte n'est réutilisé que pour la même version, et la limite du nombre de cartes.
+    """
+    search_index = StatementSearchIndex(max_maps=2)
+    index = _index()
+    search_index.put("m1", 1, index)
+    assert search_index.get("m1", 1) is index
+    assert search_index.get("m1", 2) is None
+
+    search_index.put("m2", 1, InvertedIndex())
+    search_index.put("m3", 1, InvertedIndex())
+    assert search_index.get("m1", 1) is None
+
+def test_highlight_keeps_a_window_around_the_first_match():
+    """
+    Vérifie que l'extrait est centré sur le premier mot trouvé et limité en nombre de mots.
+    """
+    text = " ".join(f"mot{index}" for index in range(100)) + " cible fin"
+    snippet = highlight(text, ["cible"], max_words=10)
+    assert "<mark>cible</mark>" in snippet
+    assert len(snippet.split()) == 10
+    assert highlight("Aucun mot", ["absent"]) == "Aucun mot"
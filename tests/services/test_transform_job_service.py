@@ -0,0 +1,159 @@
+# Tests for the asynchronous transform job worker
+import pytest
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import update
+from app.database.db import async_session_scope
+from app.database.models import TransformJob
+from app.repositories.transform_job_repository import AsyncTransformJobRepository
+from app.services.argument_map_pipeline_service import ArgumentMapPipelineService
+from app.services.transform_job_service import TransformJobWorker
+from app.services.xml_executor_service import XMLExecutorService
+
+VALID_XML = """<arg:argument_map xmlns:arg="http://example.com/argument_map">
+    <arg:title>Test Map</arg:title>
+    <arg:statements>
+        <arg:premise id="p1">Premise 1</arg:premise>
+        <arg:conclusion id="c1">Conclusion</arg:conclusion>
+    </arg:statements>
+    <arg:relationships>
+        <arg:support from="p1" to="c1"/>
+    </arg:relationships>
+</arg:argument_map>"""
+
+class FakeLLMService:
+    """Stand-in for LLMService returning queued outputs (exceptions are raised)."""
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+
+    async def generate_xml(self, text):
+        output = self.outputs.pop(0)
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+    def cache_xml(self, text, xml_content):
+        pass
+
+def _worker(session_factory, llm_service, worker_id="worker-1", max_attempts=2):
+    pipeline = ArgumentMapPipelineService(llm_service, XMLExecutorService("inline", 1), session_factory)
+    return TransformJobWorker(pipeline, session_factory, concurrency=1, poll_interval=0.01,
+                              lease_seconds=60, max_attempts=max_attempts, worker_id=worker_id)
+
+async def _create_job(session_factory):
+    async with async_session_scope(session_factory) as db:
+        return await AsyncTransformJobRepository(db).create_job("Un texte")
+
+async def _get_job(session_factory, job_uuid):
+    async with async_session_scope(session_factory) as db:
+        return await AsyncTransformJobRepository(db).get_job(job_uuid)
+
+@pytest.mark.asyncio
+async def test_run_once_stores_map_and_completes_job(async_session_factory):
+    """
+    Vérifie qu'une tâche est traitée puis marquée réussie avec la carte créée.
+    """
+    job = await _create_job(async_session_factory)
+    worker = _worker(async_session_factory, FakeLLMService(VALID_XML))
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    stored_job, argument_map_uuid = await _get_job(async_session_factory, job.uuid)
+    assert stored_job.status == "succeeded"
+    assert stored_job.argument_map_id == 1
+    assert argument_map_uuid is not None
+    assert stored_job.locked_by is None
+
+@pytest.mark.asyncio
+async def test_invalid_xml_fails_without_retry(async_session_factory):
+    """
+    Vérifie qu'un XML invalide fait échouer la tâche sans nouvelle tentative.
+    """
+    job = await _create_job(async_session_factory)
+    worker = _worker(async_session_factory, FakeLLMService(VALID_XML.replace('to="c1"', 'to="c2"')))
+
+    await worker.run_once()
+
+    stored_job, _ = await _get_job(async_session_factory, job.uuid)
+    assert stored_job.status == "failed"
+    assert stored_job.error_status_code == 400
+    assert stored_job.error_details
+    assert stored_job.attempts == 1
+
+@pytest.mark.asyncio
+async def test_unexpected_errors_are_retried_up_to_max_attempts(async_session_factory):
+    """
+    Vérifie qu'une erreur inattendue remet la tâche en file jusqu'au nombre maximal de tentatives.
+    """
+    job = await _create_job(async_session_factory)
+    worker = _worker(async_session_factory, FakeLLMService(RuntimeError("timeout"), RuntimeError("timeout")))
+
+    await worker.run_once()
+    stored_job, _ = await _get_job(async_session_factory, job.uuid)
+    assert stored_job.status == "pending"
+
+    await worker.run_once()
+    stored_job, _ = await _get_job(async_session_factory, job.uuid)
+    assert stored_job.status == "failed"
+    assert stored_job.error_status_code == 500
+    assert stored_job.attempts == 2
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimed_by_another_worker(async_session_factory):
+    """
+    Vérifie qu'une tâche abandonnée par un worker arrêté est reprise après expiration du bail.
+    """
+    job = await _create_job(async_session_factory)
+    async with async_session_scope(async_session_factory) as db:
+        claimed = await AsyncTransformJobRepository(db).claim_next_job("crashed-worker", lease_seconds=60, max_attempts=2)
+    assert claimed.id == job.id
+
+    worker = _worker(async_session_factory, FakeLLMService(VALID_XML), worker_id="worker-2")
+    assert await worker.run_once() is False
+
+    async with async_session_scope(async_session_factory) as db:
+        await db.execute(update(TransformJob).values(lease_expires_at=datetime.now(UTC) - timedelta(seconds=1)))
+    assert await worker.run_once() is True
+
+    stored_job, _ = await _get_job(async_session_factory, job.uuid)
+    assert stored_job.status == "succeeded"
+    assert stored_job.attempts == 2
+
+@pytest.mark.asyncio
+async def test_job_whose_worker_dies_on_the_last_attempt_is_failed(async_session_factory):
+    """
+    Vérifie qu'une tâche dont le worker meurt à chaque tentative (OOM, segfault) n'est pas reprise indéfiniment.
+    """
+    job = await _create_job(async_session_factory)
+    for worker_id in ("crashed-worker-1", "crashed-worker-2"):
+        async with async_session_scope(async_session_factory) as db:
+            assert await AsyncTransformJobRepository(db).claim_next_job(worker_id, lease_seconds=60, max_attempts=2) is not None
+            await db.execute(update(TransformJob).values(lease_expires_at=datetime.now(UTC) - timedelta(seconds=1)))
+
+    worker = _worker(async_session_factory, FakeLLMService(VALID_XML), worker_id="worker-3", max_attempts=2)
+    assert await worker.run_once() is False
+
+    stored_job, _ = await _get_job(async_session_factory, job.uuid)
+    assert (stored_job.status, stored_job.error_status_code, stored_job.attempts) == ("failed", 500, 2)
+
+@pytest.mark.asyncio
+async def test_started_worker_processes_notified_jobs(async_session_factory):
+    """
+    Vérifie que les workers démarrés traitent les tâches puis s'arrêtent proprement.
+    """
+    import asyncio
+
+    worker = _worker(async_session_factory, FakeLLMService(VALID_XML))
+    await worker.start()
+    job = await _create_job(async_session_factory)
+    worker.notify()
+
+    for _ in range(100):
+        stored_job, _ = await _get_job(async_session_factory, job.uuid)
+        if stored_job.status == "succeeded":
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop(timeout=1)
+
+    assert stored_job.status == "succeeded"
+    assert not worker.running
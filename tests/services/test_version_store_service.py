@@ -0,0 +1,82 @@
+# Tests for the snapshot + delta version store
+import hashlib
+from app.services.version_store_service import VersionStore, VersionRecord, encode_delta, apply_delta, SNAPSHOT, DELTA
+
+def _document(count: int, changed: int | None = None) -> str:
+    statements = "".join(
+        f'<statement id="s{index}">{"Texte modifié" if index == changed else f"Statement {index}"}</statement>'
+        for index in range(count)
+    )
+    return f"<argument_map><statements>{statements}</statements></argument_map>"
+
+def test_delta_round_trip_and_size_follows_the_change():
+    """
+    Vérifie qu'un delta reconstruit exactement le document et reste petit pour une petite modification.
+    """
+    previous = _document(500)
+    text = _document(500, changed=250).replace('<statement id="s10">Statement 10</statement>', "")
+
+    delta = encode_delta(previous, text)
+    assert apply_delta(previous, delta) == text
+    assert len(delta) < 100
+    assert apply_delta("", encode_delta("", text)) == text
+    assert apply_delta(previous, encode_delta(previous, "")) == ""
+
+def test_delta_of_a_large_widely_edited_document_is_linear():
+    """
+    Vérifie qu'un grand document modifié un statement sur deux (ordre modifié, ajouts) est encodé rapidement et exactement.
+    """
+    import time
+
+    previous = _document(20000)
+    edited = "".join(
+        f'<statement id="s{index}">{f"Statement {index} modifié" if index % 2 == 0 else f"Statement {index}"}</statement>'
+        for index in range(20000)
+    )
+    text = f"<argument_map><statements><statement id=\"new\">Ajout</statement>{edited}</statements></argument_map>"
+
+    start = time.perf_counter()
+    delta = encode_delta(previous, text)
+    # Coût quadratique auparavant : plus de deux minutes pour cette taille
+    assert time.perf_counter() - start < 5
+    assert apply_delta(previous, delta) == text
+    assert len(delta) < len(text) / 5
+
+def test_snapshots_are_written_every_interval():
+    """
+    Vérifie la politique de stockage : un instantané tous les `snapshot_interval` versions, des deltas sinon,
+    et un instantané quand le delta n'est pas rentable.
+    """
+    store = VersionStore(snapshot_interval=3, max_delta_ratio=0.5, cache_max_entries=10)
+    texts = [_document(100, changed=version) for version in range(1, 8)]
+    records = [store.make_record(1, texts[0])]
+    for version in range(2, 8):
+        records.append(store.make_record(version, texts[version - 1], records[-1], texts[version - 2]))
+
+    assert [record.storage for record in records] == [SNAPSHOT, DELTA, DELTA, SNAPSHOT, DELTA, DELTA, SNAPSHOT]
+    assert [store.chain_start(record) for record in records] == [1, 1, 1, 4, 4, 4, 7]
+    # Texte peu compressible et sans rapport avec la version précédente
+    unrelated = "".join(f"<note>{hashlib.sha256(str(index).encode()).hexdigest()}</note>" for index in range(100))
+    assert store.make_record(8, unrelated, records[-1], texts[-1]).storage == SNAPSHOT
+
+def test_reconstruct_replays_deltas_from_the_closest_cached_version():
+    """
+    Vérifie la reconstruction depuis l'instantané, la reprise depuis une version en cache
+    et la lecture des anciennes lignes contenant le XML brut.
+    """
+    store = VersionStore(snapshot_interval=10, max_delta_ratio=0.5, cache_max_entries=2)
+    texts = [_document(50, changed=version) for version in range(1, 5)]
+    records = [store.make_record(1, texts[0])]
+    for version in range(2, 5):
+        records.append(store.make_record(version, texts[version - 1], records[-1], texts[version - 2]))
+
+    assert store.reconstruct(7, records[:3]) == texts[2]
+    # Seules les deux dernières versions reconstruites restent en cache
+    assert store.get_cached(7, 1) is None
+    assert store.get_cached(7, 3) == texts[2]
+    # La version 4 repart de la version 3 en cache : l'instantané n'est pas relu
+    corrupted = [VersionRecord(1, SNAPSHOT, 1, b"invalide")] + records[1:]
+    assert store.reconstruct(7, corrupted) == texts[3]
+
+    legacy = [VersionRecord(1, None, None, None, source_xml=texts[0]), store.make_record(2, texts[1], VersionRecord(1, None, None, None), texts[0])]
+    assert store.reconstruct(8, legacy) == texts[1]
@@ -0,0 +1,60 @@
+import pytest
+from lxml import etree
+from app.services import xml_document_service as document_module
+from app.services.xml_document_service import XMLDocumentService
+from app.services.xml_validation_service import XMLValidationService
+from app.services.xml_parsing_service import XMLParsingService
+
+VALID_XML = """<arg:argument_map xmlns:arg="http://example.com/argument_map">
+    <arg:title>Test Map</arg:title>
+    <arg:statements>
+        <arg:premise id="p1">Premise 1</arg:premise>
+        <arg:conclusion id="c1">Conclusion</arg:conclusion>
+    </arg:statements>
+    <arg:relationships>
+        <arg:support from="p1" to="c1"/>
+    </arg:relationships>
+</arg:argument_map>"""
+
+@pytest.fixture(scope="module")
+def service():
+    return XMLDocumentService(XMLValidationService(), XMLParsingService())
+
+def test_process_parses_document_once(service, monkeypatch):
+    """
+    Vérifie que la validation et l'extraction partagent un seul parsing du document.
+    """
+    calls = []
+    original_fromstring = etree.fromstring
+
+    def counting_fromstring(*args, **kwargs):
+        calls.append(args)
+        return original_fromstring(*args, **kwargs)
+
+    monkeypatch.setattr(document_module.etree, "fromstring", counting_fromstring)
+    result = service.process(VALID_XML)
+
+    assert result.is_valid
+    assert result.errors == []
+    assert len(calls) == 1
+    assert result.parsed_data == XMLParsingService().parse_xml(VALID_XML)
+
+def test_process_reports_business_rule_errors(service):
+    """
+    Vérifie qu'un document invalide renvoie les erreurs sans données extraites.
+    """
+    xml_content = VALID_XML.replace('to="c1"', 'to="missing"')
+    result = service.process(xml_content)
+
+    assert not result.is_valid
+    assert result.parsed_data is None
+    assert any("'to' attribute" in error for error in result.errors)
+
+def test_process_reports_syntax_errors(service):
+    """
+    Vérifie qu'un XML mal formé est signalé comme erreur de syntaxe.
+    """
+    result = service.process("<arg:argument_map")
+
+    assert not result.is_valid
+    assert result.errors[0].startswith("XML Syntax Error")
@@ -0,0 +1,36 @@
+import pytest
+from app.services.xml_executor_service import XMLExecutorService
+from app.services.xml_parsing_service import XMLParsingService
+
+VALID_XML = """<arg:argument_map xmlns:arg="http://example.com/argument_map">
+    <arg:title>Test Map</arg:title>
+    <arg:statements>
+        <arg:premise id="p1">Premise 1</arg:premise>
+        <arg:conclusion id="c1">Conclusion</arg:conclusion>
+    </arg:statements>
+    <arg:relationships>
+        <arg:support from="p1" to="c1"/>
+    </arg:relationships>
+</arg:argument_map>"""
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_process_in_each_mode(mode):
+    """
+    Vérifie que chaque mode d'exécution valide et extrait le document de la même façon.
+    """
+    service = XMLExecutorService(mode, max_workers=1)
+    try:
+        valid = await service.process(VALID_XML)
+        invalid = await service.process(VALID_XML.replace('to="c1"', 'to="c2"'))
+    finally:
+        service.shutdown()
+
+    assert valid.is_valid
+    assert valid.parsed_data == XMLParsingService().parse_xml(VALID_XML)
+    assert not invalid.is_valid
+    assert invalid.parsed_data is None
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        XMLExecutorService("fiber", max_workers=1)
@@ -165,4 +165,78 @@ def test_parse_xml_invalid_credibility_rating():
 
     # Vérification : credibility_rating devient None si invalide
     assert len(result["evidence"]) == 1
-    assert result["evidence"][0]["credibility_rating"] is None
\ No newline at end of file
+    assert result["evidence"][0]["credibility_rating"] is None
+
+def test_parse_xml_groups_elements_by_type_in_single_pass():
+    """
+    Teste que les éléments entrelacés sont regroupés par type (premises, puis conclusions...)
+    et que seuls les items directement sous evidence sont extraits.
+    """
+    xml_content = """
+    <arg:argument_map xmlns:arg="http://example.com/argument_map">
+        <arg:title>Order Test</arg:title>
+        <arg:statements>
+            <arg:rebuttal id="r1">Rebuttal</arg:rebuttal>
+            <arg:conclusion id="c1">Conclusion</arg:conclusion>
+            <arg:premise id="p1">Premise 1</arg:premise>
+            <arg:premise id="p2">Premise 2</arg:premise>
+        </arg:statements>
+        <arg:relationships>
+            <arg:oppose from="r1" to="p1"/>
+            <arg:support from="p1" to="c1"/>
+            <arg:support from="p2" to="c1"/>
+        </arg:relationships>
+        <arg:evidence>
+            <arg:item id="e1" for="p1">
+                <arg:title>First</arg:title>
+                <arg:title>Second</arg:title>
+                <arg:url/>
+            </arg:item>
+        </arg:evidence>
+        <arg:item id="stray"><arg:title>Ignored</arg:title></arg:item>
+    </arg:argument_map>
+    """
+    service = XMLParsingService()
+    result = service.parse_xml(xml_content)
+
+    assert [stmt["external_id"] for stmt in result["statements"]] == ["p1", "p2", "c1", "r1"]
+    assert [rel["relationship_type"] for rel in result["relationships"]] == ["support", "support", "oppose"]
+    assert len(result["evidence"]) == 1
+    assert result["evidence"][0]["title"] == "First"
+    assert result["evidence"][0]["url"] == ""
+    assert result["evidence"][0]["credibility_rating"] is None
+
+def test_parse_xml_multi_parent_and_cycle():
+    """
+    Teste qu'un statement à plusieurs parents prend le chemin du parent le plus profond,
+    et qu'un cycle de support est signalé sans laisser de statement sans chemin.
+    """
+    xml_content = """
+    <arg:argument_map xmlns:arg="http://example.com/argument_map">
+        <arg:title>Graph Test</arg:title>
+        <arg:statements>
+            <arg:premise id="p1">Premise 1</arg:premise>
+            <arg:premise id="p2">Premise 2</arg:premise>
+            <arg:premise id="p3">Premise 3</arg:premise>
+            <arg:premise id="p4">Premise 4</arg:premise>
+            <arg:conclusion id="c1">Conclusion</arg:conclusion>
+        </arg:statements>
+        <arg:relationships>
+            <arg:support from="p1" to="c1"/>
+            <arg:support from="p2" to="p1"/>
+            <arg:support from="p2" to="c1"/>
+            <arg:support from="p3" to="p4"/>
+            <arg:support from="p4" to="p3"/>
+        </arg:relationships>
+    </arg:argument_map>
+    """
+    service = XMLParsingService()
+    result = service.parse_xml(xml_content)
+    statements = {stmt["external_id"]: stmt for stmt in result["statements"]}
+
+    assert (statements["p2"]["path"], statements["p2"]["depth"]) == ("c1.p1.p2", 2)
+    assert result["cycles"] == [["p3", "p4"]]
+    assert (statements["p3"]["path"], statements["p4"]["path"]) == ("p3", "p3.p4")
+
+    service.assign_paths_and_depths(result, include_ancestor_paths=True)
+    assert statements["p2"]["ancestor_paths"] == ["c1.p1.p2", "c1.p2"]
@@ -0,0 +1,43 @@
+from app.services.xml_stream_service import ArgumentMapStreamParser
+
+DOCUMENT = """<arg:argument_map xmlns:arg="http://example.com/argument_map">
+    <arg:title>Test Map</arg:title>
+    <arg:statements>
+        <arg:premise id="p1">Premise 1</arg:premise>
+        <arg:conclusion id="c1">Conclusion</arg:conclusion>
+    </arg:statements>
+    <arg:relationships>
+        <arg:support from="p1" to="c1" group_id="g1"/>
+    </arg:relationships>
+</arg:argument_map>"""
+
+def _feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.append(parser.feed(text[start:start + size]))
+    return events
+
+def test_events_are_emitted_as_soon_as_elements_close():
+    """
+    Vérifie que chaque statement est émis dès la fermeture de son élément, même découpé en petits morceaux.
+    """
+    parser = ArgumentMapStreamParser()
+    chunks = _feed_in_chunks(parser, "Voici la carte :\n```xml\n" + DOCUMENT + "\n```\nFin.", 7)
+    events = [event for chunk_events in chunks for event in chunk_events]
+
+    assert [event["event"] for event in events] == ["statement", "statement", "relationship"]
+    assert events[0] == {"event": "statement", "external_id": "p1", "statement_type": "premise", "statement_text": "Premise 1"}
+    assert events[2]["group_id"] == "g1"
+    # Le premier statement est émis avant la fin du document
+    first_event_chunk = next(index for index, chunk_events in enumerate(chunks) if chunk_events)
+    assert first_event_chunk < len(chunks) - 10
+    assert parser.finished
+    assert parser.document == DOCUMENT
+
+def test_malformed_document_stops_events_but_keeps_text():
+    parser = ArgumentMapStreamParser()
+    events = parser.feed('<argument_map><statements><premise id="p1">A</conclusion>')
+
+    assert events == []
+    assert parser.failed
+    assert parser.document.startswith("<argument_map>")
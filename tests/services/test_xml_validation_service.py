@@ -1 +1,54 @@
 # Tests for XML validation service
+import pytest
+from benchmarks.synthetic_maps import generate_argument_map_xml
+from app.services.xml_validation_service import XMLValidationService
+
+HEADER = '<arg:argument_map xmlns:arg="http://example.com/argument_map"><arg:title>T</arg:title>'
+
+# Documents covering each business rule, alone and combined
+PARITY_DOCUMENTS = {
+    "valid": HEADER + """<arg:statements><arg:premise id="p1">P</arg:premise><arg:conclusion id="c1">C</arg:conclusion></arg:statements>
+        <arg:relationships><arg:support from="p1" to="c1" group_id="g1"/></arg:relationships>
+        <arg:evidence><arg:item id="e1" for="p1"><arg:title>E</arg:title></arg:item></arg:evidence></arg:argument_map>""",
+    "dangling_references": HEADER + """<arg:statements><arg:premise id="p1">P</arg:premise></arg:statements>
+        <arg:relationships><arg:support from="x1" to="p1"/><arg:oppose from="p1" to="y1"/><arg:support from="x2" to="y2"/></arg:relationships>
+        <arg:evidence><arg:item id="e1" for="z1"><arg:title>E</arg:title></arg:item></arg:evidence></arg:argument_map>""",
+    "group_targets": HEADER + """<arg:statements><arg:premise id="p1">P</arg:premise><arg:premise id="p2">P</arg:premise>
+        <arg:premise id="p3">P</arg:premise><arg:conclusion id="c1">C</arg:conclusion><arg:conclusion id="c2">C</arg:conclusion></arg:statements>
+        <arg:relationships><arg:support from="p1" to="c1" group_id="g"/><arg:support from="p2" to="c1" group_id="g"/>
+        <arg:support from="p3" to="c2" group_id="g"/><arg:support from="p1" to="c2" group_id="h"/><arg:oppose from="p2" to="c2" group_id="g"/></arg:relationships></arg:argument_map>""",
+    "duplicate_ids": HEADER + """<arg:statements><arg:premise id="p1">P</arg:premise><arg:rebuttal id="p1">R</arg:rebuttal>
+        <arg:counter_conclusion id="e1">K</arg:counter_conclusion></arg:statements>
+        <arg:evidence><arg:item id="e1" for="p1"><arg:title>E</arg:title></arg:item><arg:item id="e2" for="p1"><arg:title>E</arg:title></arg:item>
+        <arg:item id="e2" for="e1"><arg:title>E</arg:title></arg:item></arg:evidence></arg:argument_map>""",
+    "self_references": HEADER + """<arg:statements><arg:premise id="p1">P</arg:premise><arg:conclusion id="c1">C</arg:conclusion></arg:statements>
+        <arg:relationships><arg:support from="p1" to="p1"/><arg:oppose from="c1" to="c1"/><arg:support to="c1"/></arg:relationships></arg:argument_map>""",
+    "synthetic": generate_argument_map_xml(200, evidence_density=0.3),
+}
+
+@pytest.fixture(scope="module")
+def schematron_service():
+    return XMLValidationService(business_rules_engine="schematron")
+
+@pytest.fixture(scope="module")
+def native_service():
+    return XMLValidationService(business_rules_engine="native")
+
+@pytest.mark.parametrize("name", PARITY_DOCUMENTS)
+def test_native_engine_matches_schematron(schematron_service, native_service, name):
+    """
+    Vérifie que le moteur natif produit les mêmes erreurs, dans le même ordre, que le Schematron.
+    """
+    xml_content = PARITY_DOCUMENTS[name]
+    assert native_service.validate_xml(xml_content) == schematron_service.validate_xml(xml_content)
+
+def test_parity_documents_exercise_every_rule(schematron_service):
+    errors = [error for xml_content in PARITY_DOCUMENTS.values() for error in schematron_service.validate_xml(xml_content)[1]]
+    for fragment in ("'from' attribute", "'to' attribute", "'for' attribute", "same group_id",
+                     "unique across all statements", "for evidence items must be unique", "must not reference the same"):
+        assert any(fragment in error for error in errors), fragment
+    assert schematron_service.validate_xml(PARITY_DOCUMENTS["valid"]) == (True, [])
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        XMLValidationService(business_rules_engine="xpath")